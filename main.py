@@ -8,11 +8,14 @@
 -----------------------------------------------------------------------
 """
 
+import os
 import argparse
+from contextlib import nullcontext
 from zlm import AutoApplyModel
+from zlm.utils.cassette import use_cassette
 
 
-def create_resume_cv(url, master_data, api_key, provider, model, downloads_dir):
+def create_resume_cv(url, master_data, api_key, provider, model, downloads_dir, section_mode=None, fallback_chain=None):
     """
     Creates a resume or CV using the Job-LLM model.
 
@@ -23,11 +26,13 @@ def create_resume_cv(url, master_data, api_key, provider, model, downloads_dir):
         provider (str): The LLM provider to use. Currently, only "OpenAI, Gemini" is supported.
         model (str): The LLM model to use.
         downloads_dir (str): The directory where the generated resume or CV will be saved.
+        section_mode (str): How resume sections are generated, "concurrent" or "single_call".
+        fallback_chain (list): Providers to hedge and fall back to, as "provider:model".
 
     Returns:
         None
     """
-    job_llm = AutoApplyModel(api_key, provider, model, downloads_dir)
+    job_llm = AutoApplyModel(api_key, provider, model, downloads_dir, section_mode=section_mode, fallback_chain=fallback_chain)
     job_llm.resume_cv_pipeline(url, master_data)
 
 
@@ -43,10 +48,21 @@ def create_resume_cv(url, master_data, api_key, provider, model, downloads_dir):
     parser.add_argument("-d", "--downloads_dir", help="Give detailed path of folder")
     parser.add_argument("-p", "--provider", help="LLM provider name. support for openai, gemini")
     parser.add_argument("-l", "--model", help="LLM model name")
+    parser.add_argument("-s", "--section_mode", help="Resume sections generation mode. support for concurrent, single_call")
+    parser.add_argument("-f", "--fallback_chain", nargs="+", help="Providers to hedge and fall back to, in order. e.g. GPT:gpt-4o-mini Ollama:llama3.1")
+    parser.add_argument("-c", "--cassette", help="Path of LLM calls cassette file to record or replay. e.g. run.jsonl.gz")
+    parser.add_argument("--cassette_mode", help="Cassette mode. support for record, replay. Defaults to replay if the cassette exists, else record")
+    parser.add_argument("--replay_latency", default="observed", help="Replayed LLM calls latency. support for observed, zero")
 
     # Parse the arguments
     args = parser.parse_args()
 
-    create_resume_cv(
-        args.url, args.master_data, args.api_key, args.provider, args.model, args.downloads_dir
-    )
\ No newline at end of file
+    cassette = nullcontext()
+    if args.cassette:
+        cassette_mode = args.cassette_mode or ("replay" if os.path.exists(args.cassette) else "record")
+        print(f"Using cassette {args.cassette} in {cassette_mode} mode")
+        cassette = use_cassette(args.cassette, cassette_mode, args.replay_latency)
+    with cassette:
+        create_resume_cv(
+            args.url, args.master_data, args.api_key, args.provider, args.model, args.downloads_dir, args.section_mode, args.fallback_chain
+        )
\ No newline at end of file
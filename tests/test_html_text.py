@@ -0,0 +1,11 @@
+from zlm.utils.html_text import html_to_text
+
+
+def test_unclosed_head_keeps_body_text():
+    html = "<html><head><title>Careers</title><meta charset='utf-8'><link rel='icon' href='/favicon.ico'><body><h1>Data Engineer</h1><p>Python and SQL"
+    assert html_to_text(html) == "Data Engineer\nPython and SQL"
+
+
+def test_head_content_is_skipped():
+    html = "<html><head><title>Careers</title><style>p {}</style><script>var a = 1;</script></head><body><p>Python</p></body></html>"
+    assert html_to_text(html) == "Python"
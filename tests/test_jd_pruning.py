@@ -0,0 +1,15 @@
+from zlm.utils.jd_pruning import is_heading, prune_job_description
+
+
+def test_line_starting_with_a_low_value_word_is_not_a_heading():
+    assert not is_heading("Salary range 150k")
+    assert is_heading("Salary & Benefits")
+    assert is_heading("Compensation:")
+
+
+def test_duties_after_a_salary_line_survive_pruning():
+    duties = [f"- Build and maintain data pipeline number {i} for the analytics platform team" for i in range(8)]
+    text = "\n".join(["Data Engineer", "Salary range 150k"] + duties)
+    pruned, report = prune_job_description(text)
+    assert report["trimmed_sections"] == 0
+    assert all(duty in pruned for duty in duties)
@@ -0,0 +1,83 @@
+import pytest
+
+from zlm.utils.llm_models import BaseLLM
+from zlm.utils.rate_limiter import CircuitOpenError, RateLimiter
+from zlm.variables import CIRCUIT_BREAKER_FAILURES
+
+
+class ProviderError(Exception):
+    def __init__(self, status_code):
+        super().__init__(f"Error code: {status_code}")
+        self.status_code = status_code
+
+
+def failing(errors, result="ok"):
+    """Returns a function raising the given errors in order, then returning the result."""
+    errors = list(errors)
+    def fn():
+        if errors:
+            raise errors.pop(0)
+        return result
+    return fn
+
+
+@pytest.fixture
+def limiter(monkeypatch):
+    limiter = RateLimiter(max_retries=5)
+    monkeypatch.setattr(limiter, "backoff", lambda attempt, error: 0)
+    return limiter
+
+
+def test_rate_limits_use_the_retry_budget_without_opening_the_breaker(limiter):
+    assert limiter.call(failing([ProviderError(429)] * 5)) == "ok"
+    assert limiter.call(failing([])) == "ok"
+    assert limiter.breaker.opened_at is None
+
+
+def test_exhausted_rate_limited_calls_do_not_open_the_breaker(limiter):
+    for _ in range(CIRCUIT_BREAKER_FAILURES):
+        with pytest.raises(ProviderError):
+            limiter.call(failing([ProviderError(429)] * 6))
+    assert limiter.call(failing([])) == "ok"
+
+
+def test_sustained_server_errors_open_the_breaker_once_per_call(limiter):
+    for _ in range(CIRCUIT_BREAKER_FAILURES - 1):
+        with pytest.raises(ProviderError):
+            limiter.call(failing([ProviderError(503)] * 6))
+    assert limiter.breaker.opened_at is None
+
+    with pytest.raises(ProviderError):
+        limiter.call(failing([ProviderError(503)] * 6))
+    with pytest.raises(CircuitOpenError):
+        limiter.call(failing([]))
+
+
+class FakeLLM(BaseLLM):
+    provider = "Fake"
+    model = "fake"
+    system_prompt = ""
+    cache = None
+    report_errors = False
+
+    def __init__(self, errors, chunks):
+        self.errors = list(errors)
+        self.chunks = chunks
+        self.opened = 0
+
+    def _params(self, expecting_longer_output=False, need_json_output=False, max_output_tokens=None):
+        return {}
+
+    def _stream(self, prompt, params):
+        self.opened += 1
+        if self.errors:
+            raise self.errors.pop(0)
+        yield from self.chunks
+
+
+def test_stream_retries_errors_raised_before_the_first_chunk(monkeypatch):
+    llm = FakeLLM([ProviderError(429), ProviderError(503)], ["Dear ", "Hiring Manager"])
+    monkeypatch.setattr(llm.rate_limiter, "backoff", lambda attempt, error: 0)
+
+    assert "".join(llm.stream_response("prompt")) == "Dear Hiring Manager"
+    assert llm.opened == 3
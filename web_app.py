@@ -233,7 +233,7 @@ def create_overleaf_button(resume_path):
             # Build Cover Letter
             if get_cover_letter_button:
                 with st.status("Building cover letter..."):
-                    cv_details, cv_path = resume_llm.cover_letter_generator(job_details, user_data, is_st=True)
+                    cv_details, cv_path = resume_llm.cover_letter_generator(job_details, user_data, is_st=True, stream=True)
                 cv_col_1, cv_col_2 = st.columns([0.7, 0.3])
                 with cv_col_1:
                     st.subheader("Generated Cover Letter")
@@ -10,22 +10,42 @@
 import os
 import json
 import re
+import asyncio
+import threading
 import validators
 import numpy as np
 import streamlit as st
+from concurrent.futures import ThreadPoolExecutor
+from streamlit.runtime.scriptrunner import add_script_run_ctx, get_script_run_ctx
 
 from langchain.prompts import PromptTemplate
 from langchain_core.output_parsers import JsonOutputParser
 
-from zlm.schemas.sections_schemas import ResumeSchema
+from zlm.schemas.sections_schemas import ResumeSchema, ResumeSections
 from zlm.utils import utils
-from zlm.utils.latex_ops import latex_to_pdf
+from zlm.utils.latex_ops import escape_for_latex, latex_to_pdf
 from zlm.utils.llm_models import ChatGPT, Gemini, OllamaModel
+from zlm.utils.hedging import HedgedLLM
+from zlm.utils.cassette import get_active_cassette
+from zlm.utils.resume_cache import resume_json_cache
+from zlm.utils.jd_cache import job_details_cache
+from zlm.utils.json_stream import StreamingJSONParser
+from zlm.utils.schema_repair import find_broken_fragments, fragment_schema, is_complete_json, merge_repairs, parse_response, unwrap_fragment
 from zlm.utils.data_extraction import read_data_from_url, extract_text
+from zlm.utils.crawler import BulkCrawler
+from zlm.utils.token_budget import count_tokens, fit_to_budget, output_token_budget, usage_tracker
+from zlm.utils.prompt_serializer import serialize_for_prompt, serialize_job_details
+from zlm.utils.jd_pruning import prune_job_description
+from zlm.utils.jd_chunking import merge_chunk_answers, split_into_chunks
 from zlm.utils.metrics import jaccard_similarity, overlap_coefficient, cosine_similarity, vector_embedding_similarity
+from zlm.prompts.sections_prompt import ALL_SECTIONS, REPAIR_FRAGMENT
 from zlm.prompts.resume_prompt import CV_GENERATOR, RESUME_WRITER_PERSONA, JOB_DETAILS_EXTRACTOR, RESUME_DETAILS_EXTRACTOR
 from zlm.schemas.job_details_schema import JobDetails
-from zlm.variables import DEFAULT_LLM_MODEL, DEFAULT_LLM_PROVIDER, LLM_MAPPING, section_mapping
+from zlm.variables import (
+    COVER_LETTER_OUTPUT_TOKENS, DEFAULT_LLM_MODEL, DEFAULT_LLM_PROVIDER, DEFAULT_SECTION_GENERATION_MODE,
+    JOB_DESCRIPTION_TOKEN_BUDGET, LLM_MAPPING, MAX_PARALLEL_SECTIONS, RESUME_SECTIONS, RESUME_TEXT_TOKEN_BUDGET,
+    SECTION_DATA_TOKEN_BUDGET, SECTION_GENERATION_MODES, SINGLE_CALL_MAX_OUTPUT_TOKENS, section_mapping
+)
 
 module_dir = os.path.dirname(__file__)
 demo_data_path = os.path.join(module_dir, "demo_data", "user_profile.json")
@@ -41,69 +61,175 @@ class AutoApplyModel:
         downloads_dir (str, optional): The directory to save downloaded files. Defaults to the default download folder.
         provider (str, optional): The LLM provider to use. Defaults to "Gemini".
         model (str, optional): The LLM model to use. Defaults to "gemini-1.5-flash-latest".
+        max_parallel_sections (int, optional): Max number of resume sections generated concurrently. Defaults to 6.
+        use_cache (bool, optional): Whether to cache LLM responses on disk. Defaults to the provider's default (on for GPT, off for Gemini and Ollama).
+        section_mode (str, optional): How resume sections are generated, "concurrent" or "single_call". Defaults to "concurrent".
+        fallback_chain (list, optional): Providers to hedge and fall back to, in order, as "provider:model" or (provider, model). e.g. ["GPT:gpt-4o-mini", "Ollama:llama3.1"].
+        hedge_deadline (float, optional): Seconds before a call is hedged with the next provider. Defaults to each provider's p95 latency.
 
     Methods:
         get_prompt(system_prompt_path: str) -> str: Returns the system prompt from the specified path.
         resume_to_json(pdf_path: str) -> dict: Extracts resume details from the specified PDF path.
         user_data_extraction(user_data_path: str) -> dict: Extracts user data from the specified path.
         job_details_extraction(url: str) -> dict: Extracts job details from the specified job URL.
+        bulk_job_details_extraction(urls: list) -> dict: Extracts job details from many job URLs, crawled concurrently.
+        generate_section(section: str, job_details: dict, user_data: dict) -> tuple: Generates a single resume section.
+        generate_sections(job_details: dict, user_data: dict, section_mode: str) -> dict: Generates all resume sections.
         resume_builder(job_details: dict, user_data: dict) -> dict: Generates a resume based on job details and user data.
         cover_letter_generator(job_details: dict, user_data: dict) -> str: Generates a cover letter based on job details and user data.
         resume_cv_pipeline(job_url: str, user_data_path: str) -> None: Runs the Auto Apply Pipeline.
+        aresume_cv_pipeline(job_url: str, user_data_path: str) -> None: Runs the Auto Apply Pipeline on asyncio, each step has an `a` prefixed async version.
     """
 
     def __init__(
-        self, api_key: str = None, provider: str = None, model: str = None, downloads_dir: str = utils.get_default_download_folder(), system_prompt: str = RESUME_WRITER_PERSONA
+        self, api_key: str = None, provider: str = None, model: str = None, downloads_dir: str = utils.get_default_download_folder(), system_prompt: str = RESUME_WRITER_PERSONA,
+        max_parallel_sections: int = MAX_PARALLEL_SECTIONS, use_cache: bool = None, section_mode: str = DEFAULT_SECTION_GENERATION_MODE,
+        fallback_chain: list = None, hedge_deadline: float = None
     ):
         self.system_prompt = system_prompt
+        self.max_parallel_sections = max(1, max_parallel_sections or 1)
+        self.use_cache = use_cache
+        self.section_mode = DEFAULT_SECTION_GENERATION_MODE if section_mode is None or section_mode.strip() == "" else section_mode
+        if self.section_mode not in SECTION_GENERATION_MODES:
+            raise Exception(f"Invalid section generation mode, choose one of {SECTION_GENERATION_MODES}")
         self.provider = DEFAULT_LLM_PROVIDER if provider is None or provider.strip() == "" else provider
         self.model = DEFAULT_LLM_MODEL if model is None or model.strip() == "" else model
         self.downloads_dir = utils.get_default_download_folder() if downloads_dir is None or downloads_dir.strip() == "" else downloads_dir
 
-        if api_key is None or api_key.strip() == "os":
-                api_env = LLM_MAPPING[self.provider]["api_env"]
-                if api_env != None and api_env.strip() != "":
-                    self.api_key = os.environ.get(LLM_MAPPING[self.provider]["api_env"]) 
-                else:
-                    self.api_key = None
+        self.api_key = self.get_api_key(self.provider, api_key)
+
+        self.fallback_chain = [tuple(link.split(":", 1)) if isinstance(link, str) else tuple(link) for link in fallback_chain or []]
+        if self.fallback_chain:
+            llms = [self.get_llm_instance()] + [
+                self.get_llm_instance(provider, model, self.get_api_key(provider)) for provider, model in self.fallback_chain
+                ]
+            self.llm = HedgedLLM(llms, hedge_deadline)
         else:
-            self.api_key = api_key
-
-        self.llm = self.get_llm_instance()
-    
-    def get_llm_instance(self):
-        if self.provider == "GPT":
-            return ChatGPT(api_key=self.api_key, model=self.model, system_prompt=self.system_prompt)
-        elif self.provider == "Gemini":
-            return Gemini(api_key=self.api_key, model=self.model, system_prompt=self.system_prompt)
-        elif self.provider == "Ollama":
-            return OllamaModel(model=self.model, system_prompt=self.system_prompt)
+            self.llm = self.get_llm_instance()
+
+    def get_api_key(self, provider: str, api_key: str = None):
+        """Returns the given API key, or the provider's API key from the environment if it is None or "os"."""
+        if api_key is None or api_key.strip() == "os":
+            api_env = LLM_MAPPING.get(provider, {}).get("api_env")
+            if api_env != None and api_env.strip() != "":
+                return os.environ.get(api_env)
+            return None
+        return api_key
+
+    def get_llm_instance(self, provider: str = None, model: str = None, api_key: str = None):
+        cache_kwargs = {} if self.use_cache is None else {"use_cache": self.use_cache}
+        if not provider:
+            provider, model, api_key = self.provider, self.model, self.api_key
+
+        if provider == "GPT":
+            return ChatGPT(api_key=api_key, model=model, system_prompt=self.system_prompt, **cache_kwargs)
+        elif provider == "Gemini":
+            return Gemini(api_key=api_key, model=model, system_prompt=self.system_prompt, **cache_kwargs)
+        elif provider == "Ollama":
+            return OllamaModel(model=model, system_prompt=self.system_prompt, **cache_kwargs)
         else:
             raise Exception("Invalid LLM Provider")
 
-    def resume_to_json(self, pdf_path):
+    @property
+    def chain(self) -> list:
+        """The LLMs that may answer a call, in order of preference."""
+        return self.llm.llms if isinstance(self.llm, HedgedLLM) else [self.llm]
+
+    def llm_response(self, accept=None, **kwargs) -> tuple:
+        """Returns the LLM response and the LLM that answered it.
+
+        With a fallback chain, only responses passing `accept` win the hedge, so a truncated or non-JSON
+        response of a fast provider doesn't beat a valid response of a slower one.
+        """
+        if isinstance(self.llm, HedgedLLM):
+            return self.llm.get_response_with_llm(accept=accept, **kwargs)
+        return self.llm.get_response(**kwargs), self.llm
+
+    async def allm_response(self, accept=None, **kwargs) -> tuple:
+        """Async version of `llm_response`."""
+        if isinstance(self.llm, HedgedLLM):
+            return await self.llm.aget_response_with_llm(accept=accept, **kwargs)
+        return await self.llm.aget_response(**kwargs), self.llm
+
+    def fit_to_budget(self, text: str, max_tokens: int) -> str:
+        return fit_to_budget(text, max_tokens, self.provider, self.model)
+
+    def prune_job_description(self, job_site_content: str) -> str:
+        return prune_job_description(job_site_content, self.provider, self.model)[0]
+
+    def compact_job_details(self, job_details: dict, sections=None, max_tokens: int = None) -> str:
+        return serialize_job_details(job_details, sections, self.provider, self.model, max_tokens)
+
+    def compact_data(self, data, label: str, max_tokens: int = None) -> str:
+        return serialize_for_prompt(data, label=label, provider=self.provider, model=self.model, max_tokens=max_tokens)
+
+    def resume_to_json_prompt(self, resume_text: str) -> str:
+        json_parser = JsonOutputParser(pydantic_object=ResumeSchema)
+
+        return PromptTemplate(
+            template=RESUME_DETAILS_EXTRACTOR,
+            input_variables=["resume_text"],
+            partial_variables={"format_instructions": json_parser.get_format_instructions()}
+            ).format(resume_text=self.fit_to_budget(resume_text, RESUME_TEXT_TOKEN_BUDGET))
+
+    def resume_to_json(self, pdf_path, bypass_cache=False):
         """
         Converts a resume in PDF format to JSON format.
 
+        The JSON is cached by the PDF's content hash, provider, model and schema version,
+        so uploading the same resume again skips the LLM call.
+
         Args:
             pdf_path (str): The path to the PDF file.
+            bypass_cache (bool, optional): Whether to extract the resume again, replacing the cached JSON. Defaults to False.
 
         Returns:
             dict: The resume data in JSON format.
         """
+        pdf_hash = resume_json_cache.content_hash(pdf_path)
+        resume_json = self.get_cached_json(resume_json_cache, pdf_hash, bypass_cache)
+        if resume_json is not None:
+            return resume_json
+
         resume_text = extract_text(pdf_path)
+        prompt = self.resume_to_json_prompt(resume_text)
 
-        json_parser = JsonOutputParser(pydantic_object=ResumeSchema)
+        resume_json, llm = self.llm_response(prompt=prompt, need_json_output=True)
+        self.set_cached_json(resume_json_cache, pdf_hash, resume_json, llm)
+        return resume_json
 
-        prompt = PromptTemplate(
-            template=RESUME_DETAILS_EXTRACTOR,
-            input_variables=["resume_text"],
-            partial_variables={"format_instructions": json_parser.get_format_instructions()}
-            ).format(resume_text=resume_text)
+    async def aresume_to_json(self, pdf_path, bypass_cache=False):
+        """Async version of `resume_to_json`."""
+        pdf_hash = await asyncio.to_thread(resume_json_cache.content_hash, pdf_path)
+        resume_json = await asyncio.to_thread(self.get_cached_json, resume_json_cache, pdf_hash, bypass_cache)
+        if resume_json is not None:
+            return resume_json
+
+        resume_text = await asyncio.to_thread(extract_text, pdf_path)
+        prompt = self.resume_to_json_prompt(resume_text)
 
-        resume_json = self.llm.get_response(prompt=prompt, need_json_output=True)
+        resume_json, llm = await self.allm_response(prompt=prompt, need_json_output=True)
+        await asyncio.to_thread(self.set_cached_json, resume_json_cache, pdf_hash, resume_json, llm)
         return resume_json
 
+    def get_cached_json(self, result_cache, content_hash: str, bypass_cache=False):
+        """Returns the JSON cached in `result_cache` for the content by the first LLM of the chain that has it, None if it should be extracted."""
+        # Every call goes to the providers while a cassette is active, same as the LLM response cache
+        if bypass_cache or get_active_cassette() is not None:
+            return None
+
+        for llm in self.chain:
+            result = result_cache.get(content_hash, llm.provider, llm.model, self.system_prompt)
+            if result is not None:
+                print(f"Cache hit from {llm.provider}/{llm.model}, hit rate {result_cache.stats()['hit_rate']:.0%}")
+                return result
+        return None
+
+    def set_cached_json(self, result_cache, content_hash: str, result, llm):
+        """Caches the JSON under the LLM that answered it, results merged from several LLMs (llm is None) are not cached."""
+        if isinstance(result, dict) and llm is not None and get_active_cassette() is None:
+            result_cache.set(content_hash, llm.provider, llm.model, result, self.system_prompt)
+
     @utils.measure_execution_time
     def user_data_extraction(self, user_data_path: str = demo_data_path, is_st=False):
         """
@@ -135,13 +261,94 @@ def user_data_extraction(self, user_data_path: str = demo_data_path, is_st=False
         return user_data
 
     @utils.measure_execution_time
-    def job_details_extraction(self, url: str=None, job_site_content: str=None, is_st=False):
+    async def auser_data_extraction(self, user_data_path: str = demo_data_path, is_st=False):
+        """Async version of `user_data_extraction`, only the PDF path needs an LLM call."""
+        if user_data_path is not None and os.path.splitext(user_data_path)[1] == ".pdf":
+            print("\nFetching user data...")
+            return await self.aresume_to_json(user_data_path)
+
+        return await asyncio.to_thread(self.user_data_extraction, user_data_path, is_st)
+
+    def job_details_prompt(self, job_site_content: str) -> str:
+        json_parser = JsonOutputParser(pydantic_object=JobDetails)
+
+        return PromptTemplate(
+            template=JOB_DETAILS_EXTRACTOR,
+            input_variables=["job_description"],
+            partial_variables={"format_instructions": json_parser.get_format_instructions()}
+            ).format(job_description=self.fit_to_budget(job_site_content, JOB_DESCRIPTION_TOKEN_BUDGET))
+
+    def split_job_description(self, job_site_content: str) -> list:
+        """Returns the job description as a single chunk if it fits in JOB_DESCRIPTION_TOKEN_BUDGET, else as overlapping chunks."""
+        if count_tokens(job_site_content, self.provider, self.model) <= JOB_DESCRIPTION_TOKEN_BUDGET:
+            return [job_site_content]
+        chunks = split_into_chunks(job_site_content, provider=self.provider, model=self.model)
+        print(f"Job description is over {JOB_DESCRIPTION_TOKEN_BUDGET} tokens, extracting details from {len(chunks)} chunks")
+        return chunks
+
+    def extract_job_details(self, job_site_content: str, is_st=False) -> tuple:
+        """
+        Extracts job details from the job description with the LLM.
+
+        Long job descriptions are split into overlapping chunks whose details are extracted in parallel and merged
+        by `merge_chunk_answers`, so the latency of each call is bounded regardless of the page size.
+
+        Returns:
+            tuple: (job details, LLM that answered), the LLM is None if chunks were answered by different LLMs.
+        """
+        chunks = self.split_job_description(job_site_content)
+        if len(chunks) == 1:
+            return self.llm_response(prompt=self.job_details_prompt(job_site_content), need_json_output=True)
+
+        ctx = get_script_run_ctx() if is_st else None
+        with ThreadPoolExecutor(
+            max_workers=min(self.max_parallel_sections, len(chunks)),
+            initializer=lambda: add_script_run_ctx(threading.current_thread(), ctx) if ctx else None
+            ) as executor:
+            answers = list(executor.map(lambda chunk: self.llm_response(prompt=self.job_details_prompt(chunk), need_json_output=True), chunks))
+
+        return merge_chunk_answers(answers)
+
+    async def aextract_job_details(self, job_site_content: str) -> tuple:
+        """Async version of `extract_job_details`."""
+        chunks = self.split_job_description(job_site_content)
+        if len(chunks) == 1:
+            return await self.allm_response(prompt=self.job_details_prompt(job_site_content), need_json_output=True)
+
+        semaphore = asyncio.Semaphore(self.max_parallel_sections)
+
+        async def extract(chunk):
+            async with semaphore:
+                return await self.allm_response(prompt=self.job_details_prompt(chunk), need_json_output=True)
+
+        return merge_chunk_answers(await asyncio.gather(*[extract(chunk) for chunk in chunks]))
+
+    def save_job_details(self, job_details: dict, url: str = None):
+        """Writes job details JSON to the downloads directory and returns its path."""
+        if url is not None and url.strip() != "":
+            job_details["url"] = url
+        jd_path = utils.job_doc_name(job_details, self.downloads_dir, "jd")
+
+        utils.write_json(jd_path, job_details)
+        print(f"Job Details JSON generated at: {jd_path}")
+
+        if url is not None and url.strip() != "":
+            del job_details['url']
+
+        return jd_path
+
+    @utils.measure_execution_time
+    def job_details_extraction(self, url: str=None, job_site_content: str=None, is_st=False, bypass_cache=False):
         """
         Extracts job details from the specified job URL.
 
+        Job details are cached by the normalized text of the pruned job description, provider, model and schema version,
+        so the same posting, scraped or pasted by any user, is extracted only once.
+
         Args:
             url (str): The URL of the job posting.
-            job_site_content (str): The content of the job posting.
+            job_site_content (str): The content of the job posting, the URL is only scraped if it is not given.
+            bypass_cache (bool, optional): Whether to extract the details again, replacing the cached ones. Defaults to False.
 
         Returns:
             dict: A dictionary containing the extracted job details.
@@ -151,29 +358,48 @@ def job_details_extraction(self, url: str=None, job_site_content: str=None, is_s
 
         try:
             # TODO: Handle case where it returns None. sometime, website take time to load, but scraper complete before that.
-            if url is not None and url.strip() != "":
+            if not job_site_content and url is not None and url.strip() != "":
                 job_site_content = read_data_from_url(url)
             if job_site_content:
-                json_parser = JsonOutputParser(pydantic_object=JobDetails)
+                job_site_content = self.prune_job_description(job_site_content)
+                text_hash = job_details_cache.content_hash(job_site_content)
+
+                job_details = self.get_cached_json(job_details_cache, text_hash, bypass_cache)
+                if job_details is None:
+                    job_details, llm = self.extract_job_details(job_site_content, is_st)
+                    self.set_cached_json(job_details_cache, text_hash, job_details, llm)
+
+                jd_path = self.save_job_details(job_details, url)
                 
-                prompt = PromptTemplate(
-                    template=JOB_DETAILS_EXTRACTOR,
-                    input_variables=["job_description"],
-                    partial_variables={"format_instructions": json_parser.get_format_instructions()}
-                    ).format(job_description=job_site_content)
+                return job_details, jd_path
+            else:
+                raise Exception("Unable to web scrape the job description.")
+
+        except Exception as e:
+            print(e)
+            st.write("Please try pasting the job description text instead of the URL.")
+            st.error(f"Error in Job Details Parsing, {e}")
+            return None, None
 
-                job_details = self.llm.get_response(prompt=prompt, need_json_output=True)
+    @utils.measure_execution_time
+    async def ajob_details_extraction(self, url: str=None, job_site_content: str=None, is_st=False, bypass_cache=False):
+        """Async version of `job_details_extraction`."""
+        print("\nExtracting job details...")
+
+        try:
+            if not job_site_content and url is not None and url.strip() != "":
+                job_site_content = await asyncio.to_thread(read_data_from_url, url)
+            if job_site_content:
+                job_site_content = self.prune_job_description(job_site_content)
+                text_hash = job_details_cache.content_hash(job_site_content)
 
-                if url is not None and url.strip() != "":
-                    job_details["url"] = url
-                jd_path = utils.job_doc_name(job_details, self.downloads_dir, "jd")
+                job_details = await asyncio.to_thread(self.get_cached_json, job_details_cache, text_hash, bypass_cache)
+                if job_details is None:
+                    job_details, llm = await self.aextract_job_details(job_site_content)
+                    await asyncio.to_thread(self.set_cached_json, job_details_cache, text_hash, job_details, llm)
 
-                utils.write_json(jd_path, job_details)
-                print(f"Job Details JSON generated at: {jd_path}")
+                jd_path = await asyncio.to_thread(self.save_job_details, job_details, url)
 
-                if url is not None and url.strip() != "":
-                    del job_details['url']
-                
                 return job_details, jd_path
             else:
                 raise Exception("Unable to web scrape the job description.")
@@ -183,15 +409,67 @@ def job_details_extraction(self, url: str=None, job_site_content: str=None, is_s
             st.write("Please try pasting the job description text instead of the URL.")
             st.error(f"Error in Job Details Parsing, {e}")
             return None, None
+
+    @utils.measure_execution_time
+    async def abulk_job_details_extraction(self, urls: list) -> dict:
+        """
+        Extracts job details from many job URLs.
+
+        Pages are crawled concurrently by `BulkCrawler`, and the details of each page are extracted as soon as it is scraped,
+        so scraping and LLM calls overlap instead of running one URL at a time.
+
+        Args:
+            urls (list): The URLs of the job postings.
+
+        Returns:
+            dict: (job_details, jd_path) of each URL, (None, None) if the page could not be scraped or parsed.
+        """
+        results, tasks = {}, {}
+        async for page in BulkCrawler().crawl(urls):
+            if page["text"]:
+                tasks[page["url"]] = asyncio.ensure_future(self.ajob_details_extraction(url=page["url"], job_site_content=page["text"]))
+            else:
+                print(f"Unable to web scrape {page['url']}. {page['error'] or 'No text found.'}")
+                results[page["url"]] = (None, None)
+
+        for url, task in tasks.items():
+            results[url] = await task
+        return results
+
+    def bulk_job_details_extraction(self, urls: list) -> dict:
+        """Sync version of `abulk_job_details_extraction`, runs its own event loop."""
+        return asyncio.run(self.abulk_job_details_extraction(urls))
+
+    def cover_letter_prompt(self, job_details: dict, user_data: dict) -> str:
+        return PromptTemplate(
+            template=CV_GENERATOR,
+            input_variables=["my_work_information", "job_description"],
+            ).format(
+                job_description=self.compact_job_details(job_details, max_tokens=JOB_DESCRIPTION_TOKEN_BUDGET),
+                my_work_information=self.compact_data(user_data, "user data")
+                )
+
+    def save_cover_letter(self, job_details: dict, cover_letter: str, need_pdf: bool = True, write_text: bool = True):
+        """Writes the cover letter text (and PDF if needed) to the downloads directory and returns the PDF path."""
+        cv_path = utils.job_doc_name(job_details, self.downloads_dir, "cv")
+        if write_text:
+            utils.write_file(cv_path, cover_letter)
+        print("Cover Letter generated at: ", cv_path)
+        if need_pdf:
+            utils.text_to_pdf(cover_letter, cv_path.replace(".txt", ".pdf"))
+            print("Cover Letter PDF generated at: ", cv_path.replace(".txt", ".pdf"))
+
+        return cv_path.replace(".txt", ".pdf")
  
     @utils.measure_execution_time
-    def cover_letter_generator(self, job_details: dict, user_data: dict, need_pdf: bool = True, is_st=False):
+    def cover_letter_generator(self, job_details: dict, user_data: dict, need_pdf: bool = True, is_st=False, stream: bool = False):
         """
         Generates a cover letter based on the provided job details and user data.
 
         Args:
             job_details (dict): A dictionary containing the job description.
             user_data (dict): A dictionary containing the user's resume or work information.
+            stream (bool, optional): Write tokens to the text file and UI as they are generated. The PDF is rendered once the stream closes.
 
         Returns:
             str: The generated cover letter.
@@ -202,35 +480,420 @@ def cover_letter_generator(self, job_details: dict, user_data: dict, need_pdf: b
         print("\nGenerating Cover Letter...")
 
         try:
-            prompt = PromptTemplate(
-                template=CV_GENERATOR,
-                input_variables=["my_work_information", "job_description"],
-                ).format(job_description=job_details, my_work_information=user_data)
+            prompt = self.cover_letter_prompt(job_details, user_data)
 
-            cover_letter = self.llm.get_response(prompt=prompt, expecting_longer_output=True)
+            if stream:
+                cv_txt_path = utils.job_doc_name(job_details, self.downloads_dir, "cv")
+                chunks = utils.stream_to_file(self.llm.stream_response(prompt=prompt, expecting_longer_output=True, max_output_tokens=COVER_LETTER_OUTPUT_TOKENS), cv_txt_path)
 
-            cv_path = utils.job_doc_name(job_details, self.downloads_dir, "cv")
-            utils.write_file(cv_path, cover_letter)
-            print("Cover Letter generated at: ", cv_path)
-            if need_pdf:
-                utils.text_to_pdf(cover_letter, cv_path.replace(".txt", ".pdf"))
-                print("Cover Letter PDF generated at: ", cv_path.replace(".txt", ".pdf"))
+                if is_st:
+                    cover_letter = st.write_stream(chunks)
+                else:
+                    cover_letter_chunks = []
+                    for chunk in chunks:
+                        print(chunk, end="", flush=True)
+                        cover_letter_chunks.append(chunk)
+                    print()
+                    cover_letter = "".join(cover_letter_chunks)
+
+                # The stream reports provider errors itself and yields nothing
+                if not cover_letter:
+                    return None, None
+
+                cv_path = self.save_cover_letter(job_details, cover_letter, need_pdf, write_text=False)
+            else:
+                cover_letter = self.llm.get_response(prompt=prompt, expecting_longer_output=True, max_output_tokens=COVER_LETTER_OUTPUT_TOKENS)
+                cv_path = self.save_cover_letter(job_details, cover_letter, need_pdf)
             
-            return cover_letter, cv_path.replace(".txt", ".pdf")
+            return cover_letter, cv_path
         except Exception as e:
             print(e)
             st.write("Error: \n\n",e)
             return None, None
 
+    @utils.measure_execution_time
+    async def acover_letter_generator(self, job_details: dict, user_data: dict, need_pdf: bool = True, is_st=False):
+        """Async version of `cover_letter_generator`."""
+        print("\nGenerating Cover Letter...")
+
+        try:
+            prompt = self.cover_letter_prompt(job_details, user_data)
+
+            cover_letter = await self.llm.aget_response(prompt=prompt, expecting_longer_output=True, max_output_tokens=COVER_LETTER_OUTPUT_TOKENS)
+            cv_path = await asyncio.to_thread(self.save_cover_letter, job_details, cover_letter, need_pdf)
+
+            return cover_letter, cv_path
+        except Exception as e:
+            print(e)
+            st.write("Error: \n\n",e)
+            return None, None
+
+    def section_prompt(self, section: str, job_details: dict, user_data: dict) -> str:
+        json_parser = JsonOutputParser(pydantic_object=section_mapping[section]["schema"])
+
+        return PromptTemplate(
+            template=section_mapping[section]["prompt"],
+            partial_variables={"format_instructions": json_parser.get_format_instructions()}
+            ).format(
+                section_data = self.compact_data(user_data[section], section, SECTION_DATA_TOKEN_BUDGET),
+                job_description = self.compact_job_details(job_details, section, JOB_DESCRIPTION_TOKEN_BUDGET)
+                )
+
+    def clean_section(self, section: str, response):
+        """Returns the section data from the LLM response, or None if it is missing or empty."""
+        # Check for empty sections
+        if response is not None and isinstance(response, dict):
+            if section in response:
+                if response[section]:
+                    if section == "skill_section":
+                        return [i for i in response['skill_section'] if len(i['skills'])]
+                    else:
+                        return response[section]
+        return None
+
+    def repair_prompt(self, fragment, errors: list, item_type) -> str:
+        return PromptTemplate(
+            template=REPAIR_FRAGMENT,
+            input_variables=["errors", "fragment", "schema"],
+            ).format(errors="\n".join(errors), fragment=json.dumps(fragment), schema=fragment_schema(item_type))
+
+    def find_section_repairs(self, section: str, content):
+        """Parses a section response and finds its invalid entries.
+
+        Returns:
+            tuple: The parsed response and its broken fragments, or (None, None) if it can't be repaired entry by entry.
+        """
+        response = parse_response(content)
+        if isinstance(response, list):
+            response = {section: response}
+        if not isinstance(response, dict) or section not in response:
+            return None, None
+
+        fragments = find_broken_fragments(section_mapping[section]["schema"], response)
+        if fragments is None:
+            print(f"{section} section response doesn't match its schema and can't be repaired.")
+            return None, None
+        return response, fragments
+
+    def is_repairable_section(self, section: str, content) -> bool:
+        """Whether a raw section response is complete JSON matching its schema, at most with entries to repair."""
+        return is_complete_json(content) and self.find_section_repairs(section, content)[0] is not None
+
+    def is_repairable_all_sections(self, sections: list, content) -> bool:
+        """Whether a raw single call response is complete JSON with every section matching its schema, at most with entries to repair."""
+        if not is_complete_json(content):
+            return False
+        response = parse_response(content)
+        return isinstance(response, dict) and all(
+            response.get(section) and find_broken_fragments(section_mapping[section]["schema"], {section: response[section]}) is not None
+            for section in sections
+            )
+
+    def repair_fragment(self, response: dict, path: tuple, errors: list, item_type):
+        field, index = path
+        print(f"Repairing {field}[{index}]: {'; '.join(errors)}")
+        fragment = response[field][index]
+        repaired = self.llm.get_response(
+            prompt=self.repair_prompt(fragment, errors, item_type), need_json_output=True,
+            max_output_tokens=output_token_budget(fragment, self.provider, self.model)
+            )
+        return unwrap_fragment(repaired)
+
+    async def arepair_fragment(self, response: dict, path: tuple, errors: list, item_type):
+        field, index = path
+        print(f"Repairing {field}[{index}]: {'; '.join(errors)}")
+        fragment = response[field][index]
+        repaired = await self.llm.aget_response(
+            prompt=self.repair_prompt(fragment, errors, item_type), need_json_output=True,
+            max_output_tokens=output_token_budget(fragment, self.provider, self.model)
+            )
+        return unwrap_fragment(repaired)
+
+    def validate_section(self, section: str, content):
+        """
+        Validates a section response against its schema, repairing only the invalid entries.
+
+        Each invalid entry, e.g. a work_experience entry missing its dates, is sent alone with its errors
+        in a small repair prompt and merged back, instead of regenerating the whole section.
+        Entries that can't be repaired are dropped.
+
+        Args:
+            section (str): The resume section. e.g. work_experience, projects.
+            content (str | dict): The raw LLM response text, or the parsed response.
+
+        Returns:
+            dict: The valid section response, or None if it is invalid and can't be repaired.
+        """
+        response, fragments = self.find_section_repairs(section, content)
+        if not fragments:
+            return response
+
+        repairs = {
+            path: (item_type, self.repair_fragment(response, path, errors, item_type))
+            for path, errors, item_type in fragments
+            }
+        return merge_repairs(section_mapping[section]["schema"], response, repairs)
+
+    async def avalidate_section(self, section: str, content):
+        """Async version of `validate_section`, entries are repaired concurrently."""
+        response, fragments = self.find_section_repairs(section, content)
+        if not fragments:
+            return response
+
+        repaired = await asyncio.gather(*[
+            self.arepair_fragment(response, path, errors, item_type) for path, errors, item_type in fragments
+            ])
+        repairs = {path: (item_type, fix) for (path, _, item_type), fix in zip(fragments, repaired)}
+        return merge_repairs(section_mapping[section]["schema"], response, repairs)
+
+    def stream_json_response(self, prompt: str, max_output_tokens: int, on_item):
+        """Streams a JSON response, calling `on_item(key, index, item)` for each top-level array element as soon as it is complete.
+
+        Returns:
+            str: The full response text.
+        """
+        parser = StreamingJSONParser()
+        chunks = []
+        for chunk in self.llm.stream_response(
+            prompt=prompt, expecting_longer_output=True, need_json_output=True, max_output_tokens=max_output_tokens
+            ):
+            chunks.append(chunk)
+            for key, index, item in parser.feed(chunk):
+                on_item(key, index, item)
+        return "".join(chunks)
+
+    def generate_section(self, section: str, job_details: dict, user_data: dict, on_item=None):
+        """
+        Generates a single resume section based on the provided job details and user data.
+
+        Args:
+            section (str): The resume section to generate. e.g. work_experience, projects.
+            job_details (dict): A dictionary containing the job description.
+            user_data (dict): A dictionary containing the user's resume or work information.
+            on_item (callable, optional): If given, the response is streamed and `on_item(section, index, item)`
+                is called for each section entry as soon as it is generated.
+
+        Returns:
+            tuple: The cleaned section data (None if failed or empty) and the validated LLM response.
+        """
+        try:
+            prompt = self.section_prompt(section, job_details, user_data)
+            max_output_tokens = output_token_budget(user_data[section], self.provider, self.model)
+            if on_item is not None:
+                def on_section_item(key, index, item):
+                    if key == section:
+                        on_item(section, index, item)
+
+                content = self.stream_json_response(prompt, max_output_tokens, on_section_item)
+            else:
+                content, _ = self.llm_response(
+                    accept=lambda content: self.is_repairable_section(section, content),
+                    prompt=prompt, expecting_longer_output=True, need_json_output=True, max_output_tokens=max_output_tokens, raw_output=True
+                    )
+
+            response = self.validate_section(section, content)
+            return self.clean_section(section, response), response
+        except Exception as e:
+            print(f"Error in {section} section: {e}")
+            return None, None
+
+    async def agenerate_section(self, section: str, job_details: dict, user_data: dict):
+        """Async version of `generate_section`."""
+        try:
+            prompt = self.section_prompt(section, job_details, user_data)
+            content, _ = await self.allm_response(
+                accept=lambda content: self.is_repairable_section(section, content),
+                prompt=prompt, expecting_longer_output=True, need_json_output=True,
+                max_output_tokens=output_token_budget(user_data[section], self.provider, self.model), raw_output=True
+                )
+
+            response = await self.avalidate_section(section, content)
+            return self.clean_section(section, response), response
+        except Exception as e:
+            print(f"Error in {section} section: {e}")
+            return None, None
+
+    def all_sections_prompt(self, sections: list, job_details: dict, user_data: dict) -> str:
+        json_parser = JsonOutputParser(pydantic_object=ResumeSections)
+        sections_data = {section: user_data[section] for section in sections}
+
+        return PromptTemplate(
+            template=ALL_SECTIONS,
+            partial_variables={"format_instructions": json_parser.get_format_instructions()}
+            ).format(
+                section_data = self.compact_data(sections_data, "sections data", SECTION_DATA_TOKEN_BUDGET * len(sections)),
+                job_description = self.compact_job_details(job_details, sections, JOB_DESCRIPTION_TOKEN_BUDGET)
+                )
+
+    def all_sections_output_tokens(self, sections: list, user_data: dict) -> int:
+        return min(SINGLE_CALL_MAX_OUTPUT_TOKENS, sum(output_token_budget(user_data[section], self.provider, self.model) for section in sections))
+
+    def split_all_sections(self, sections: list, content) -> dict:
+        """Validates and repairs each section of a single call response, sections that still fail validation are left out."""
+        response = parse_response(content)
+        results = {}
+        for section in sections:
+            section_response = None
+            if isinstance(response, dict) and response.get(section):
+                section_response = self.validate_section(section, {section: response[section]})
+
+            if section_response is not None:
+                results[section] = (self.clean_section(section, section_response), section_response)
+            else:
+                print(f"{section} section failed validation in single call, falling back to section call.")
+        return results
+
+    async def asplit_all_sections(self, sections: list, content) -> dict:
+        """Async version of `split_all_sections`."""
+        response = parse_response(content)
+        valid_sections = [section for section in sections if isinstance(response, dict) and response.get(section)]
+        section_responses = await asyncio.gather(*[
+            self.avalidate_section(section, {section: response[section]}) for section in valid_sections
+            ])
+
+        results = {}
+        for section, section_response in zip(valid_sections, section_responses):
+            if section_response is not None:
+                results[section] = (self.clean_section(section, section_response), section_response)
+        for section in sections:
+            if section not in results:
+                print(f"{section} section failed validation in single call, falling back to section call.")
+        return results
+
+    def generate_all_sections(self, sections: list, job_details: dict, user_data: dict, on_item=None) -> dict:
+        """
+        Generates all the given resume sections with a single LLM call.
+
+        Args:
+            on_item (callable, optional): If given, the response is streamed and `on_item(section, index, item)`
+                is called for each section entry as soon as it is generated.
+
+        Returns:
+            dict: The cleaned section data and raw response of each valid section.
+        """
+        try:
+            prompt = self.all_sections_prompt(sections, job_details, user_data)
+            max_output_tokens = self.all_sections_output_tokens(sections, user_data)
+            if on_item is not None:
+                def on_section_item(key, index, item):
+                    if key in sections:
+                        on_item(key, index, item)
+
+                content = self.stream_json_response(prompt, max_output_tokens, on_section_item)
+            else:
+                content, _ = self.llm_response(
+                    accept=lambda content: self.is_repairable_all_sections(sections, content),
+                    prompt=prompt, expecting_longer_output=True, need_json_output=True, max_output_tokens=max_output_tokens, raw_output=True
+                    )
+            return self.split_all_sections(sections, content)
+        except Exception as e:
+            print(f"Error in single call sections generation: {e}")
+            return {}
+
+    async def agenerate_all_sections(self, sections: list, job_details: dict, user_data: dict) -> dict:
+        """Async version of `generate_all_sections`."""
+        try:
+            prompt = self.all_sections_prompt(sections, job_details, user_data)
+            content, _ = await self.allm_response(
+                accept=lambda content: self.is_repairable_all_sections(sections, content),
+                prompt=prompt, expecting_longer_output=True, need_json_output=True,
+                max_output_tokens=self.all_sections_output_tokens(sections, user_data), raw_output=True
+                )
+            return await self.asplit_all_sections(sections, content)
+        except Exception as e:
+            print(f"Error in single call sections generation: {e}")
+            return {}
+
+    def generate_sections(self, job_details: dict, user_data: dict, section_mode: str = None, is_st=False, on_item=None) -> dict:
+        """
+        Generates all resume sections present in the user data.
+
+        In "concurrent" mode each section has its own prompt and the prompts run concurrently, as
+        each one only depends on job_details and user_data. In "single_call" mode all sections are
+        asked in one prompt, and only the sections that fail validation are generated separately.
+
+        If `on_item` is given, responses are streamed and `on_item(section, index, item)` is called
+        for each section entry as soon as it is generated, possibly from worker threads.
+
+        Returns:
+            dict: The cleaned section data and raw LLM response of each section, in RESUME_SECTIONS order.
+        """
+        section_mode = section_mode or self.section_mode
+        sections = [section for section in RESUME_SECTIONS if section in user_data]
+
+        results = {}
+        if section_mode == "single_call" and sections:
+            results = self.generate_all_sections(sections, job_details, user_data, on_item)
+
+        pending = [section for section in sections if section not in results]
+        if pending:
+            ctx = get_script_run_ctx() if is_st else None
+
+            with ThreadPoolExecutor(
+                max_workers=min(self.max_parallel_sections, len(pending)),
+                initializer=lambda: add_script_run_ctx(threading.current_thread(), ctx) if ctx else None
+                ) as executor:
+                results.update(zip(pending, executor.map(lambda section: self.generate_section(section, job_details, user_data, on_item), pending)))
+
+        # Keep section order deterministic, regardless of completion order
+        return {section: results[section] for section in sections}
+
+    async def agenerate_sections(self, job_details: dict, user_data: dict, section_mode: str = None) -> dict:
+        """Async version of `generate_sections`."""
+        section_mode = section_mode or self.section_mode
+        sections = [section for section in RESUME_SECTIONS if section in user_data]
+
+        results = {}
+        if section_mode == "single_call" and sections:
+            results = await self.agenerate_all_sections(sections, job_details, user_data)
+
+        pending = [section for section in sections if section not in results]
+        semaphore = asyncio.Semaphore(self.max_parallel_sections)
+
+        async def generate(section):
+            async with semaphore:
+                return await self.agenerate_section(section, job_details, user_data)
+
+        results.update(zip(pending, await asyncio.gather(*[generate(section) for section in pending])))
+
+        return {section: results[section] for section in sections}
+
+    def personal_details(self, user_data: dict) -> dict:
+        return {
+            "name": user_data["name"], 
+            "phone": user_data["phone"], 
+            "email": user_data["email"],
+            "github": user_data["media"]["github"], 
+            "linkedin": user_data["media"]["linkedin"]
+            }
+
+    def save_resume(self, job_details: dict, resume_details: dict, escaped_sections: dict = None):
+        """Writes resume JSON, renders the resume PDF and returns the PDF path.
+
+        `escaped_sections` holds section items already escaped for LaTeX while they were streamed, see `escape_resume_for_latex`.
+        """
+        resume_details['keywords'] = ', '.join(job_details['keywords'])
+        
+        resume_path = utils.job_doc_name(job_details, self.downloads_dir, "resume")
+
+        utils.write_json(resume_path, resume_details)
+        resume_path = resume_path.replace(".json", ".pdf")
+
+        resume_latex = latex_to_pdf(resume_details, resume_path, escaped_sections)
+
+        return resume_path
 
     @utils.measure_execution_time
-    def resume_builder(self, job_details: dict, user_data: dict, is_st=False):
+    def resume_builder(self, job_details: dict, user_data: dict, is_st=False, section_mode: str = None, stream_sections: bool = None):
         """
         Builds a resume based on the provided job details and user data.
 
         Args:
             job_details (dict): A dictionary containing the job description.
             user_data (dict): A dictionary containing the user's resume or work information.
+            section_mode (str, optional): "concurrent" or "single_call". Defaults to the model's section mode.
+            stream_sections (bool, optional): Stream section responses, to render and LaTeX escape section entries
+                as they are generated. Defaults to True in Streamlit.
 
         Returns:
             dict: The generated resume details.
@@ -238,6 +901,7 @@ def resume_builder(self, job_details: dict, user_data: dict, is_st=False):
         Raises:
             FileNotFoundError: If the system prompt files are not found.
         """
+        resume_path, resume_details = None, None
         try:
             print("\nGenerating Resume Details...")
             if is_st: st.toast("Generating Resume Details...")
@@ -246,53 +910,40 @@ def resume_builder(self, job_details: dict, user_data: dict, is_st=False):
 
             # Personal Information Section
             if is_st: st.toast("Processing Resume's Personal Info Section...")
-            resume_details["personal"] = { 
-                "name": user_data["name"], 
-                "phone": user_data["phone"], 
-                "email": user_data["email"],
-                "github": user_data["media"]["github"], 
-                "linkedin": user_data["media"]["linkedin"]
-                }
+            resume_details["personal"] = self.personal_details(user_data)
             st.markdown("**Personal Info Section**")
             st.write(resume_details)
 
             # Other Sections
-            for section in ['work_experience', 'projects', 'skill_section', 'education', 'certifications', 'achievements']:
-                section_log = f"Processing Resume's {section.upper()} Section..."
-                if is_st: st.toast(section_log)
+            if is_st: st.toast("Processing Resume's Other Sections...")
+            stream_sections = is_st if stream_sections is None else stream_sections
+            escaped_sections, placeholders = {}, {}
 
-                json_parser = JsonOutputParser(pydantic_object=section_mapping[section]["schema"])
-                
-                prompt = PromptTemplate(
-                    template=section_mapping[section]["prompt"],
-                    partial_variables={"format_instructions": json_parser.get_format_instructions()}
-                    ).format(section_data = json.dumps(user_data[section]), job_description = json.dumps(job_details))
-
-                response = self.llm.get_response(prompt=prompt, expecting_longer_output=True, need_json_output=True)
-
-                # Check for empty sections
-                if response is not None and isinstance(response, dict):
-                    if section in response:
-                        if response[section]:
-                            if section == "skill_section":
-                                resume_details[section] = [i for i in response['skill_section'] if len(i['skills'])]
-                            else:
-                                resume_details[section] = response[section]
-                
-                if is_st:
+            if is_st and stream_sections:
+                for section in [section for section in RESUME_SECTIONS if section in user_data]:
                     st.markdown(f"**{section.upper()} Section**")
-                    st.write(response)
+                    placeholders[section] = st.empty()
 
-            resume_details['keywords'] = ', '.join(job_details['keywords'])
-            
-            resume_path = utils.job_doc_name(job_details, self.downloads_dir, "resume")
+            def on_item(section, index, item):
+                # Each section is streamed by a single thread, so entries of a section arrive in order
+                streamed = escaped_sections.setdefault(section, {})
+                streamed[index] = (item, escape_for_latex(item))
+                if section in placeholders:
+                    placeholders[section].write({section: [item for item, _ in streamed.values()]})
+
+            results = self.generate_sections(job_details, user_data, section_mode, is_st, on_item if stream_sections else None)
+
+            for section, (section_data, response) in results.items():
+                if section_data:
+                    resume_details[section] = section_data
 
-            utils.write_json(resume_path, resume_details)
-            resume_path = resume_path.replace(".json", ".pdf")
-            # st.write(f"resume_path: {resume_path}")
+                if section in placeholders:
+                    placeholders[section].write(response)
+                elif is_st:
+                    st.markdown(f"**{section.upper()} Section**")
+                    st.write(response)
 
-            resume_latex = latex_to_pdf(resume_details, resume_path)
-            # st.write(f"resume_pdf_path: {resume_pdf_path}")
+            resume_path = self.save_resume(job_details, resume_details, escaped_sections)
 
             return resume_path, resume_details
         except Exception as e:
@@ -300,6 +951,48 @@ def resume_builder(self, job_details: dict, user_data: dict, is_st=False):
             st.write("Error: \n\n",e)
             return resume_path, resume_details
 
+    @utils.measure_execution_time
+    async def aresume_builder(self, job_details: dict, user_data: dict, is_st=False, section_mode: str = None):
+        """Async version of `resume_builder`."""
+        resume_path, resume_details = None, None
+        try:
+            print("\nGenerating Resume Details...")
+
+            resume_details = dict()
+            resume_details["personal"] = self.personal_details(user_data)
+
+            results = await self.agenerate_sections(job_details, user_data, section_mode)
+
+            for section, (section_data, response) in results.items():
+                if section_data:
+                    resume_details[section] = section_data
+
+            resume_path = await asyncio.to_thread(self.save_resume, job_details, resume_details)
+
+            return resume_path, resume_details
+        except Exception as e:
+            print(e)
+            return resume_path, resume_details
+
+    def calculate_metrics(self, resume_details: dict, user_data: dict, job_details: dict):
+        """Prints similarity metrics between the generated resume, user data and job details."""
+        for metric in ['jaccard_similarity', 'overlap_coefficient', 'cosine_similarity']:
+            print(f"\nCalculating {metric}...")
+
+            if metric == 'vector_embedding_similarity':
+                llm = self.get_llm_instance('')
+                user_personlization = globals()[metric](llm, json.dumps(resume_details), json.dumps(user_data))
+                job_alignment = globals()[metric](llm, json.dumps(resume_details), json.dumps(job_details))
+                job_match = globals()[metric](llm, json.dumps(user_data), json.dumps(job_details))
+            else:
+                user_personlization = globals()[metric](json.dumps(resume_details), json.dumps(user_data))
+                job_alignment = globals()[metric](json.dumps(resume_details), json.dumps(job_details))
+                job_match = globals()[metric](json.dumps(user_data), json.dumps(job_details))
+
+            print("User Personlization Score(resume,master_data): ", user_personlization)
+            print("Job Alignment Score(resume,JD): ", job_alignment)
+            print("Job Match Score(master_data,JD): ", job_match)
+
     def resume_cv_pipeline(self, job_url: str, user_data_path: str = demo_data_path):
         """Run the Auto Apply Pipeline.
 
@@ -335,24 +1028,54 @@ def resume_cv_pipeline(self, job_url: str, user_data_path: str = demo_data_path)
             cv_details, cv_path = self.cover_letter_generator(job_details, user_data)
 
             # Calculate metrics
-            for metric in ['jaccard_similarity', 'overlap_coefficient', 'cosine_similarity']:
-                print(f"\nCalculating {metric}...")
-
-                if metric == 'vector_embedding_similarity':
-                    llm = self.get_llm_instance('')
-                    user_personlization = globals()[metric](llm, json.dumps(resume_details), json.dumps(user_data))
-                    job_alignment = globals()[metric](llm, json.dumps(resume_details), json.dumps(job_details))
-                    job_match = globals()[metric](llm, json.dumps(user_data), json.dumps(job_details))
-                else:
-                    user_personlization = globals()[metric](json.dumps(resume_details), json.dumps(user_data))
-                    job_alignment = globals()[metric](json.dumps(resume_details), json.dumps(job_details))
-                    job_match = globals()[metric](json.dumps(user_data), json.dumps(job_details))
+            self.calculate_metrics(resume_details, user_data, job_details)
+
+            print("\nLLM token usage: ", usage_tracker.summary())
+            if self.fallback_chain:
+                print("\nLLM provider wins: ", self.llm.summary())
+            print("\nDone!!!")
+        except Exception as e:
+            print(e)
+            return None
+
+    async def aresume_cv_pipeline(self, job_url: str, user_data_path: str = demo_data_path):
+        """Async version of `resume_cv_pipeline`.
+
+        User data and job details are extracted concurrently, then the resume and cover letter
+        are generated concurrently, so many pipelines can run in one event loop without a thread per request.
+
+        Args:
+            job_url (str): The URL of the job to apply for.
+            user_data_path (str, optional): The path to the user profile data file.
+
+        Returns:
+            None: The function prints the progress and results to the console.
+        """
+        try:
+            if user_data_path is None or user_data_path.strip() == "":
+                user_data_path = demo_data_path
+
+            print("Starting Auto Resume and CV Pipeline")
+            if job_url is None or job_url.strip() == "":
+                print("Job URL is required.")
+                return
+
+            user_data, (job_details, jd_path) = await asyncio.gather(
+                self.auser_data_extraction(user_data_path),
+                self.ajob_details_extraction(url=job_url),
+            )
+
+            (resume_path, resume_details), (cv_details, cv_path) = await asyncio.gather(
+                self.aresume_builder(job_details, user_data),
+                self.acover_letter_generator(job_details, user_data),
+            )
 
-                print("User Personlization Score(resume,master_data): ", user_personlization)
-                print("Job Alignment Score(resume,JD): ", job_alignment)
-                print("Job Match Score(master_data,JD): ", job_match)
+            await asyncio.to_thread(self.calculate_metrics, resume_details, user_data, job_details)
 
+            print("\nLLM token usage: ", usage_tracker.summary())
+            if self.fallback_chain:
+                print("\nLLM provider wins: ", self.llm.summary())
             print("\nDone!!!")
         except Exception as e:
             print(e)
-            return None
\ No newline at end of file
+            return None
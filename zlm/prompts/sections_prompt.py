@@ -264,4 +264,58 @@
 </example>
 
 {format_instructions}
-"""
\ No newline at end of file
+"""
+
+ALL_SECTIONS="""You are going to write all JSON resume sections ("Work Experience", "Projects", "Skills", "Education", "Certifications" and "Achievements") for an applicant applying for job posts, in a single JSON document.
+
+Step to follow:
+1. Analyze my details of each section to match job requirements.
+2. Create a JSON resume section for each section that highlights strongest matches.
+3. Optimize JSON sections for clarity and relevance to the job description.
+
+Instructions:
+1. Work Experience & Projects: Craft three highly relevant experiences and projects aligned with the job description.
+  1.1. Bullet points: 3 per experience or project, closely mirroring job requirements.
+  1.2. Impact: Quantify each bullet point for measurable results.
+  1.3. Storytelling: Utilize STAR methodology (Situation, Task, Action, Result) implicitly within each bullet point.
+  1.4. Structure: Each bullet point follows "Did X by doing Y, achieved Z" format.
+2. Skills: Group skills relevant to the job, such as programming languages, tools & technologies, cloud & DevOps.
+3. Education, Certifications & Achievements: Keep only job relevant courses, certifications and achievements.
+4. Honesty: Prioritize truthfulness and objective language. Never invent details that are not in my data.
+5. Specificity: Prioritize relevance to the specific job over general achievements.
+6. Style:
+  6.1. Clarity: Clear expression trumps impressiveness.
+  6.2. Voice: Use active voice whenever possible.
+  6.3. Proofreading: Ensure impeccable spelling and grammar.
+7. Output: Return only the sections present in my details, each under its own key: "work_experience", "projects", "skill_section", "education", "certifications", "achievements".
+
+<my_details>
+{section_data}
+</my_details>
+
+<job_description>
+{job_description}
+</job_description>
+
+{format_instructions}
+"""
+
+REPAIR_FRAGMENT = """You are going to fix a JSON fragment of a resume section that does not conform to its JSON schema.
+
+Instructions:
+1. Fix only the listed errors, keep all other content exactly as it is.
+2. Honesty: Never invent details. If a required value is unknown, use an empty string or an empty list.
+3. Output: Return only a JSON object with the fixed fragment under the "fragment" key, e.g. {{"fragment": ...}}.
+
+<errors>
+{errors}
+</errors>
+
+<fragment>
+{fragment}
+</fragment>
+
+<schema>
+{schema}
+</schema>
+"""
@@ -83,4 +83,12 @@ class ResumeSchema(BaseModel):
     skill_section: List[SkillSection] = Field(description="Skill sections, each containing a group of skills and competencies relevant to the job.")
     projects: List[Project] = Field(description="Project experiences, including project name, type, link, resources, dates, and description.")
     certifications: List[Certification] = Field(description="job relevant certifications that you have earned, including the name, issuing organization, and a link to verify the certification.")
-    achievements: List[str] = Field(description="job relevant key accomplishments, awards, or recognitions that demonstrate your skills and abilities.")
\ No newline at end of file
+    achievements: List[str] = Field(description="job relevant key accomplishments, awards, or recognitions that demonstrate your skills and abilities.")
+
+class ResumeSections(BaseModel):
+    work_experience: Optional[List[Experience]] = Field(default=None, description="Work experiences, including job title, company, location, dates, and description.")
+    projects: Optional[List[Project]] = Field(default=None, description="Project experiences, including project name, type, link, resources, dates, and description.")
+    skill_section: Optional[List[SkillSection]] = Field(default=None, description="Skill sections, each containing a group of skills and competencies relevant to the job.")
+    education: Optional[List[Education]] = Field(default=None, description="Educational qualifications, including degree, institution, dates, and relevant courses.")
+    certifications: Optional[List[Certification]] = Field(default=None, description="job relevant certifications that you have earned, including the name, issuing organization, and a link to verify the certification.")
+    achievements: Optional[List[str]] = Field(default=None, description="job relevant key accomplishments, awards, or recognitions that demonstrate your skills and abilities.")
@@ -0,0 +1,92 @@
+'''
+-----------------------------------------------------------------------
+File: utils/benchmark.py
+Creation Time: Oct 17th 2026, 4:20 pm
+Author: Saurabh Zinjad
+Developer Email: saurabhzinjad@gmail.com
+Copyright (c) 2023-2024 Saurabh Zinjad. All rights reserved | https://github.com/Ztrimus
+-----------------------------------------------------------------------
+'''
+
+import json
+import time
+import argparse
+import statistics
+
+from zlm.utils.token_budget import usage_tracker
+from zlm.utils.utils import read_json
+from zlm.variables import SECTION_GENERATION_MODES
+
+
+def usage_totals() -> dict:
+    totals = {"calls": 0, "prompt_tokens": 0, "output_tokens": 0}
+    for usage in usage_tracker.summary().values():
+        for key in totals:
+            totals[key] += usage[key]
+    return totals
+
+
+def benchmark_section_modes(auto_apply_model, job_details: dict, user_data: dict, runs: int = 3, modes: list = SECTION_GENERATION_MODES) -> dict:
+    """Times resume sections generation in each section mode.
+
+    The LLM response cache is disabled while benchmarking, so every run reaches the provider.
+
+    Args:
+        auto_apply_model (AutoApplyModel): The model to benchmark.
+        job_details (dict): A dictionary containing the job description.
+        user_data (dict): A dictionary containing the user's resume or work information.
+        runs (int, optional): Number of runs per mode. Defaults to 3.
+        modes (list, optional): Section modes to compare. Defaults to all modes.
+
+    Returns:
+        dict: Latency stats, token usage and number of generated sections per mode.
+    """
+    # A hedged LLM wraps one LLM per provider in its chain
+    llms = getattr(auto_apply_model.llm, "llms", [auto_apply_model.llm])
+    caches = [llm.cache for llm in llms]
+    for llm in llms:
+        llm.cache = None
+
+    results = {}
+    try:
+        for mode in modes:
+            timings, n_sections = [], []
+            usage_before = usage_totals()
+
+            for _ in range(runs):
+                start_time = time.perf_counter()
+                sections = auto_apply_model.generate_sections(job_details, user_data, section_mode=mode)
+                timings.append(time.perf_counter() - start_time)
+                n_sections.append(sum(1 for section_data, _ in sections.values() if section_data))
+
+            usage_after = usage_totals()
+            results[mode] = {
+                "runs": runs,
+                "mean_seconds": statistics.mean(timings),
+                "min_seconds": min(timings),
+                "max_seconds": max(timings),
+                "sections_generated": statistics.mean(n_sections),
+                **{f"{key}_per_run": (usage_after[key] - usage_before[key]) / runs for key in usage_after},
+            }
+    finally:
+        for llm, cache in zip(llms, caches):
+            llm.cache = cache
+
+    return results
+
+
+if __name__ == "__main__":
+    from zlm import AutoApplyModel
+
+    parser = argparse.ArgumentParser(description="Benchmark resume section generation modes.")
+    parser.add_argument("-j", "--job_details", required=True, help="Path of job details JSON file. e.g. a generated _JD.json")
+    parser.add_argument("-m", "--master_data", required=True, help="Path of user's master data JSON file.")
+    parser.add_argument("-k", "--api_key", default="os", help="LLM Provider API Keys")
+    parser.add_argument("-p", "--provider", help="LLM provider name. support for openai, gemini")
+    parser.add_argument("-l", "--model", help="LLM model name")
+    parser.add_argument("-r", "--runs", type=int, default=3, help="Number of runs per mode")
+    args = parser.parse_args()
+
+    model = AutoApplyModel(args.api_key, args.provider, args.model)
+    results = benchmark_section_modes(model, read_json(args.job_details), read_json(args.master_data), args.runs)
+    print(json.dumps(results, indent=2))
@@ -0,0 +1,249 @@
+'''
+-----------------------------------------------------------------------
+File: utils/cache.py
+Creation Time: Oct 17th 2026, 10:12 am
+Author: Saurabh Zinjad
+Developer Email: saurabhzinjad@gmail.com
+Copyright (c) 2023-2024 Saurabh Zinjad. All rights reserved | https://github.com/Ztrimus
+-----------------------------------------------------------------------
+'''
+
+import os
+import json
+import time
+import sqlite3
+import hashlib
+import threading
+from functools import cached_property
+
+from zlm.variables import (
+    CACHE_DIR, JOB_DETAILS_CACHE_MAX_ENTRIES, JOB_DETAILS_CACHE_TTL, LLM_CACHE_MAX_ENTRIES, LLM_CACHE_MAX_SIZE_MB, LLM_CACHE_TTL, PAGE_CACHE_MAX_ENTRIES, PAGE_CACHE_MAX_SIZE_MB, PAGE_CACHE_TTL,
+    PDF_TEXT_CACHE_MAX_ENTRIES, PDF_TEXT_CACHE_MAX_SIZE_MB, RESUME_JSON_CACHE_MAX_ENTRIES, RESUME_JSON_CACHE_TTL
+)
+
+
+def make_key(*parts) -> str:
+    """Build a content-addressed cache key from the given parts.
+
+    Args:
+        *parts: JSON serializable values that identify the cached content.
+
+    Returns:
+        str: The sha256 hex digest of the serialized parts.
+    """
+    serialized = json.dumps(parts, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(serialized.encode("utf-8")).hexdigest()
+
+
+class SQLiteCache:
+    """
+    A thread-safe key-value cache stored in a local SQLite file.
+
+    Entries older than `ttl` seconds are treated as missing. When the cache grows beyond
+    `max_entries` or `max_size_mb`, the least recently used entries are evicted.
+
+    Args:
+        path (str): The path of the SQLite file.
+        max_entries (int, optional): Max number of entries to keep. None means unlimited.
+        max_size_mb (float, optional): Max total size of stored values in MB. None means unlimited.
+        ttl (int, optional): Max age of an entry in seconds. None means entries never expire.
+    """
+
+    def __init__(self, path: str, max_entries: int = None, max_size_mb: float = None, ttl: int = None):
+        self.path = path
+        self.max_entries = max_entries
+        self.max_size = max_size_mb * 1024 * 1024 if max_size_mb else None
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            """CREATE TABLE IF NOT EXISTS cache (
+                key TEXT PRIMARY KEY,
+                value TEXT NOT NULL,
+                size INTEGER NOT NULL,
+                created_at REAL NOT NULL,
+                accessed_at REAL NOT NULL
+            )"""
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_cache_accessed_at ON cache (accessed_at)")
+        self._conn.commit()
+
+    def get(self, key: str):
+        """Returns the cached value for the key, or None if missing or expired."""
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute("SELECT value, created_at FROM cache WHERE key = ?", (key,)).fetchone()
+
+            if row is None or (self.ttl is not None and now - row[1] > self.ttl):
+                if row is not None:
+                    self._conn.execute("DELETE FROM cache WHERE key = ?", (key,))
+                    self._conn.commit()
+                self.misses += 1
+                return None
+
+            self._conn.execute("UPDATE cache SET accessed_at = ? WHERE key = ?", (now, key))
+            self._conn.commit()
+            self.hits += 1
+            return row[0]
+
+    def set(self, key: str, value: str):
+        """Stores the value for the key and evicts old entries if the cache is over its limits."""
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO cache (key, value, size, created_at, accessed_at) VALUES (?, ?, ?, ?, ?)",
+                (key, value, len(value.encode("utf-8")), now, now),
+            )
+            self._evict(now)
+            self._conn.commit()
+
+    def delete(self, key: str):
+        with self._lock:
+            self._conn.execute("DELETE FROM cache WHERE key = ?", (key,))
+            self._conn.commit()
+
+    def delete_prefix(self, prefix: str) -> int:
+        """Deletes all entries whose key starts with the prefix, and returns how many were deleted."""
+        with self._lock:
+            cursor = self._conn.execute("DELETE FROM cache WHERE substr(key, 1, ?) = ?", (len(prefix), prefix))
+            self._conn.commit()
+            return cursor.rowcount
+
+    def clear(self):
+        with self._lock:
+            self._conn.execute("DELETE FROM cache")
+            self._conn.commit()
+            self.hits, self.misses = 0, 0
+
+    def _evict(self, now: float):
+        if self.ttl is not None:
+            self._conn.execute("DELETE FROM cache WHERE created_at < ?", (now - self.ttl,))
+
+        if self.max_entries is not None:
+            self._conn.execute(
+                "DELETE FROM cache WHERE key IN (SELECT key FROM cache ORDER BY accessed_at DESC LIMIT -1 OFFSET ?)",
+                (self.max_entries,),
+            )
+
+        if self.max_size is not None:
+            total_size = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM cache").fetchone()[0]
+            if total_size > self.max_size:
+                rows = self._conn.execute("SELECT key, size FROM cache ORDER BY accessed_at ASC").fetchall()
+                evict_keys = []
+                for key, size in rows:
+                    if total_size <= self.max_size:
+                        break
+                    evict_keys.append((key,))
+                    total_size -= size
+                self._conn.executemany("DELETE FROM cache WHERE key = ?", evict_keys)
+
+    def stats(self) -> dict:
+        """Returns hit/miss counters and the current size of the cache."""
+        with self._lock:
+            entries, size = self._conn.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM cache").fetchone()
+
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "entries": entries,
+            "size_mb": size / (1024 * 1024),
+        }
+
+
+class JSONResultCache:
+    """
+    A persistent cache of the JSON extracted by an LLM from some content, keyed by (content hash, provider, model, system prompt, version).
+
+    Keys start with the content hash, so every cached result of a content can be invalidated at once for all providers and models.
+    The version is a hash of what shapes the result, e.g. the schema and extraction prompt, so results of older versions are never returned.
+
+    Args:
+        get_cache (callable): Returns the underlying SQLiteCache, called on first use so the SQLite file isn't opened on import.
+        hash_content (callable): Returns the hash of the content the results are extracted from.
+        version_parts (callable): Returns the JSON serializable values the results depend on besides the content, provider and model,
+            called on first use as building schemas is slow.
+    """
+
+    def __init__(self, get_cache, hash_content, version_parts):
+        self.get_cache = get_cache
+        self.content_hash = hash_content
+        self.version_parts = version_parts
+
+    @cached_property
+    def version(self) -> str:
+        return make_key(*self.version_parts())[:16]
+
+    @property
+    def cache(self) -> SQLiteCache:
+        return self.get_cache()
+
+    def key(self, content_hash: str, provider: str, model: str, system_prompt: str = None) -> str:
+        return f"{content_hash}:{make_key(provider, model, system_prompt, self.version)}"
+
+    def get(self, content_hash: str, provider: str, model: str, system_prompt: str = None):
+        """Returns the cached result, or None if missing or expired."""
+        cached = self.cache.get(self.key(content_hash, provider, model, system_prompt))
+        return json.loads(cached) if cached is not None else None
+
+    def set(self, content_hash: str, provider: str, model: str, result: dict, system_prompt: str = None):
+        """Stores the result, empty or failed extractions are not cached."""
+        if result:
+            self.cache.set(self.key(content_hash, provider, model, system_prompt), json.dumps(result, ensure_ascii=False))
+
+    def invalidate(self, content_hash: str = None) -> int:
+        """Deletes the cached results of a content for every provider and model, or the whole cache if no hash is given.
+
+        Returns:
+            int: The number of deleted entries, -1 when the whole cache is cleared.
+        """
+        if content_hash is None:
+            self.cache.clear()
+            return -1
+        return self.cache.delete_prefix(f"{content_hash}:")
+
+    def stats(self) -> dict:
+        """Returns the hit rate and size of the cache."""
+        return self.cache.stats()
+
+
+_caches = {}
+_caches_lock = threading.Lock()
+
+def _get_cache(name: str, **limits) -> SQLiteCache:
+    """Returns the process-wide cache stored in `CACHE_DIR/<name>.sqlite`, opened on first use with the given limits."""
+    with _caches_lock:
+        if name not in _caches:
+            _caches[name] = SQLiteCache(os.path.join(CACHE_DIR, f"{name}.sqlite"), **limits)
+        return _caches[name]
+
+
+def get_llm_cache() -> SQLiteCache:
+    """Returns the process-wide LLM response cache."""
+    return _get_cache("llm_responses", max_entries=LLM_CACHE_MAX_ENTRIES, max_size_mb=LLM_CACHE_MAX_SIZE_MB, ttl=LLM_CACHE_TTL)
+
+
+def get_pdf_text_cache() -> SQLiteCache:
+    """Returns the process-wide cache of text extracted from PDFs."""
+    return _get_cache("pdf_text", max_entries=PDF_TEXT_CACHE_MAX_ENTRIES, max_size_mb=PDF_TEXT_CACHE_MAX_SIZE_MB)
+
+
+def get_resume_json_cache() -> SQLiteCache:
+    """Returns the process-wide cache of resume JSON extracted from PDFs."""
+    return _get_cache("resume_json", max_entries=RESUME_JSON_CACHE_MAX_ENTRIES, ttl=RESUME_JSON_CACHE_TTL)
+
+
+def get_page_cache() -> SQLiteCache:
+    """Returns the process-wide cache of scraped web pages."""
+    return _get_cache("pages", max_entries=PAGE_CACHE_MAX_ENTRIES, max_size_mb=PAGE_CACHE_MAX_SIZE_MB, ttl=PAGE_CACHE_TTL)
+
+
+def get_job_details_cache() -> SQLiteCache:
+    """Returns the process-wide cache of job details extracted from job descriptions."""
+    return _get_cache("job_details", max_entries=JOB_DETAILS_CACHE_MAX_ENTRIES, ttl=JOB_DETAILS_CACHE_TTL)
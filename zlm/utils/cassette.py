@@ -0,0 +1,221 @@
+'''
+-----------------------------------------------------------------------
+File: utils/cassette.py
+Creation Time: Oct 17th 2026, 6:30 pm
+Author: Saurabh Zinjad
+Developer Email: saurabhzinjad@gmail.com
+Copyright (c) 2023-2024 Saurabh Zinjad. All rights reserved | https://github.com/Ztrimus
+-----------------------------------------------------------------------
+
+Record and replay of LLM provider calls, to time the non-LLM parts of the pipeline without provider variance.
+
+Usage:
+    with use_cassette("run.jsonl.gz", mode="record"):
+        model.resume_cv_pipeline(job_url, user_data_path)
+
+    with use_cassette("run.jsonl.gz", mode="replay", latency="zero"):
+        model.resume_cv_pipeline(job_url, user_data_path)
+'''
+
+import gzip
+import json
+import time
+import base64
+import asyncio
+import threading
+import numpy as np
+from contextlib import contextmanager
+
+from zlm.utils.cache import make_key
+from zlm.variables import CASSETTE_MODES, REPLAY_LATENCIES
+
+# Async and sync provider calls are recorded under the same kind, so either can replay the other
+CALL_KINDS = {"_generate": "generate", "_agenerate": "generate", "_stream": "stream", "_embed": "embed", "_aembed": "embed"}
+
+
+class CassetteMissError(Exception):
+    """Raised when a replayed call was not recorded in the cassette."""
+
+
+def encode_vectors(vectors) -> list:
+    return [base64.b64encode(np.asarray(vector, dtype=np.float32).tobytes()).decode("ascii") for vector in vectors]
+
+
+def decode_vectors(vectors) -> list:
+    return [np.frombuffer(base64.b64decode(vector), dtype=np.float32) for vector in vectors]
+
+
+class Cassette:
+    """
+    A file of recorded LLM provider calls, stored as JSON lines (gzipped if the path ends with .gz).
+
+    Calls are keyed by provider, model, system prompt, kind and arguments. A call made several times
+    is replayed in the recorded order, repeating the last response once they run out.
+
+    Args:
+        path (str): The cassette file path.
+        mode (str, optional): "record" to call the providers and save the calls, "replay" to serve saved calls. Defaults to "replay".
+        latency (str, optional): Replay latency, "observed" to wait as long as the recorded call or "zero". Defaults to "observed".
+    """
+
+    def __init__(self, path: str, mode: str = "replay", latency: str = "observed"):
+        if mode not in CASSETTE_MODES:
+            raise Exception(f"Invalid cassette mode {mode}, choose from {CASSETTE_MODES}")
+        if latency not in REPLAY_LATENCIES:
+            raise Exception(f"Invalid replay latency {latency}, choose from {REPLAY_LATENCIES}")
+
+        self.path = path
+        self.mode = mode
+        self.latency = latency
+        self.interactions = {}
+        self._replayed = {}
+        self._file = None
+        self._lock = threading.Lock()
+
+        if self.recording:
+            self._file = self._open("w")
+        else:
+            self.load()
+
+    @property
+    def recording(self) -> bool:
+        return self.mode == "record"
+
+    @property
+    def replaying(self) -> bool:
+        return self.mode == "replay"
+
+    def _open(self, mode: str):
+        if self.path.endswith(".gz"):
+            return gzip.open(self.path, mode + "t", encoding="utf-8")
+        return open(self.path, mode, encoding="utf-8")
+
+    def load(self):
+        with self._open("r") as cassette_file:
+            for line in cassette_file:
+                if line.strip():
+                    interaction = json.loads(line)
+                    self.interactions.setdefault(interaction["key"], []).append(interaction)
+
+    def close(self):
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+    def _key(self, llm, kind: str, args) -> str:
+        return make_key(llm.provider, llm.model, getattr(llm, "system_prompt", None), kind, args)
+
+    # Recording
+
+    def _save(self, llm, kind: str, args, latency: float, **response):
+        interaction = {"key": self._key(llm, kind, args), "kind": kind, "provider": llm.provider, "model": llm.model, "latency": round(latency, 4), **response}
+        with self._lock:
+            self.interactions.setdefault(interaction["key"], []).append(interaction)
+            if self._file is not None:
+                self._file.write(json.dumps(interaction, separators=(",", ":")) + "\n")
+                self._file.flush()
+
+    def _response(self, kind: str, result) -> dict:
+        if kind == "embed":
+            return {"vectors": encode_vectors(result)}
+        return {"content": result}
+
+    def record(self, llm, fn, *args):
+        """Calls the provider and saves the call if it succeeds."""
+        kind = CALL_KINDS[fn.__name__]
+        start_time = time.perf_counter()
+        result = fn(*args)
+        self._save(llm, kind, args, time.perf_counter() - start_time, **self._response(kind, result))
+        return result
+
+    async def arecord(self, llm, fn, *args):
+        """Async version of `record`."""
+        kind = CALL_KINDS[fn.__name__]
+        start_time = time.perf_counter()
+        result = await fn(*args)
+        self._save(llm, kind, args, time.perf_counter() - start_time, **self._response(kind, result))
+        return result
+
+    def record_stream(self, llm, fn, *args):
+        """Yields the provider's stream chunks and saves them with their arrival times once the stream ends."""
+        start_time = time.perf_counter()
+        chunks = []
+        for chunk in fn(*args):
+            chunks.append([round(time.perf_counter() - start_time, 4), chunk])
+            yield chunk
+        self._save(llm, "stream", args, time.perf_counter() - start_time, chunks=chunks)
+
+    # Replaying
+
+    def _next(self, llm, kind: str, args) -> dict:
+        key = self._key(llm, kind, args)
+        with self._lock:
+            interactions = self.interactions.get(key)
+            if not interactions:
+                raise CassetteMissError(f"No recorded {kind} call to {llm.provider}/{llm.model} in cassette {self.path}")
+            index = self._replayed.get(key, 0)
+            self._replayed[key] = index + 1
+            return interactions[min(index, len(interactions) - 1)]
+
+    def _result(self, llm, kind: str, args, interaction: dict):
+        if kind == "embed":
+            return decode_vectors(interaction["vectors"])
+        llm._record_usage(args[0], interaction["content"])
+        return interaction["content"]
+
+    def _delay(self, interaction: dict) -> float:
+        return interaction["latency"] if self.latency == "observed" else 0.0
+
+    def replay(self, llm, fn, *args):
+        """Returns the recorded result of the call, after the recorded latency if replaying observed latencies."""
+        kind = CALL_KINDS[fn.__name__]
+        interaction = self._next(llm, kind, args)
+        time.sleep(self._delay(interaction))
+        return self._result(llm, kind, args, interaction)
+
+    async def areplay(self, llm, fn, *args):
+        """Async version of `replay`."""
+        kind = CALL_KINDS[fn.__name__]
+        interaction = self._next(llm, kind, args)
+        await asyncio.sleep(self._delay(interaction))
+        return self._result(llm, kind, args, interaction)
+
+    def replay_stream(self, llm, fn, *args):
+        """Yields the recorded stream chunks, at their recorded arrival times if replaying observed latencies."""
+        interaction = self._next(llm, "stream", args)
+        start_time = time.perf_counter()
+        for offset, chunk in interaction["chunks"]:
+            if self.latency == "observed":
+                time.sleep(max(0.0, offset - (time.perf_counter() - start_time)))
+            yield chunk
+
+
+_active_cassette = None
+_active_cassette_lock = threading.Lock()
+
+def get_active_cassette() -> Cassette:
+    """Returns the cassette LLM calls are recorded to or replayed from, None when calls go to the providers."""
+    return _active_cassette
+
+
+@contextmanager
+def use_cassette(path: str, mode: str = "replay", latency: str = "observed"):
+    """Records or replays all LLM provider calls made in the block, from any thread.
+
+    The LLM response cache and embedding store are bypassed while a cassette is active,
+    so every call of the run is recorded and can be replayed on a cold cache.
+    """
+    global _active_cassette
+    cassette = Cassette(path, mode, latency)
+    with _active_cassette_lock:
+        if _active_cassette is not None:
+            cassette.close()
+            raise Exception("Another cassette is already active")
+        _active_cassette = cassette
+    try:
+        yield cassette
+    finally:
+        with _active_cassette_lock:
+            _active_cassette = None
+        cassette.close()
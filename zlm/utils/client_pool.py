@@ -0,0 +1,96 @@
+'''
+-----------------------------------------------------------------------
+File: utils/client_pool.py
+Creation Time: Oct 17th 2026, 11:40 am
+Author: Saurabh Zinjad
+Developer Email: saurabhzinjad@gmail.com
+Copyright (c) 2023-2024 Saurabh Zinjad. All rights reserved | https://github.com/Ztrimus
+-----------------------------------------------------------------------
+'''
+
+import asyncio
+import weakref
+import threading
+
+from zlm.utils.cache import make_key
+from zlm.variables import PROVIDER_CONCURRENCY
+
+DEFAULT_CONCURRENCY = 8
+
+_clients = {}
+_clients_lock = threading.Lock()
+
+# Async clients and semaphores are bound to their event loop. They are kept per loop object, not its id which is reused,
+# and dropped once the loop is closed, e.g. after each `asyncio.run`, or garbage collected.
+_async_clients = weakref.WeakKeyDictionary()
+
+_limits = {}
+_async_limits = weakref.WeakKeyDictionary()
+_limits_lock = threading.Lock()
+
+
+def loop_registry(registry: weakref.WeakKeyDictionary) -> dict:
+    """Returns the registry entries of the running event loop, after dropping those of closed loops. Call with the registry lock held."""
+    for loop in [loop for loop in list(registry.keys()) if loop.is_closed()]:
+        registry.pop(loop, None)
+    return registry.setdefault(asyncio.get_running_loop(), {})
+
+
+def get_client(factory, provider: str, model: str = None, system_prompt: str = None, **params):
+    """Returns a process-wide client for the given configuration, created once with `factory`.
+
+    Provider clients keep their HTTP connections alive, so reusing them avoids paying
+    object construction and TCP/TLS setup on every request.
+
+    Args:
+        factory (callable): Creates the client when it is not in the registry yet.
+        provider (str): The LLM provider name. e.g. GPT, Gemini, Ollama.
+        model (str, optional): The model name the client is configured for.
+        system_prompt (str, optional): The system prompt the client is configured with.
+        **params: Any other client configuration, e.g. generation params or API key.
+
+    Returns:
+        The cached client instance.
+    """
+    key = make_key(provider, model, system_prompt, params)
+
+    client = _clients.get(key)
+    if client is None:
+        with _clients_lock:
+            client = _clients.get(key)
+            if client is None:
+                client = _clients[key] = factory()
+    return client
+
+
+def get_async_client(factory, provider: str, model: str = None, system_prompt: str = None, **params):
+    """Same as `get_client`, but per running event loop as async HTTP clients can't be shared across loops."""
+    key = make_key(provider, model, system_prompt, params)
+    with _clients_lock:
+        clients = loop_registry(_async_clients)
+        if key not in clients:
+            clients[key] = factory()
+        return clients[key]
+
+
+def clear_clients():
+    with _clients_lock:
+        _clients.clear()
+        _async_clients.clear()
+
+
+def provider_limit(provider: str) -> threading.BoundedSemaphore:
+    """Returns the semaphore that caps concurrent sync requests to the provider."""
+    with _limits_lock:
+        if provider not in _limits:
+            _limits[provider] = threading.BoundedSemaphore(PROVIDER_CONCURRENCY.get(provider, DEFAULT_CONCURRENCY))
+        return _limits[provider]
+
+
+def aprovider_limit(provider: str) -> asyncio.Semaphore:
+    """Returns the semaphore that caps concurrent async requests to the provider in the running event loop."""
+    with _limits_lock:
+        limits = loop_registry(_async_limits)
+        if provider not in limits:
+            limits[provider] = asyncio.Semaphore(PROVIDER_CONCURRENCY.get(provider, DEFAULT_CONCURRENCY))
+        return limits[provider]
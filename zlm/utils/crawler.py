@@ -0,0 +1,156 @@
+'''
+-----------------------------------------------------------------------
+File: utils/crawler.py
+Creation Time: Oct 17th 2026, 10:35 pm
+Author: Saurabh Zinjad
+Developer Email: saurabhzinjad@gmail.com
+Copyright (c) 2023-2024 Saurabh Zinjad. All rights reserved | https://github.com/Ztrimus
+-----------------------------------------------------------------------
+
+Asynchronous bulk crawler for job postings.
+
+Usage:
+    async for page in BulkCrawler().crawl(urls):
+        print(page["url"], page["tier"], page["text"])
+
+    pages = crawl_urls(urls)  # {url: cleaned text or None}
+'''
+
+import time
+import asyncio
+import httpx
+from urllib.parse import urlsplit
+
+from zlm.utils.data_extraction import clean_page_lines
+from zlm.utils.html_text import text_extractor
+from zlm.utils.page_fetcher import (
+    BASIC_SELECTORS, FETCH_CHUNK_SIZE, cached_page, conditional_headers, empty_page, escalate_page, http_page, store_page
+)
+from zlm.variables import (
+    CRAWL_CONCURRENCY, CRAWL_DOMAIN_CONCURRENCY, CRAWL_DOMAIN_DELAY, FETCH_BROWSER_TIMEOUT, FETCH_HTTP_TIMEOUT, FETCH_USER_AGENT,
+    PAGE_CACHE_FRESHNESS
+)
+
+
+class BulkCrawler:
+    """
+    Fetches many job pages concurrently over pooled HTTP connections, yielding each page as soon as it is done.
+
+    Requests to the same site are limited to `domain_concurrency` at a time, started at least `domain_delay`
+    seconds apart, and at most `concurrency` pages are fetched at once overall. Pages that need JavaScript
+    are escalated to the shared browser pool, and pages are served from and saved to the page cache, as in `fetch_page`.
+
+    Args:
+        concurrency (int, optional): Max pages fetched at once. Defaults to CRAWL_CONCURRENCY.
+        domain_concurrency (int, optional): Max pages fetched at once from the same site. Defaults to CRAWL_DOMAIN_CONCURRENCY.
+        domain_delay (float, optional): Min seconds between requests to the same site. Defaults to CRAWL_DOMAIN_DELAY.
+        http_timeout (float, optional): Timeout of each HTTP fetch in seconds.
+        browser_timeout (float, optional): Timeout of each browser fetch in seconds.
+        use_browser (bool, optional): Whether to escalate JavaScript rendered pages to the browser pool. Defaults to True.
+        use_cache (bool, optional): Whether to use the page cache. Defaults to True.
+        freshness (float, optional): Seconds a cached page is used without revalidation. Defaults to PAGE_CACHE_FRESHNESS.
+    """
+
+    def __init__(
+        self, concurrency: int = CRAWL_CONCURRENCY, domain_concurrency: int = CRAWL_DOMAIN_CONCURRENCY, domain_delay: float = CRAWL_DOMAIN_DELAY,
+        http_timeout: float = FETCH_HTTP_TIMEOUT, browser_timeout: float = FETCH_BROWSER_TIMEOUT, use_browser: bool = True,
+        use_cache: bool = True, freshness: float = PAGE_CACHE_FRESHNESS
+    ):
+        self.concurrency = concurrency
+        self.domain_concurrency = domain_concurrency
+        self.domain_delay = domain_delay
+        self.http_timeout = http_timeout
+        self.browser_timeout = browser_timeout
+        self.use_browser = use_browser
+        self.use_cache = use_cache
+        self.freshness = freshness
+
+    async def _wait_for_domain(self, domains: dict, domain: str):
+        # Reserve the next start slot of the domain, then sleep until it comes
+        now = time.monotonic()
+        start_at = max(now, domains.get(domain, now))
+        domains[domain] = start_at + self.domain_delay
+        await asyncio.sleep(start_at - now)
+
+    async def _fetch(self, client: httpx.AsyncClient, url: str, limit: asyncio.Semaphore, domain_limits: dict, domains: dict) -> dict:
+        start_time = time.perf_counter()
+        domain = urlsplit(url).netloc.lower()
+        error = None
+
+        entry, page = await asyncio.to_thread(cached_page, url, BASIC_SELECTORS, self.use_cache, self.freshness)
+        if page is None:
+            page = empty_page()
+            domain_limit = domain_limits.setdefault(domain, asyncio.Semaphore(self.domain_concurrency))
+            async with domain_limit:
+                await self._wait_for_domain(domains, domain)
+                async with limit:
+                    try:
+                        async with client.stream("GET", url, headers=conditional_headers(entry)) as res:
+                            extractor = text_extractor(url, BASIC_SELECTORS)
+                            async for chunk in res.aiter_text(FETCH_CHUNK_SIZE):
+                                extractor.feed(chunk)
+                            text = extractor.close()
+                        page = await asyncio.to_thread(http_page, url, BASIC_SELECTORS, entry, res.status_code, text, res.headers)
+                    except Exception as e:
+                        error = str(e) or type(e).__name__
+
+            try:
+                escalated = await asyncio.to_thread(escalate_page, url, BASIC_SELECTORS, page, self.use_browser, self.browser_timeout)
+                if escalated is not page:
+                    page, error = escalated, None
+            except Exception as e:
+                error = error or str(e) or type(e).__name__
+
+            await asyncio.to_thread(store_page, url, BASIC_SELECTORS, page, self.use_cache, self.use_browser)
+
+        return {
+            "url": url, "text": clean_page_lines(page["text"]), "tier": page["tier"], "status": page["status"], "error": error,
+            "elapsed": time.perf_counter() - start_time,
+        }
+
+    async def crawl(self, urls: list):
+        """Yields the result of each URL in completion order.
+
+        Args:
+            urls (list): Job posting URLs, duplicates are fetched once.
+
+        Yields:
+            dict: The page "url", cleaned "text" (None if nothing was scraped), the "tier" it was fetched with,
+                its "status" code, the "error" if the fetch failed, and "elapsed" seconds.
+        """
+        urls = list(dict.fromkeys(url.strip() for url in urls if url and url.strip()))
+        if not urls:
+            return
+
+        limit = asyncio.Semaphore(self.concurrency)
+        domain_limits, domains = {}, {}
+        limits = httpx.Limits(max_connections=self.concurrency, max_keepalive_connections=self.concurrency)
+        headers = {"User-Agent": FETCH_USER_AGENT, "Accept": "text/html,application/xhtml+xml;q=0.9,*/*;q=0.8"}
+
+        async with httpx.AsyncClient(limits=limits, headers=headers, timeout=self.http_timeout, follow_redirects=True) as client:
+            tasks = [asyncio.ensure_future(self._fetch(client, url, limit, domain_limits, domains)) for url in urls]
+            try:
+                for task in asyncio.as_completed(tasks):
+                    yield await task
+            finally:
+                for task in tasks:
+                    task.cancel()
+
+
+async def acrawl_urls(urls: list, **kwargs) -> dict:
+    """Fetches all URLs with a `BulkCrawler`, and returns the cleaned text of each URL, None if it could not be scraped."""
+    start_time = time.perf_counter()
+    pages, tiers = {}, {}
+    async for page in BulkCrawler(**kwargs).crawl(urls):
+        pages[page["url"]] = page["text"]
+        tiers[page["tier"]] = tiers.get(page["tier"], 0) + 1
+        if page["error"]:
+            print(f"Crawling {page['url']} failed. {page['error']}")
+
+    print(f"Crawled {len(pages)} pages in {time.perf_counter() - start_time:.2f}s, {tiers}")
+    return pages
+
+
+def crawl_urls(urls: list, **kwargs) -> dict:
+    """Sync version of `acrawl_urls`, must not be called from a running event loop."""
+    return asyncio.run(acrawl_urls(urls, **kwargs))
@@ -7,97 +7,110 @@
 Copyright (c) 2023 Saurabh Zinjad. All rights reserved | GitHub: Ztrimus, ameygoes
 -----------------------------------------------------------------------
 '''
+import io
 import re
 import json
+import hashlib
 import PyPDF2
-import requests
-from bs4 import BeautifulSoup
+import threading
+import multiprocessing
 import streamlit as st
-from langchain_community.document_loaders import PlaywrightURLLoader, UnstructuredURLLoader, WebBaseLoader
+from concurrent.futures import ProcessPoolExecutor
+
+from zlm.utils.cache import get_pdf_text_cache, make_key
+from zlm.utils.page_fetcher import BASIC_SELECTORS, fetch_page
+from zlm.variables import PDF_MAX_WORKERS, PDF_PARALLEL_MIN_PAGES
 
 def read_data_from_url(url):
         try: 
-            url_content = ""
-
-            basic_selectors = ["header", "footer"]
-            linkedin_selectors = ["#main-content > section.right-rail",
-                                  ".job-alert-redirect-section", ".similar-jobs"]
-            
-            # TODO: Filter out selectors bassed on the website
-            all_selectors = basic_selectors
-
-            unstr_loader = UnstructuredURLLoader(urls=[url], ssl_verify=False, remove_selectors=all_selectors)
-            playwright_loader = PlaywrightURLLoader(urls=[url], remove_selectors=all_selectors)
-            web_loader = WebBaseLoader(url)
-
-            pages = []
-            for loader in [playwright_loader, unstr_loader, web_loader]:
-                pages = loader.load()
-                if pages != []:
-                    break
-
-            for page in pages:
-                if page.page_content.strip() != "":
-                    # text = page.extract_text().split("\n")
-                    text_list = page.page_content.split("\n")
-
-                    # Remove Unicode characters from each line
-                    cleaned_texts = [re.sub(r'[^\x00-\x7F]+', '', line) for line in text_list]
-                    cleaned_texts = [text.strip() for text in cleaned_texts if text.strip() not in ['', None]]
-
-                    # Join the lines into a single string
-                    cleaned_texts_string = '\n'.join(cleaned_texts)
-                    url_content += cleaned_texts_string
-                
-                return url_content
+            # Site specific content, e.g. LinkedIn's similar jobs rail, is removed by the site profiles in SITE_CONTENT_PROFILES
+            page = fetch_page(url, remove_selectors=BASIC_SELECTORS)
+            return clean_page_lines(page["text"])
         except Exception as e:
             print(e)
             return None
 
-def extract_text(pdf_path: str):
-    resume_text = ""
+# Non-ASCII characters are removed from extracted text
+NON_ASCII_PATTERN = re.compile(r'[^\x00-\x7F]+')
+
+def clean_page_lines(text: str):
+    """Removes non-ASCII characters and empty lines from scraped page text, None if nothing is left."""
+    cleaned_texts = (line.strip() for line in NON_ASCII_PATTERN.sub('', text).split("\n"))
+    url_content = '\n'.join(line for line in cleaned_texts if line)
+    return url_content if url_content != "" else None
+
+_pdf_pool = None
+_pdf_pool_lock = threading.Lock()
+
+def can_extract_in_parallel(num_pages: int) -> bool:
+    """Whether the PDF is long enough for the process pool to pay off.
+
+    Only forked workers are used, spawned or forkserver workers import the whole zlm package, which takes seconds.
+    """
+    return num_pages >= PDF_PARALLEL_MIN_PAGES and PDF_MAX_WORKERS > 1 and multiprocessing.get_context().get_start_method() == "fork"
+
+def get_pdf_pool() -> ProcessPoolExecutor:
+    """Returns the process pool used to extract pages of long PDFs, started on first use and reused after."""
+    global _pdf_pool
+    with _pdf_pool_lock:
+        if _pdf_pool is None:
+            _pdf_pool = ProcessPoolExecutor(max_workers=PDF_MAX_WORKERS)
+        return _pdf_pool
+
+def clean_page_text(text: str) -> str:
+    # Remove Unicode characters, the pattern never matches a newline so lines are kept
+    return NON_ASCII_PATTERN.sub('', text or '')
 
+def extract_pages_text(pdf_path: str, start: int, end: int) -> list:
+    """Extracts the cleaned text of pages [start, end) of the PDF. Runs in the PDF process pool."""
     with open(pdf_path, 'rb') as file:
         pdf_reader = PyPDF2.PdfReader(file)
-        num_pages = len(pdf_reader.pages)
+        return [clean_page_text(pdf_reader.pages[page_num].extract_text()) for page_num in range(start, end)]
 
-        for page_num in range(num_pages):
-            page = pdf_reader.pages[page_num]
-            text = page.extract_text().split("\n")
+def extract_text(pdf_path: str):
+    """Extracts the text of a PDF, with non-ASCII characters removed.
 
-            # Remove Unicode characters from each line
-            cleaned_text = [re.sub(r'[^\x00-\x7F]+', '', line) for line in text]
+    The text is cached by the file's content hash, so the same resume is extracted only once.
+    Long PDFs are split into page ranges extracted by a process pool, see `can_extract_in_parallel`.
+    """
+    with open(pdf_path, 'rb') as file:
+        pdf_bytes = file.read()
 
-            # Join the lines into a single string
-            cleaned_text_string = '\n'.join(cleaned_text)
-            resume_text += cleaned_text_string
-        
+    cache = get_pdf_text_cache()
+    cache_key = make_key("pdf_text", PyPDF2.__version__, hashlib.sha256(pdf_bytes).hexdigest())
+    resume_text = cache.get(cache_key)
+    if resume_text is not None:
         return resume_text
 
+    pdf_reader = PyPDF2.PdfReader(io.BytesIO(pdf_bytes))
+    num_pages = len(pdf_reader.pages)
+
+    page_texts = None
+    if can_extract_in_parallel(num_pages):
+        try:
+            n_workers = min(PDF_MAX_WORKERS, num_pages)
+            page_ranges = [(num_pages * i // n_workers, num_pages * (i + 1) // n_workers) for i in range(n_workers)]
+            futures = [get_pdf_pool().submit(extract_pages_text, pdf_path, start, end) for start, end in page_ranges]
+            page_texts = [text for future in futures for text in future.result()]
+        except Exception as e:
+            print(f"Parallel PDF extraction failed, extracting serially. {e}")
+
+    if page_texts is None:
+        page_texts = [clean_page_text(page.extract_text()) for page in pdf_reader.pages]
+
+    resume_text = "".join(page_texts)
+    cache.set(cache_key, resume_text)
+    return resume_text
+
 def get_url_content(url: str):
-    """ Extract text content from any given web page
+    """ Extract text content from any given web page, served from the page cache when it is fresh
 
     Args:
         url (str): Webpage web link
     """    
     try:
-        # getting response object
-        res = requests.get(url)
-        # Initialize the object with the document
-        soup = BeautifulSoup(res.content, "html.parser")
-        
-        # Get the whole body tag
-        tag = soup.body
-        text_content = ""
-        # TODO: Preprocessing of data, like remove html tags, remove unwanted content, etc.
-        
-        # Print each string recursively
-        for string in tag.strings:
-            string = string.strip()
-            if string:
-                text_content += string + "\n"
-
-        return text_content
+        page = fetch_page(url, use_browser=False)
+        return "".join(line + "\n" for line in page["text"].split("\n") if line)
     except Exception as e:
         print(e)
-        return None
\ No newline at end of file
+        return None
@@ -0,0 +1,166 @@
+'''
+-----------------------------------------------------------------------
+File: utils/embedding_store.py
+Creation Time: Oct 17th 2026, 12:25 pm
+Author: Saurabh Zinjad
+Developer Email: saurabhzinjad@gmail.com
+Copyright (c) 2023-2024 Saurabh Zinjad. All rights reserved | https://github.com/Ztrimus
+-----------------------------------------------------------------------
+'''
+
+import os
+import json
+import hashlib
+import threading
+import numpy as np
+from contextlib import contextmanager
+
+from zlm.variables import CACHE_DIR
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+    import msvcrt
+
+
+def chunk_hash(chunk: str) -> str:
+    return hashlib.sha256(chunk.encode("utf-8")).hexdigest()
+
+
+@contextmanager
+def file_lock(path: str):
+    """Holds an exclusive OS lock on the file while the block runs, so other processes wait for it."""
+    with open(path, "a+b") as lock_file:
+        if fcntl is not None:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+        else:
+            lock_file.seek(0)
+            msvcrt.locking(lock_file.fileno(), msvcrt.LK_LOCK, 1)
+        try:
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+            else:
+                lock_file.seek(0)
+                msvcrt.locking(lock_file.fileno(), msvcrt.LK_UNLCK, 1)
+
+
+class EmbeddingStore:
+    """
+    A persistent store of embeddings keyed by (model, chunk hash).
+
+    Each model gets its own folder with a raw float32 matrix (read through `np.memmap`)
+    and a JSON index mapping chunk hashes to row numbers. New vectors are appended,
+    so a chunk is never embedded twice by the same model.
+
+    The store can be shared by several processes, e.g. the Streamlit app and a CLI run. Appends hold an OS lock
+    on the model's `lock` file and re-read the index first, and readers reload the index when it changed on disk.
+
+    Args:
+        root (str, optional): The folder where embeddings are stored.
+    """
+
+    def __init__(self, root: str = os.path.join(CACHE_DIR, "embeddings")):
+        self.root = root
+        self._lock = threading.Lock()
+        self._indexes = {}
+        self._index_mtimes = {}
+        self._matrices = {}
+
+    def _model_dir(self, model: str) -> str:
+        return os.path.join(self.root, hashlib.sha256(model.encode("utf-8")).hexdigest()[:16])
+
+    def _load_index(self, model: str) -> dict:
+        """Returns the model's index, read again if another process wrote it since it was loaded."""
+        index_path = os.path.join(self._model_dir(model), "index.json")
+        try:
+            mtime = os.stat(index_path).st_mtime_ns
+        except FileNotFoundError:
+            mtime = None
+
+        if model not in self._indexes or self._index_mtimes.get(model) != mtime:
+            if mtime is not None:
+                with open(index_path) as index_file:
+                    self._indexes[model] = json.load(index_file)
+            else:
+                self._indexes[model] = {"model": model, "dim": None, "rows": {}, "n_rows": 0}
+            self._index_mtimes[model] = mtime
+            self._matrices.pop(model, None)
+        return self._indexes[model]
+
+    def _load_matrix(self, model: str, index: dict):
+        n_rows = index.get("n_rows", len(index["rows"]))
+        matrix = self._matrices.get(model)
+
+        if matrix is None or matrix.shape[0] != n_rows:
+            vectors_path = os.path.join(self._model_dir(model), "vectors.f32")
+            matrix = np.memmap(vectors_path, dtype=np.float32, mode="r", shape=(n_rows, index["dim"]))
+            self._matrices[model] = matrix
+        return matrix
+
+    def get_many(self, model: str, chunks: list) -> list:
+        """Returns the stored vector for each chunk, or None for chunks not embedded yet."""
+        with self._lock:
+            index = self._load_index(model)
+            if not index["rows"]:
+                return [None] * len(chunks)
+
+            matrix = self._load_matrix(model, index)
+            rows = [index["rows"].get(chunk_hash(chunk)) for chunk in chunks]
+            return [None if row is None else np.array(matrix[row]) for row in rows]
+
+    def put_many(self, model: str, chunks: list, vectors):
+        """Appends the vectors of the given chunks to the store."""
+        vectors = np.asarray(vectors, dtype=np.float32)
+        if not len(chunks):
+            return
+
+        model_dir = self._model_dir(model)
+        os.makedirs(model_dir, exist_ok=True)
+        with self._lock, file_lock(os.path.join(model_dir, "lock")):
+            # Another process may have appended since the index was loaded
+            index = self._load_index(model)
+            if index["dim"] is None:
+                index["dim"] = int(vectors.shape[1])
+
+            vectors_path = os.path.join(model_dir, "vectors.f32")
+            # Rows are numbered by the file size, so a write that crashed before saving its index can't shift them, a partial row is cut off
+            n_rows = os.path.getsize(vectors_path) // (index["dim"] * 4) if os.path.exists(vectors_path) else 0
+
+            new_rows = []
+            for chunk, vector in zip(chunks, vectors):
+                key = chunk_hash(chunk)
+                if key not in index["rows"]:
+                    index["rows"][key] = n_rows + len(new_rows)
+                    new_rows.append(vector)
+
+            if not new_rows:
+                return
+
+            with open(vectors_path, "ab") as vectors_file:
+                vectors_file.truncate(n_rows * index["dim"] * 4)
+                vectors_file.write(np.vstack(new_rows).tobytes())
+            index["n_rows"] = n_rows + len(new_rows)
+
+            # Write index after the vectors, so rows in the index always exist in the matrix
+            index_path = os.path.join(model_dir, "index.json")
+            with open(index_path + ".tmp", "w") as index_file:
+                json.dump(index, index_file)
+            os.replace(index_path + ".tmp", index_path)
+
+            self._index_mtimes[model] = os.stat(index_path).st_mtime_ns
+            self._matrices.pop(model, None)
+
+
+_embedding_store = None
+_embedding_store_lock = threading.Lock()
+
+def get_embedding_store() -> EmbeddingStore:
+    """Returns the process-wide embedding store."""
+    global _embedding_store
+    with _embedding_store_lock:
+        if _embedding_store is None:
+            _embedding_store = EmbeddingStore()
+        return _embedding_store
@@ -0,0 +1,388 @@
+'''
+-----------------------------------------------------------------------
+File: utils/fake_llm_server.py
+Creation Time: Oct 17th 2026, 5:40 pm
+Author: Saurabh Zinjad
+Developer Email: saurabhzinjad@gmail.com
+Copyright (c) 2023-2024 Saurabh Zinjad. All rights reserved | https://github.com/Ztrimus
+-----------------------------------------------------------------------
+
+An offline stand-in for the OpenAI, Gemini and Ollama APIs, to load test the pipeline without API quota.
+
+Usage:
+    python -m zlm.utils.fake_llm_server --port 8765 --latency lognormal:0.8,0.4 --tokens_per_sec 80 --error_rate 0.02
+
+Then point the LLM classes at it, e.g.
+    export OPENAI_BASE_URL=http://127.0.0.1:8765/v1 GEMINI_BASE_URL=http://127.0.0.1:8765 OLLAMA_HOST=http://127.0.0.1:8765
+'''
+
+import re
+import json
+import time
+import base64
+import random
+import hashlib
+import argparse
+import threading
+import numpy as np
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from zlm.utils.token_budget import count_tokens
+
+SCHEMA_PATTERN = re.compile(r"Here is the output schema:\s*```\s*(\{.*?\})\s*```", re.DOTALL)
+TOKEN_PATTERN = re.compile(r"\S+\s*|\s+")
+
+FAKE_COVER_LETTER = """Dear Hiring Manager,
+
+I am excited to apply for this role. My experience building data pipelines, shipping machine learning models to production and collaborating with cross-functional teams aligns closely with the requirements of the position.
+
+In my most recent role, I designed services that processed millions of events per day, reduced infrastructure cost by 30% and mentored engineers on testing and code quality. I enjoy turning ambiguous problems into reliable products and measuring their impact.
+
+I would welcome the opportunity to bring this experience to your team. Thank you for your time and consideration.
+
+Sincerely,
+Candidate"""
+
+
+def sample_latency(spec: str, rng: random.Random) -> float:
+    """Samples seconds from a latency distribution spec.
+
+    Supported specs are `fixed:SECONDS`, `uniform:LOW,HIGH`, `normal:MEAN,STD`,
+    `lognormal:MEDIAN,SIGMA` and `exponential:MEAN`.
+    """
+    name, _, args = spec.partition(":")
+    values = [float(value) for value in args.split(",") if value]
+
+    if name == "fixed":
+        latency = values[0] if values else 0.0
+    elif name == "uniform":
+        latency = rng.uniform(values[0], values[1])
+    elif name == "normal":
+        latency = rng.gauss(values[0], values[1])
+    elif name == "lognormal":
+        latency = values[0] * rng.lognormvariate(0, values[1])
+    elif name == "exponential":
+        latency = rng.expovariate(1 / values[0])
+    else:
+        raise ValueError(f"Unknown latency distribution: {spec}")
+    return max(0.0, latency)
+
+
+def sample_from_schema(schema: dict, defs: dict = None, name: str = "value"):
+    """Builds an instance that is valid for the JSON schema, with placeholder values."""
+    defs = defs if defs is not None else schema.get("$defs", {})
+
+    if "$ref" in schema:
+        return sample_from_schema(defs[schema["$ref"].split("/")[-1]], defs, name)
+    if "anyOf" in schema:
+        options = [option for option in schema["anyOf"] if option.get("type") != "null"] or schema["anyOf"]
+        return sample_from_schema(options[0], defs, name)
+    if "enum" in schema:
+        return schema["enum"][0]
+
+    schema_type = schema.get("type", "object" if "properties" in schema else "string")
+    if schema_type == "object":
+        return {key: sample_from_schema(value, defs, key) for key, value in schema.get("properties", {}).items()}
+    elif schema_type == "array":
+        return [sample_from_schema(schema.get("items", {}), defs, name) for _ in range(2)]
+    elif schema_type == "integer":
+        return 1
+    elif schema_type == "number":
+        return 1.0
+    elif schema_type == "boolean":
+        return True
+    elif schema_type == "null":
+        return None
+    elif schema.get("format") == "uri" or "link" in name or name in ("linkedin", "github", "medium", "devpost"):
+        return f"https://example.com/{name}"
+    return f"Sample {name.replace('_', ' ')}"
+
+
+def fake_completion(prompt: str) -> str:
+    """Returns schema valid JSON if the prompt has JSON format instructions, otherwise a cover letter."""
+    match = SCHEMA_PATTERN.search(prompt or "")
+    if match:
+        try:
+            return json.dumps(sample_from_schema(json.loads(match.group(1))))
+        except (ValueError, KeyError):
+            return "{}"
+    return FAKE_COVER_LETTER
+
+
+def fake_embedding(text: str, dim: int) -> list:
+    """Returns a deterministic unit vector for the text, so equal texts get equal embeddings."""
+    seed = int.from_bytes(hashlib.sha256(text.encode("utf-8")).digest()[:8], "little")
+    vector = np.random.default_rng(seed).standard_normal(dim)
+    return (vector / np.linalg.norm(vector)).astype(np.float32).tolist()
+
+
+class FakeLLMConfig:
+    """
+    Behaviour of the fake LLM server.
+
+    Args:
+        latency (str, optional): Time to first token distribution, see `sample_latency`. Defaults to "lognormal:0.5,0.3".
+        tokens_per_sec (float, optional): Output tokens per second, 0 means instant. Defaults to 80.
+        error_rate (float, optional): Probability of failing a request. Defaults to 0.
+        error_statuses (list, optional): HTTP statuses of failed requests, picked at random. Defaults to [429, 500, 503].
+        retry_after (float, optional): Retry-After header of 429 responses in seconds. Defaults to 1.
+        embedding_dim (int, optional): Size of the fake embeddings. Defaults to 768.
+        seed (int, optional): Random seed for latencies and errors.
+    """
+
+    def __init__(self, latency: str = "lognormal:0.5,0.3", tokens_per_sec: float = 80, error_rate: float = 0.0,
+                 error_statuses: list = None, retry_after: float = 1, embedding_dim: int = 768, seed: int = None):
+        self.latency = latency
+        self.tokens_per_sec = tokens_per_sec
+        self.error_rate = error_rate
+        self.error_statuses = error_statuses or [429, 500, 503]
+        self.retry_after = retry_after
+        self.embedding_dim = embedding_dim
+        self.rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self.stats = {"requests": 0, "errors": 0, "prompt_tokens": 0, "output_tokens": 0}
+
+    def time_to_first_token(self) -> float:
+        with self._lock:
+            return sample_latency(self.latency, self.rng)
+
+    def pick_error(self):
+        """Returns an HTTP error status to fail the request with, or None."""
+        with self._lock:
+            self.stats["requests"] += 1
+            if self.rng.random() < self.error_rate:
+                self.stats["errors"] += 1
+                return self.rng.choice(self.error_statuses)
+        return None
+
+    def record(self, prompt_tokens: int, output_tokens: int):
+        with self._lock:
+            self.stats["prompt_tokens"] += prompt_tokens
+            self.stats["output_tokens"] += output_tokens
+
+
+class FakeLLMHandler(BaseHTTPRequestHandler):
+    """Serves the OpenAI, Gemini and Ollama endpoints used by `zlm.utils.llm_models`."""
+    protocol_version = "HTTP/1.1"
+    config: FakeLLMConfig = None
+
+    def log_message(self, format, *args):
+        pass
+
+    # Response helpers
+
+    def _send_json(self, data, status: int = 200, headers: dict = None):
+        body = json.dumps(data).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        for key, value in (headers or {}).items():
+            self.send_header(key, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _start_stream(self, content_type: str):
+        # No content length, the stream ends when the connection is closed
+        self.send_response(200)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Connection", "close")
+        self.end_headers()
+        self.close_connection = True
+
+    def _write(self, text: str):
+        self.wfile.write(text.encode("utf-8"))
+        self.wfile.flush()
+
+    def _send_error(self, status: int, api: str):
+        message = f"Fake {status} error"
+        headers = {"Retry-After": str(self.config.retry_after)} if status == 429 else {}
+        if api == "openai":
+            error = {"error": {"message": message, "type": "fake_error", "code": status}}
+        elif api == "gemini":
+            error = {"error": {"code": status, "message": message, "status": "RESOURCE_EXHAUSTED" if status == 429 else "UNAVAILABLE"}}
+        else:
+            error = {"error": message}
+        self._send_json(error, status, headers)
+
+    def _completion(self, prompt: str):
+        """Waits the time to first token and returns the response text, its tokens and token counts."""
+        time.sleep(self.config.time_to_first_token())
+        content = fake_completion(prompt)
+        tokens = TOKEN_PATTERN.findall(content)
+        prompt_tokens = count_tokens(prompt)
+        self.config.record(prompt_tokens, len(tokens))
+        return content, tokens, prompt_tokens
+
+    def _token_delay(self, n_tokens: int = 1):
+        if self.config.tokens_per_sec:
+            time.sleep(n_tokens / self.config.tokens_per_sec)
+
+    def _embeddings(self, texts: list) -> list:
+        self.config.record(sum(count_tokens(text) for text in texts), 0)
+        return [fake_embedding(text, self.config.embedding_dim) for text in texts]
+
+    # Routing
+
+    def do_GET(self):
+        if self.path.rstrip("/") == "/stats":
+            self._send_json(self.config.stats)
+        elif self.path.startswith("/api/tags"):
+            self._send_json({"models": []})
+        else:
+            self._send_json({"error": "Not found"}, 404)
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        body = json.loads(self.rfile.read(length) or b"{}")
+        path = self.path.split("?")[0]
+
+        if path.startswith("/api/"):
+            routes, api = {"/api/generate": self._ollama_generate, "/api/embed": self._ollama_embed, "/api/embeddings": self._ollama_embed}, "ollama"
+            handler = routes.get(path)
+        elif ":" in path:
+            routes, api = {"generateContent": self._gemini_generate, "streamGenerateContent": self._gemini_generate,
+                           "embedContent": self._gemini_embed, "batchEmbedContents": self._gemini_embed}, "gemini"
+            handler = routes.get(path.rsplit(":", 1)[-1])
+        else:
+            routes, api = {"/chat/completions": self._openai_chat, "/embeddings": self._openai_embeddings}, "openai"
+            handler = next((route for suffix, route in routes.items() if path.endswith(suffix)), None)
+
+        if handler is None:
+            return self._send_json({"error": f"Unknown endpoint {path}"}, 404)
+
+        status = self.config.pick_error()
+        if status is not None:
+            return self._send_error(status, api)
+        handler(path, body)
+
+    # OpenAI
+
+    def _openai_chat(self, path: str, body: dict):
+        prompt = "\n".join(str(message.get("content", "")) for message in body.get("messages", []))
+        content, tokens, prompt_tokens = self._completion(prompt)
+        response = {"id": "chatcmpl-fake", "object": "chat.completion", "created": int(time.time()), "model": body.get("model")}
+        usage = {"prompt_tokens": prompt_tokens, "completion_tokens": len(tokens), "total_tokens": prompt_tokens + len(tokens)}
+
+        if not body.get("stream"):
+            self._token_delay(len(tokens))
+            choice = {"index": 0, "message": {"role": "assistant", "content": content}, "finish_reason": "stop"}
+            return self._send_json({**response, "choices": [choice], "usage": usage})
+
+        self._start_stream("text/event-stream")
+        response["object"] = "chat.completion.chunk"
+        for token in tokens:
+            self._token_delay()
+            choice = {"index": 0, "delta": {"content": token}, "finish_reason": None}
+            self._write(f"data: {json.dumps({**response, 'choices': [choice]})}\n\n")
+        choice = {"index": 0, "delta": {}, "finish_reason": "stop"}
+        self._write(f"data: {json.dumps({**response, 'choices': [choice], 'usage': usage})}\n\ndata: [DONE]\n\n")
+
+    def _openai_embeddings(self, path: str, body: dict):
+        texts = body.get("input")
+        texts = [texts] if isinstance(texts, str) else texts
+        vectors = self._embeddings(texts)
+
+        # The OpenAI SDK asks for base64 encoded float32 vectors by default
+        if body.get("encoding_format") == "base64":
+            vectors = [base64.b64encode(np.asarray(vector, dtype=np.float32).tobytes()).decode("ascii") for vector in vectors]
+        data = [{"object": "embedding", "index": i, "embedding": vector} for i, vector in enumerate(vectors)]
+        n_tokens = sum(count_tokens(text) for text in texts)
+        self._send_json({"object": "list", "data": data, "model": body.get("model"), "usage": {"prompt_tokens": n_tokens, "total_tokens": n_tokens}})
+
+    # Gemini
+
+    def _gemini_generate(self, path: str, body: dict):
+        prompt = "\n".join(part.get("text", "") for content in body.get("contents", []) for part in content.get("parts", []))
+        content, tokens, prompt_tokens = self._completion(prompt)
+        usage = {"promptTokenCount": prompt_tokens, "candidatesTokenCount": len(tokens), "totalTokenCount": prompt_tokens + len(tokens)}
+
+        def candidate(text, finished):
+            return {"content": {"parts": [{"text": text}], "role": "model"}, "index": 0, **({"finishReason": "STOP"} if finished else {})}
+
+        if not path.endswith("streamGenerateContent"):
+            self._token_delay(len(tokens))
+            return self._send_json({"candidates": [candidate(content, True)], "usageMetadata": usage})
+
+        # Gemini streams a JSON array of responses
+        self._start_stream("application/json")
+        self._write("[")
+        for i, token in enumerate(tokens):
+            self._token_delay()
+            finished = i == len(tokens) - 1
+            chunk = {"candidates": [candidate(token, finished)], **({"usageMetadata": usage} if finished else {})}
+            self._write(("," if i else "") + json.dumps(chunk))
+        self._write("]")
+
+    def _gemini_embed(self, path: str, body: dict):
+        requests = body.get("requests") or [body]
+        texts = [" ".join(part.get("text", "") for part in request.get("content", {}).get("parts", [])) for request in requests]
+        embeddings = [{"values": vector} for vector in self._embeddings(texts)]
+
+        if path.endswith("batchEmbedContents"):
+            self._send_json({"embeddings": embeddings})
+        else:
+            self._send_json({"embedding": embeddings[0]})
+
+    # Ollama
+
+    def _ollama_generate(self, path: str, body: dict):
+        prompt = "\n".join(filter(None, [body.get("system"), body.get("prompt")]))
+        content, tokens, prompt_tokens = self._completion(prompt)
+        done = {"model": body.get("model"), "done": True, "done_reason": "stop", "prompt_eval_count": prompt_tokens, "eval_count": len(tokens)}
+
+        if body.get("stream") is False:
+            self._token_delay(len(tokens))
+            return self._send_json({**done, "response": content})
+
+        # Ollama streams newline delimited JSON by default
+        self._start_stream("application/x-ndjson")
+        for token in tokens:
+            self._token_delay()
+            self._write(json.dumps({"model": body.get("model"), "response": token, "done": False}) + "\n")
+        self._write(json.dumps({**done, "response": ""}) + "\n")
+
+    def _ollama_embed(self, path: str, body: dict):
+        if path.endswith("/embeddings"):
+            self._send_json({"embedding": self._embeddings([body.get("prompt", "")])[0]})
+        else:
+            texts = body.get("input")
+            texts = [texts] if isinstance(texts, str) else texts
+            self._send_json({"model": body.get("model"), "embeddings": self._embeddings(texts)})
+
+
+def create_fake_llm_server(host: str = "127.0.0.1", port: int = 8765, config: FakeLLMConfig = None) -> ThreadingHTTPServer:
+    """Creates the fake LLM server, `port=0` picks a free port. The server's address is in `server.url`."""
+    handler = type("ConfiguredFakeLLMHandler", (FakeLLMHandler,), {"config": config or FakeLLMConfig()})
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    server.url = f"http://{host}:{server.server_address[1]}"
+    return server
+
+
+def start_fake_llm_server(host: str = "127.0.0.1", port: int = 0, config: FakeLLMConfig = None) -> ThreadingHTTPServer:
+    """Starts the fake LLM server in a background thread, stop it with `server.shutdown()`."""
+    server = create_fake_llm_server(host, port, config)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Fake OpenAI/Gemini/Ollama compatible LLM server for benchmarking.")
+    parser.add_argument("--host", default="127.0.0.1", help="Host to listen on")
+    parser.add_argument("--port", type=int, default=8765, help="Port to listen on")
+    parser.add_argument("--latency", default="lognormal:0.5,0.3", help="Time to first token distribution. e.g. fixed:0.5, uniform:0.2,1, normal:0.5,0.1, lognormal:0.5,0.3, exponential:0.5")
+    parser.add_argument("--tokens_per_sec", type=float, default=80, help="Output tokens per second, 0 for instant responses")
+    parser.add_argument("--error_rate", type=float, default=0.0, help="Probability of failing a request")
+    parser.add_argument("--error_statuses", type=int, nargs="+", default=[429, 500, 503], help="HTTP statuses of failed requests")
+    parser.add_argument("--embedding_dim", type=int, default=768, help="Size of the fake embeddings")
+    parser.add_argument("--seed", type=int, help="Random seed for latencies and errors")
+    args = parser.parse_args()
+
+    config = FakeLLMConfig(args.latency, args.tokens_per_sec, args.error_rate, args.error_statuses, embedding_dim=args.embedding_dim, seed=args.seed)
+    server = create_fake_llm_server(args.host, args.port, config)
+    print(f"Fake LLM server listening on {server.url}")
+    print(f"export OPENAI_BASE_URL={server.url}/v1 GEMINI_BASE_URL={server.url} OLLAMA_HOST={server.url}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print(json.dumps(config.stats, indent=2))
@@ -0,0 +1,267 @@
+'''
+-----------------------------------------------------------------------
+File: utils/hedging.py
+Creation Time: Oct 17th 2026, 7:15 pm
+Author: Saurabh Zinjad
+Developer Email: saurabhzinjad@gmail.com
+Copyright (c) 2023-2024 Saurabh Zinjad. All rights reserved | https://github.com/Ztrimus
+-----------------------------------------------------------------------
+'''
+
+import time
+import asyncio
+import threading
+import numpy as np
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from streamlit.runtime.scriptrunner import add_script_run_ctx, get_script_run_ctx
+
+from zlm.variables import HEDGE_DEFAULT_DEADLINE, HEDGE_LATENCY_PERCENTILE, HEDGE_LATENCY_WINDOW, HEDGE_MAX_WORKERS, HEDGE_MIN_SAMPLES
+
+_executor = ThreadPoolExecutor(max_workers=HEDGE_MAX_WORKERS, thread_name_prefix="hedge")
+
+
+def llm_label(llm) -> str:
+    return f"{llm.provider}/{llm.model}"
+
+
+def is_valid_response(result) -> bool:
+    return result is not None and result != "" and result != {}
+
+
+class LatencyTracker:
+    """Keeps the latest successful call latencies of each provider model, to size hedging deadlines."""
+
+    def __init__(self, window: int = HEDGE_LATENCY_WINDOW):
+        self.window = window
+        self._latencies = {}
+        self._lock = threading.Lock()
+
+    def record(self, label: str, seconds: float):
+        with self._lock:
+            self._latencies.setdefault(label, deque(maxlen=self.window)).append(seconds)
+
+    def percentile(self, label: str, q: float = HEDGE_LATENCY_PERCENTILE):
+        """Returns the q-th percentile latency in seconds, or None until enough calls are observed."""
+        with self._lock:
+            latencies = list(self._latencies.get(label, []))
+        if len(latencies) < HEDGE_MIN_SAMPLES:
+            return None
+        return float(np.percentile(latencies, q))
+
+
+latency_tracker = LatencyTracker()
+
+
+class HedgedLLM:
+    """
+    Sends LLM calls to an ordered chain of providers, e.g. Gemini flash -> GPT-4o-mini -> local Ollama.
+
+    The call goes to the first LLM, and when it misses its latency deadline (p95 of its recent calls) or fails,
+    the call is also sent to the next LLM in the chain. The first valid response wins and the other calls are cancelled.
+    Running sync calls can't be interrupted, so their responses are discarded instead. Callers can pass an `accept` predicate,
+    e.g. a JSON schema check, so a truncated response of a fast LLM doesn't win over a valid response of a slower one.
+
+    Streams fall back to the next LLM only if a stream fails before yielding anything, and embeddings always use
+    the first LLM, as vectors of different models can't be compared.
+
+    Args:
+        llms (list): LLM instances in order of preference.
+        deadline (float, optional): Fixed deadline in seconds for every LLM, instead of their p95 latency.
+    """
+
+    def __init__(self, llms: list, deadline: float = None):
+        if not llms:
+            raise Exception("HedgedLLM needs at least one LLM")
+        self.llms = llms
+        self.deadline = deadline
+        self.stats = {llm_label(llm): {"wins": 0, "hedged_wins": 0, "hedges": 0} for llm in llms}
+        self._lock = threading.Lock()
+
+        # Failed calls fall back to the next LLM, so they are only logged instead of shown in the UI
+        for llm in llms:
+            llm.report_errors = False
+
+    @property
+    def primary(self):
+        return self.llms[0]
+
+    @property
+    def provider(self):
+        return self.primary.provider
+
+    @property
+    def model(self):
+        return self.primary.model
+
+    def deadline_for(self, llm) -> float:
+        return self.deadline or latency_tracker.percentile(llm_label(llm)) or HEDGE_DEFAULT_DEADLINE
+
+    def _record_win(self, llm, n_started: int):
+        with self._lock:
+            stats = self.stats[llm_label(llm)]
+            stats["wins"] += 1
+            if n_started > 1:
+                stats["hedged_wins"] += 1
+
+    def _record_hedge(self, llm):
+        with self._lock:
+            self.stats[llm_label(llm)]["hedges"] += 1
+
+    def summary(self) -> dict:
+        """Returns the wins of each LLM, and how many of them were won by a hedged call."""
+        with self._lock:
+            return {label: dict(stats) for label, stats in self.stats.items()}
+
+    def _timed_call(self, llm, ctx, *args, **kwargs):
+        add_script_run_ctx(threading.current_thread(), ctx)
+        start_time = time.perf_counter()
+        result = llm.get_response(*args, **kwargs)
+        if is_valid_response(result):
+            latency_tracker.record(llm_label(llm), time.perf_counter() - start_time)
+        return result
+
+    def get_response(self, *args, **kwargs):
+        """Same as `BaseLLM.get_response`, hedged over the LLM chain."""
+        return self.get_response_with_llm(*args, **kwargs)[0]
+
+    def get_response_with_llm(self, *args, accept=None, **kwargs) -> tuple:
+        """Hedges the call over the LLM chain.
+
+        Args:
+            accept (callable, optional): Whether a non-empty response can win, e.g. it parses and matches the schema.
+                A rejected response is only returned if no LLM gives an accepted one.
+
+        Returns:
+            tuple: (response, LLM that answered it), (None, None) if every LLM failed.
+        """
+        ctx = get_script_run_ctx()
+        rejected = None
+        pending = {}
+        n_started = 0
+        last_started_at = None
+
+        def start_next():
+            nonlocal n_started, last_started_at
+            llm = self.llms[n_started]
+            if n_started:
+                self._record_hedge(llm)
+            pending[_executor.submit(self._timed_call, llm, ctx, *args, **kwargs)] = llm
+            n_started += 1
+            last_started_at = time.perf_counter()
+
+        start_next()
+        while pending:
+            timeout = None
+            if n_started < len(self.llms):
+                timeout = max(0.0, self.deadline_for(self.llms[n_started - 1]) - (time.perf_counter() - last_started_at))
+
+            done, _ = wait(pending, timeout=timeout, return_when=FIRST_COMPLETED)
+            if not done:
+                print(f"{llm_label(self.llms[n_started - 1])} missed its deadline, hedging with {llm_label(self.llms[n_started])}")
+                start_next()
+                continue
+
+            for future in done:
+                llm = pending.pop(future)
+                result = future.result()
+                if self._accepted(llm, result, accept):
+                    for loser in pending:
+                        loser.cancel()
+                    self._record_win(llm, n_started)
+                    return result, llm
+                if is_valid_response(result) and rejected is None:
+                    rejected = (result, llm)
+
+            if not pending and n_started < len(self.llms):
+                print(f"{llm_label(llm)} failed, falling back to {llm_label(self.llms[n_started])}")
+                start_next()
+
+        return rejected or (None, None)
+
+    @staticmethod
+    def _accepted(llm, result, accept) -> bool:
+        if not is_valid_response(result):
+            return False
+        if accept is not None and not accept(result):
+            print(f"{llm_label(llm)} response was rejected")
+            return False
+        return True
+
+    async def _atimed_call(self, llm, *args, **kwargs):
+        start_time = time.perf_counter()
+        result = await llm.aget_response(*args, **kwargs)
+        if is_valid_response(result):
+            latency_tracker.record(llm_label(llm), time.perf_counter() - start_time)
+        return result
+
+    async def aget_response(self, *args, **kwargs):
+        """Async version of `get_response`, losing calls are cancelled."""
+        return (await self.aget_response_with_llm(*args, **kwargs))[0]
+
+    async def aget_response_with_llm(self, *args, accept=None, **kwargs) -> tuple:
+        """Async version of `get_response_with_llm`."""
+        rejected = None
+        pending = {}
+        n_started = 0
+        last_started_at = None
+
+        def start_next():
+            nonlocal n_started, last_started_at
+            llm = self.llms[n_started]
+            if n_started:
+                self._record_hedge(llm)
+            pending[asyncio.ensure_future(self._atimed_call(llm, *args, **kwargs))] = llm
+            n_started += 1
+            last_started_at = time.perf_counter()
+
+        start_next()
+        try:
+            while pending:
+                timeout = None
+                if n_started < len(self.llms):
+                    timeout = max(0.0, self.deadline_for(self.llms[n_started - 1]) - (time.perf_counter() - last_started_at))
+
+                done, _ = await asyncio.wait(pending, timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+                if not done:
+                    print(f"{llm_label(self.llms[n_started - 1])} missed its deadline, hedging with {llm_label(self.llms[n_started])}")
+                    start_next()
+                    continue
+
+                for task in done:
+                    llm = pending.pop(task)
+                    result = task.result()
+                    if self._accepted(llm, result, accept):
+                        self._record_win(llm, n_started)
+                        return result, llm
+                    if is_valid_response(result) and rejected is None:
+                        rejected = (result, llm)
+
+                if not pending and n_started < len(self.llms):
+                    print(f"{llm_label(llm)} failed, falling back to {llm_label(self.llms[n_started])}")
+                    start_next()
+
+            return rejected or (None, None)
+        finally:
+            for task in pending:
+                task.cancel()
+
+    def stream_response(self, *args, **kwargs):
+        """Same as `BaseLLM.stream_response`, falling back to the next LLM if a stream yields nothing."""
+        for i, llm in enumerate(self.llms):
+            started = False
+            for chunk in llm.stream_response(*args, **kwargs):
+                started = True
+                yield chunk
+            if started:
+                self._record_win(llm, i + 1)
+                return
+            if i + 1 < len(self.llms):
+                print(f"{llm_label(llm)} stream failed, falling back to {llm_label(self.llms[i + 1])}")
+                self._record_hedge(self.llms[i + 1])
+
+    def get_embedding(self, *args, **kwargs):
+        return self.primary.get_embedding(*args, **kwargs)
+
+    async def aget_embedding(self, *args, **kwargs):
+        return await self.primary.aget_embedding(*args, **kwargs)
@@ -0,0 +1,219 @@
+'''
+-----------------------------------------------------------------------
+File: utils/html_text.py
+Creation Time: Oct 17th 2026, 11:20 pm
+Author: Saurabh Zinjad
+Developer Email: saurabhzinjad@gmail.com
+Copyright (c) 2023-2024 Saurabh Zinjad. All rights reserved | https://github.com/Ztrimus
+-----------------------------------------------------------------------
+
+Streaming HTML to text extraction with site specific content profiles.
+
+Usage:
+    extractor = text_extractor(url, remove_selectors=["header", "footer"])
+    for chunk in response.iter_content(chunk_size=16384, decode_unicode=True):
+        extractor.feed(chunk)
+    text = extractor.close()
+'''
+
+import re
+from html.parser import HTMLParser
+from urllib.parse import urlsplit
+
+from zlm.variables import SITE_CONTENT_PROFILES
+
+# Tags that never hold visible page text. <head> itself isn't skipped, as HTML5 pages may leave out </head>,
+# its other children (meta, link, base) are void tags without text.
+NON_TEXT_TAGS = {"script", "style", "noscript", "template", "svg", "iframe", "title"}
+
+# Tags that can't have children, so they are never pushed on the element stack
+VOID_TAGS = {"area", "base", "br", "col", "embed", "hr", "img", "input", "link", "meta", "source", "track", "wbr"}
+
+# Tags that start a new line of text
+BLOCK_TAGS = {
+    "address", "article", "aside", "blockquote", "br", "dd", "details", "div", "dl", "dt", "fieldset", "figcaption", "figure",
+    "footer", "form", "h1", "h2", "h3", "h4", "h5", "h6", "header", "hr", "li", "main", "nav", "ol", "p", "pre", "section",
+    "summary", "table", "td", "th", "tr", "ul",
+}
+
+WHITESPACE_PATTERN = re.compile(r"\s+")
+SIMPLE_SELECTOR_PATTERN = re.compile(r"""([a-zA-Z][\w-]*)|#([\w-]+)|\.([\w-]+)|\[([\w-]+)(?:=["']?([^\]"']*)["']?)?\]""")
+
+
+def parse_selector(selector: str) -> list:
+    """Parses a CSS selector made of tag, #id, .class and [attr=value] parts, joined by descendant or child (>) combinators.
+
+    Returns:
+        list: (combinator, (tag, id, classes, attributes)) per compound selector, the combinator relates it to the previous one.
+    """
+    compounds = []
+    combinator = ""
+    for token in selector.replace(">", " > ").split():
+        if token == ">":
+            combinator = ">"
+            continue
+
+        tag, element_id, classes, attrs = None, None, set(), {}
+        for match in SIMPLE_SELECTOR_PATTERN.finditer(token):
+            name, id_part, class_part, attr_name, attr_value = match.groups()
+            if name:
+                tag = name.lower()
+            elif id_part:
+                element_id = id_part
+            elif class_part:
+                classes.add(class_part)
+            else:
+                attrs[attr_name.lower()] = attr_value
+
+        compounds.append((combinator or " ", (tag, element_id, frozenset(classes), attrs)))
+        combinator = ""
+    return compounds
+
+
+def compound_matches(compound: tuple, element: tuple) -> bool:
+    tag, element_id, classes, attrs = compound
+    element_tag, element_attrs, element_classes = element
+    if tag is not None and tag != element_tag:
+        return False
+    if element_id is not None and element_attrs.get("id") != element_id:
+        return False
+    if not classes <= element_classes:
+        return False
+    return all(name in element_attrs and (value is None or element_attrs[name] == value) for name, value in attrs.items())
+
+
+def selector_matches(compounds: list, stack: list) -> bool:
+    """Whether the last element of the stack matches the selector, given its ancestors in the stack."""
+
+    def match_at(ci: int, si: int) -> bool:
+        if not compound_matches(compounds[ci][1], stack[si]):
+            return False
+        if ci == 0:
+            return True
+        if compounds[ci][0] == ">":
+            return si > 0 and match_at(ci - 1, si - 1)
+        return any(match_at(ci - 1, sj) for sj in range(si - 1, -1, -1))
+
+    return match_at(len(compounds) - 1, len(stack) - 1)
+
+
+def site_profile(url: str = None) -> dict:
+    """Returns the content profile of the URL's site, empty if the site has none."""
+    if not url:
+        return {}
+    host = urlsplit(url).netloc.lower().split(":")[0]
+    for domain, profile in SITE_CONTENT_PROFILES.items():
+        if host == domain or host.endswith("." + domain):
+            return profile
+    return {}
+
+
+class StreamingTextExtractor(HTMLParser):
+    """
+    Extracts the visible text of an HTML page as it is fed, without building a document tree.
+
+    Only the stack of open elements and the text read so far are kept. Elements matching a `drop` selector are skipped
+    with all their children. If `keep` selectors are given, only the text inside matching elements is returned,
+    e.g. the job description of a LinkedIn page, and the whole page text is returned if none of them matched.
+
+    Args:
+        keep (list, optional): CSS selectors of the elements holding the content.
+        drop (list, optional): CSS selectors of the elements to remove.
+    """
+
+    def __init__(self, keep=(), drop=()):
+        super().__init__(convert_charrefs=True)
+        self.keep = [parse_selector(selector) for selector in keep]
+        self.drop = [parse_selector(selector) for selector in drop]
+        self._stack = []
+        self._skip_depth = None
+        self._keep_depth = None
+        self._page_lines, self._page_line = [], []
+        self._kept_lines, self._kept_line = [], []
+
+    def _break_line(self):
+        for lines, line in ((self._page_lines, self._page_line), (self._kept_lines, self._kept_line)):
+            text = "".join(line).strip()
+            if text:
+                lines.append(text)
+            line.clear()
+
+    def handle_starttag(self, tag, attrs):
+        if self._skip_depth is not None:
+            if tag not in VOID_TAGS:
+                self._stack.append((tag, {}, frozenset()))
+            return
+
+        if tag in BLOCK_TAGS:
+            self._break_line()
+        if tag in VOID_TAGS:
+            return
+
+        attrs = {name: value or "" for name, value in attrs}
+        self._stack.append((tag, attrs, frozenset(attrs.get("class", "").split())))
+
+        if tag in NON_TEXT_TAGS or any(selector_matches(selector, self._stack) for selector in self.drop):
+            self._skip_depth = len(self._stack)
+        elif self._keep_depth is None and any(selector_matches(selector, self._stack) for selector in self.keep):
+            self._keep_depth = len(self._stack)
+
+    def handle_startendtag(self, tag, attrs):
+        self.handle_starttag(tag, attrs)
+        if tag not in VOID_TAGS:
+            self.handle_endtag(tag)
+
+    def handle_endtag(self, tag):
+        # Close unclosed children too, e.g. <li> and <p> without end tags. Stray end tags are ignored.
+        if not any(element[0] == tag for element in self._stack):
+            return
+        while self._stack:
+            if self._stack.pop()[0] == tag:
+                break
+
+        depth = len(self._stack)
+        if self._skip_depth is not None:
+            if depth < self._skip_depth:
+                self._skip_depth = None
+            else:
+                return
+
+        if tag in BLOCK_TAGS:
+            self._break_line()
+        if self._keep_depth is not None and depth < self._keep_depth:
+            self._break_line()
+            self._keep_depth = None
+
+    def handle_data(self, data):
+        if self._skip_depth is not None:
+            return
+        text = WHITESPACE_PATTERN.sub(" ", data)
+        if text.strip() == "" and not self._page_line:
+            return
+        self._page_line.append(text)
+        if self._keep_depth is not None:
+            self._kept_line.append(text)
+
+    def close(self) -> str:
+        """Finishes the parsing and returns the text, one block element per line."""
+        super().close()
+        self._break_line()
+        return "\n".join(self._kept_lines or self._page_lines)
+
+
+def text_extractor(url: str = None, remove_selectors=()) -> StreamingTextExtractor:
+    """Returns an extractor with the content profile of the URL's site, which also removes the given selectors."""
+    profile = site_profile(url)
+    return StreamingTextExtractor(keep=profile.get("keep", ()), drop=[*remove_selectors, *profile.get("drop", ())])
+
+
+def html_to_text(html: str, remove_selectors=(), url: str = None) -> str:
+    """Returns the visible text of a whole HTML page, see `StreamingTextExtractor`.
+
+    Args:
+        html (str): The page HTML.
+        remove_selectors (list, optional): CSS selectors of elements to drop, e.g. header and footer.
+        url (str, optional): The page URL, to apply the content profile of its site.
+    """
+    extractor = text_extractor(url, remove_selectors)
+    extractor.feed(html)
+    return extractor.close()
@@ -0,0 +1,31 @@
+'''
+-----------------------------------------------------------------------
+File: utils/jd_cache.py
+Creation Time: Oct 18th 2026, 12:30 am
+Author: Saurabh Zinjad
+Developer Email: saurabhzinjad@gmail.com
+Copyright (c) 2023-2024 Saurabh Zinjad. All rights reserved | https://github.com/Ztrimus
+-----------------------------------------------------------------------
+'''
+
+import hashlib
+
+from zlm.schemas.job_details_schema import JobDetails
+from zlm.prompts.resume_prompt import JOB_DETAILS_EXTRACTOR
+from zlm.utils.cache import JSONResultCache, get_job_details_cache
+from zlm.variables import JOB_DESCRIPTION_TOKEN_BUDGET
+
+
+def normalize_jd_text(text: str) -> str:
+    """Lowercases the text and collapses whitespace, so the same posting scraped or pasted differently gets the same hash."""
+    return " ".join(text.lower().split())
+
+
+def jd_text_hash(text: str) -> str:
+    return hashlib.sha256(normalize_jd_text(text).encode("utf-8")).hexdigest()
+
+
+# Job details keyed by the normalized text hash, shared by every user of the process so a popular posting is extracted once
+job_details_cache = JSONResultCache(
+    get_job_details_cache, jd_text_hash, lambda: (JobDetails.model_json_schema(), JOB_DETAILS_EXTRACTOR, JOB_DESCRIPTION_TOKEN_BUDGET)
+)
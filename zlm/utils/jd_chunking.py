@@ -0,0 +1,155 @@
+'''
+-----------------------------------------------------------------------
+File: utils/jd_chunking.py
+Creation Time: Oct 18th 2026, 1:05 am
+Author: Saurabh Zinjad
+Developer Email: saurabhzinjad@gmail.com
+Copyright (c) 2023-2024 Saurabh Zinjad. All rights reserved | https://github.com/Ztrimus
+-----------------------------------------------------------------------
+
+Map-reduce job details extraction for long job pages: the page is split into overlapping chunks,
+details are extracted from each chunk in parallel, and the partial details are merged deterministically.
+'''
+
+import re
+from collections import Counter
+
+from zlm.schemas.job_details_schema import JobDetails
+from zlm.utils.token_budget import count_tokens
+from zlm.variables import JD_CHUNK_OVERLAP_TOKENS, JD_CHUNK_TOKENS, JD_MAX_CHUNKS, JD_NEAR_DUPLICATE_SIMILARITY
+
+WORD_PATTERN = re.compile(r"[a-z0-9+#]+")
+
+# List fields whose entries are sentences, so reworded entries from overlapping chunks are merged too
+SENTENCE_LIST_FIELDS = {"job_duties_and_responsibilities", "required_qualifications", "preferred_qualifications"}
+
+
+def split_long_line(line: str, n_tokens: int, max_tokens: int) -> list:
+    """Splits a line over max_tokens into pieces of about max_tokens, at word boundaries."""
+    words = line.split(" ")
+    n_pieces = -(-n_tokens // max_tokens)
+    words_per_piece = max(1, -(-len(words) // n_pieces))
+    return [" ".join(words[i:i + words_per_piece]) for i in range(0, len(words), words_per_piece)]
+
+
+def split_into_chunks(text: str, max_tokens: int = JD_CHUNK_TOKENS, overlap_tokens: int = JD_CHUNK_OVERLAP_TOKENS, provider: str = None, model: str = None) -> list:
+    """Splits the text at line boundaries into chunks of at most max_tokens.
+
+    Each chunk starts with the last lines of the previous chunk, up to overlap_tokens, so a requirement
+    list cut at a chunk boundary is still seen whole by one of the chunks.
+
+    Returns:
+        list: The chunks, at most JD_MAX_CHUNKS.
+    """
+    lines = []
+    for line in text.split("\n"):
+        n_tokens = count_tokens(line, provider, model) + 1
+        if n_tokens > max_tokens:
+            lines.extend((piece, count_tokens(piece, provider, model) + 1) for piece in split_long_line(line, n_tokens, max_tokens))
+        else:
+            lines.append((line, n_tokens))
+
+    chunks, current, current_tokens = [], [], 0
+    for line, n_tokens in lines:
+        if current and current_tokens + n_tokens > max_tokens:
+            chunks.append("\n".join(chunk_line for chunk_line, _ in current))
+
+            overlap, overlap_size = [], 0
+            for chunk_line, chunk_line_tokens in reversed(current):
+                if overlap_size + chunk_line_tokens > overlap_tokens:
+                    break
+                overlap.insert(0, (chunk_line, chunk_line_tokens))
+                overlap_size += chunk_line_tokens
+            current, current_tokens = overlap, overlap_size
+
+        current.append((line, n_tokens))
+        current_tokens += n_tokens
+
+    if current:
+        chunks.append("\n".join(chunk_line for chunk_line, _ in current))
+
+    if len(chunks) > JD_MAX_CHUNKS:
+        print(f"Job description has {len(chunks)} chunks, only the first {JD_MAX_CHUNKS} are extracted")
+        chunks = chunks[:JD_MAX_CHUNKS]
+    return chunks
+
+
+def normalize_entry(value) -> tuple:
+    return tuple(WORD_PATTERN.findall(str(value).lower()))
+
+
+def word_jaccard(a: tuple, b: tuple) -> float:
+    a, b = set(a), set(b)
+    return len(a & b) / len(a | b) if a or b else 1.0
+
+
+def merge_list(values: list, near_duplicates: bool = False) -> list:
+    """Concatenates the lists in order, keeping the first of the entries that are equal ignoring case and punctuation.
+
+    With near_duplicates, entries sharing at least JD_NEAR_DUPLICATE_SIMILARITY of their words with a kept entry are dropped too.
+    """
+    merged, kept_keys = [], []
+    seen = set()
+    for items in values:
+        for item in items:
+            key = normalize_entry(item)
+            if not key or key in seen:
+                continue
+            if near_duplicates and any(word_jaccard(key, kept_key) >= JD_NEAR_DUPLICATE_SIMILARITY for kept_key in kept_keys):
+                continue
+            seen.add(key)
+            kept_keys.append(key)
+            merged.append(item)
+    return merged
+
+
+def most_common_value(values: list):
+    """Returns the value given by most chunks, the one of the earliest chunk on a tie."""
+    counts = Counter(normalize_entry(value) for value in values)
+    best_count = max(counts.values())
+    return next(value for value in values if counts[normalize_entry(value)] == best_count)
+
+
+def merge_job_details(partials: list) -> dict:
+    """Merges the job details extracted from each chunk, in chunk order, so the result only depends on the partial details.
+
+    Text fields take the value most chunks agree on, e.g. the job title, falling back to the earliest chunk.
+    List fields are concatenated with duplicates removed, e.g. keywords repeated in overlapping chunks.
+
+    Returns:
+        dict: The merged job details, or None if no chunk was extracted.
+    """
+    partials = [partial for partial in partials if isinstance(partial, dict) and partial]
+    if not partials:
+        return None
+
+    fields = list(JobDetails.model_fields)
+    fields += [field for partial in partials for field in partial if field not in fields]
+    fields = list(dict.fromkeys(fields))
+
+    merged = {}
+    for field in fields:
+        values = [partial[field] for partial in partials if partial.get(field) not in (None, "", [], {})]
+        if not values:
+            if any(field in partial for partial in partials):
+                merged[field] = next(partial[field] for partial in partials if field in partial)
+            continue
+
+        if all(isinstance(value, list) for value in values):
+            merged[field] = merge_list(values, near_duplicates=field in SENTENCE_LIST_FIELDS)
+        else:
+            merged[field] = most_common_value(values)
+
+    return merged
+
+
+def merge_chunk_answers(answers: list) -> tuple:
+    """Merges the (job details, LLM that answered) of each chunk with `merge_job_details`.
+
+    Returns:
+        tuple: (merged job details, the LLM that answered every chunk). The LLM is None if chunks were answered
+            by different LLMs or some chunk failed, so the merged details aren't cached under a single model.
+    """
+    llms = [llm for _, llm in answers]
+    answered_by = llms[0] if llms and all(llm is not None and llm is llms[0] for llm in llms) else None
+    return merge_job_details([partial for partial, _ in answers]), answered_by
@@ -0,0 +1,214 @@
+'''
+-----------------------------------------------------------------------
+File: utils/jd_pruning.py
+Creation Time: Oct 17th 2026, 11:55 pm
+Author: Saurabh Zinjad
+Developer Email: saurabhzinjad@gmail.com
+Copyright (c) 2023-2024 Saurabh Zinjad. All rights reserved | https://github.com/Ztrimus
+-----------------------------------------------------------------------
+
+Deterministic pruning of scraped job descriptions before job details extraction: duplicated lines,
+known boilerplate (EEO statements, benefits blurbs, cookie banners, site chrome) and oversized sections are removed.
+'''
+
+import os
+import re
+from functools import lru_cache
+
+from zlm.utils.token_budget import TRUNCATION_MARKER, count_tokens
+from zlm.variables import (
+    JD_BOILERPLATE_MIN_OVERLAP, JD_LOW_VALUE_HEADINGS, JD_LOW_VALUE_SECTION_MAX_CHARS, JD_MIN_FUZZY_WORDS, JD_SECTION_HEADINGS,
+    JD_SECTION_MAX_CHARS, JD_SHINGLE_SIZE
+)
+
+BOILERPLATE_CORPUS_PATH = os.path.join(os.path.dirname(os.path.dirname(__file__)), "data", "jd_boilerplate.txt")
+
+WORD_PATTERN = re.compile(r"[a-z0-9]+")
+SENTENCE_END_PATTERN = re.compile(r"(?<=[.!?])\s+")
+BULLET_PATTERN = re.compile(r"^(?:[-*•·▪●]|\d+[.)])\s")
+
+# Headings end with a colon or are in upper case. Shorter lines without punctuation are headings only if they start like one,
+# or for low value headings, only if they are the heading phrase itself, so a line like "Salary range 150k" doesn't cap the lines after it.
+MAX_HEADING_WORDS = 8
+MAX_UNMARKED_HEADING_WORDS = 5
+
+
+def heading_pattern(headings: list) -> re.Pattern:
+    return re.compile(r"^(?:our |the |your )?(?:" + "|".join(re.escape(heading) for heading in headings) + r")\b", re.IGNORECASE)
+
+
+def heading_phrase_pattern(headings: list) -> re.Pattern:
+    """Matches lines made only of the headings, e.g. "Benefits" or "Salary & Benefits"."""
+    heading = r"(?:our |the |your )?(?:" + "|".join(re.escape(heading) for heading in headings) + r")"
+    return re.compile(heading + r"(?:\s*(?:,|&|and)\s*" + heading + r")*", re.IGNORECASE)
+
+
+SECTION_HEADING_PATTERN = heading_pattern(JD_SECTION_HEADINGS)
+LOW_VALUE_HEADING_PATTERN = heading_pattern(JD_LOW_VALUE_HEADINGS)
+LOW_VALUE_HEADING_PHRASE_PATTERN = heading_phrase_pattern(JD_LOW_VALUE_HEADINGS)
+
+
+def normalize_words(text: str) -> list:
+    """Returns the lowercase words of the text, ignoring punctuation."""
+    return WORD_PATTERN.findall(text.lower())
+
+
+def shingles(words: list, size: int = JD_SHINGLE_SIZE) -> set:
+    """Returns the word n-grams of the text, as tuples so they don't depend on the process hash seed."""
+    return {tuple(words[i:i + size]) for i in range(max(1, len(words) - size + 1))}
+
+
+class BoilerplateIndex:
+    """
+    Fingerprints of known boilerplate passages.
+
+    A text is boilerplate if its normalized words equal a passage, or if it is long enough and most
+    of its word shingles appear in the corpus, which catches reworded or company specific variants.
+
+    Args:
+        passages (list): The boilerplate passages.
+    """
+
+    def __init__(self, passages: list):
+        self.exact = set()
+        self.shingles = set()
+        for passage in passages:
+            words = normalize_words(passage)
+            if words:
+                self.exact.add(" ".join(words))
+                self.shingles |= shingles(words)
+
+    def is_boilerplate(self, text: str) -> bool:
+        words = normalize_words(text)
+        if not words:
+            return False
+        if " ".join(words) in self.exact:
+            return True
+        if len(words) < JD_MIN_FUZZY_WORDS:
+            return False
+        text_shingles = shingles(words)
+        return len(text_shingles & self.shingles) / len(text_shingles) >= JD_BOILERPLATE_MIN_OVERLAP
+
+
+@lru_cache(maxsize=1)
+def get_boilerplate_index() -> BoilerplateIndex:
+    """Returns the index of the shipped boilerplate corpus, loaded once."""
+    with open(BOILERPLATE_CORPUS_PATH, encoding="utf-8") as corpus_file:
+        passages = [line.strip() for line in corpus_file if line.strip() and not line.startswith("#")]
+    return BoilerplateIndex(passages)
+
+
+def is_heading(line: str) -> bool:
+    words = line.split()
+    if not words or len(words) > MAX_HEADING_WORDS or BULLET_PATTERN.match(line):
+        return False
+    if line.endswith(":") or (line.isupper() and len(line) > 1):
+        return True
+    if len(words) > MAX_UNMARKED_HEADING_WORDS or line[-1] in ".,;!?)":
+        return False
+    return SECTION_HEADING_PATTERN.match(line) is not None or LOW_VALUE_HEADING_PHRASE_PATTERN.fullmatch(line) is not None
+
+
+def is_low_value_heading(line: str) -> bool:
+    return LOW_VALUE_HEADING_PATTERN.match(line) is not None
+
+
+def remove_boilerplate(line: str, index: BoilerplateIndex) -> str:
+    """Removes boilerplate sentences from the line, returns an empty string if all of it is boilerplate."""
+    if index.is_boilerplate(line):
+        return ""
+    sentences = SENTENCE_END_PATTERN.split(line)
+    if len(sentences) == 1:
+        return line
+    return " ".join(sentence for sentence in sentences if not index.is_boilerplate(sentence))
+
+
+def cap_section(lines: list, max_chars: int) -> tuple:
+    """Keeps the first lines of a section that fit in max_chars.
+
+    Returns:
+        tuple: (kept lines, whether the section was trimmed).
+    """
+    kept, n_chars = [], 0
+    for line in lines:
+        n_chars += len(line) + 1
+        if n_chars > max_chars and kept:
+            return kept + [TRUNCATION_MARKER.strip()], True
+        kept.append(line)
+    return kept, False
+
+
+def prune_job_description(text: str, provider: str = None, model: str = None) -> tuple:
+    """Removes duplicated lines, known boilerplate and oversized sections from a job description.
+
+    Lines repeated within a section and paragraphs repeated anywhere on the page are removed, heading lines are always kept.
+
+    The text is split into sections at heading lines. Sections are capped to JD_SECTION_MAX_CHARS, and sections with
+    headings that JobDetails doesn't use, e.g. benefits or EEO statements, to JD_LOW_VALUE_SECTION_MAX_CHARS.
+
+    Args:
+        text (str): The scraped or pasted job description.
+        provider (str, optional): The LLM provider, used to count tokens.
+        model (str, optional): The LLM model, used to count tokens.
+
+    Returns:
+        tuple: (pruned text, report of the removed bytes, tokens and lines).
+    """
+    index = get_boilerplate_index()
+    seen_paragraphs = set()
+    report = {"duplicate_lines": 0, "boilerplate_lines": 0, "trimmed_sections": 0}
+
+    # [heading, lines, normalized lines] per section
+    sections = [[None, [], set()]]
+    for line in text.split("\n"):
+        line = line.strip()
+        if not line:
+            continue
+
+        pruned_line = remove_boilerplate(line, index)
+        if pruned_line != line:
+            report["boilerplate_lines"] += 1
+        if not pruned_line:
+            continue
+
+        if is_heading(pruned_line):
+            sections.append([pruned_line, [], set()])
+            continue
+
+        # Short lines, e.g. "- Python" or "Location: Remote", may repeat under other headings or roles,
+        # so they are only deduplicated within their section. Paragraphs are deduplicated across the page.
+        words = normalize_words(pruned_line)
+        key = " ".join(words) or pruned_line
+        is_paragraph = len(words) >= JD_MIN_FUZZY_WORDS
+        if key in sections[-1][2] or (is_paragraph and key in seen_paragraphs):
+            report["duplicate_lines"] += 1
+            continue
+        sections[-1][2].add(key)
+        if is_paragraph:
+            seen_paragraphs.add(key)
+        sections[-1][1].append(pruned_line)
+
+    pruned_lines = []
+    for heading, lines, _ in sections:
+        max_chars = JD_LOW_VALUE_SECTION_MAX_CHARS if heading and is_low_value_heading(heading) else JD_SECTION_MAX_CHARS
+        lines, trimmed = cap_section(lines, max_chars)
+        report["trimmed_sections"] += trimmed
+        pruned_lines.extend(([heading] if heading else []) + lines)
+
+    pruned = "\n".join(pruned_lines)
+
+    original_bytes, pruned_bytes = len(text.encode("utf-8")), len(pruned.encode("utf-8"))
+    original_tokens, pruned_tokens = count_tokens(text, provider, model), count_tokens(pruned, provider, model)
+    report.update({
+        "bytes_removed": original_bytes - pruned_bytes,
+        "tokens_removed": original_tokens - pruned_tokens,
+        "original_tokens": original_tokens,
+        "pruned_tokens": pruned_tokens,
+    })
+    if original_tokens:
+        print(
+            f"Pruned job description: {original_tokens} -> {pruned_tokens} tokens, removed {report['bytes_removed']} bytes "
+            f"({report['tokens_removed'] / original_tokens:.0%} tokens), {report['duplicate_lines']} duplicate and "
+            f"{report['boilerplate_lines']} boilerplate lines, {report['trimmed_sections']} sections trimmed"
+        )
+    return pruned, report
@@ -0,0 +1,140 @@
+'''
+-----------------------------------------------------------------------
+File: utils/json_stream.py
+Creation Time: Oct 17th 2026, 8:05 pm
+Author: Saurabh Zinjad
+Developer Email: saurabhzinjad@gmail.com
+Copyright (c) 2023-2024 Saurabh Zinjad. All rights reserved | https://github.com/Ztrimus
+-----------------------------------------------------------------------
+'''
+
+import json
+
+
+class StreamingJSONParser:
+    """
+    Incremental JSON parser for streamed LLM responses, which returns array elements as soon as they close.
+
+    Only the arrays under the top-level keys are split into elements, e.g. each `work_experience` entry
+    or each `skill_section` group, or the elements of a top-level array. Text before the JSON value,
+    like a markdown code fence, and after it is ignored. Each character is looked at once, and only the
+    element being read is buffered.
+
+    Example:
+        parser = StreamingJSONParser()
+        for chunk in llm.stream_response(prompt, need_json_output=True):
+            for key, index, item in parser.feed(chunk):
+                print(key, index, item)
+    """
+
+    def __init__(self):
+        self.stack = []
+        self.in_string = False
+        self.escape = False
+        self.done = False
+        self.key = None
+        self.items = {}
+        self._expect_key = False
+        self._key_chars = None
+        self._element = None
+        self._element_kind = None
+        self._element_depth = None
+
+    def _in_element_array(self) -> bool:
+        """Whether the innermost open container is an array whose elements are returned."""
+        if self.stack == ["["]:
+            return True
+        return len(self.stack) == 2 and self.stack[0] == "{" and self.stack[1] == "["
+
+    def _emit(self, items: list):
+        element, self._element = "".join(self._element), None
+        try:
+            item = json.loads(element)
+        except ValueError:
+            return
+
+        key = self.key if self.stack[0] == "{" else None
+        section_items = self.items.setdefault(key, [])
+        items.append((key, len(section_items), item))
+        section_items.append(item)
+
+    def feed(self, text: str) -> list:
+        """Parses the next chunk of text.
+
+        Returns:
+            list: (key, index, item) tuples of the array elements completed in this chunk, key is None for a top-level array.
+        """
+        items = []
+        for ch in text:
+            if self.done:
+                break
+
+            if not self.stack:
+                if ch in "{[":
+                    self.stack.append(ch)
+                    self._expect_key = ch == "{"
+                continue
+
+            if self.in_string:
+                if self._element is not None:
+                    self._element.append(ch)
+                elif self._key_chars is not None:
+                    self._key_chars.append(ch)
+
+                if self.escape:
+                    self.escape = False
+                elif ch == "\\":
+                    self.escape = True
+                elif ch == '"':
+                    self.in_string = False
+                    if self._key_chars is not None:
+                        self.key = json.loads("".join(self._key_chars))
+                        self._key_chars = None
+                    elif self._element_kind == '"' and self._element is not None and len(self.stack) == self._element_depth:
+                        self._emit(items)
+                continue
+
+            if ch.isspace():
+                if self._element is not None:
+                    self._element.append(ch)
+                continue
+
+            # Start of an array element
+            if self._element is None and self._in_element_array() and ch not in ",]":
+                self._element = []
+                self._element_kind = ch
+                self._element_depth = len(self.stack)
+
+            # A number, true, false or null element ends at the next separator
+            if self._element is not None and self._element_kind not in '{["' and len(self.stack) == self._element_depth and ch in ",]}":
+                self._emit(items)
+
+            if self._element is not None:
+                self._element.append(ch)
+
+            if ch == '"':
+                self.in_string = True
+                if self._element is None and self.stack == ["{"] and self._expect_key:
+                    self._key_chars = [ch]
+            elif ch in "{[":
+                self.stack.append(ch)
+            elif ch in "}]":
+                self.stack.pop()
+                if not self.stack:
+                    self.done = True
+                elif self._element is not None and len(self.stack) == self._element_depth:
+                    self._emit(items)
+            elif self.stack == ["{"]:
+                if ch == ":":
+                    self._expect_key = False
+                elif ch == ",":
+                    self._expect_key = True
+
+        return items
+
+
+def iter_json_items(chunks):
+    """Yields (key, index, item) for each array element of the streamed JSON, as soon as it is complete."""
+    parser = StreamingJSONParser()
+    for chunk in chunks:
+        yield from parser.feed(chunk)
@@ -44,7 +44,27 @@ def escape_for_latex(data):
 
     return data
 
-def latex_to_pdf(json_resume, dst_path):
+def escape_resume_for_latex(json_resume, escaped_sections=None):
+    """Escapes the resume, reusing section items that were already escaped while they were streamed.
+
+    Args:
+        json_resume (dict): The resume details.
+        escaped_sections (dict, optional): Section name to {index: (item, escaped item)}. Streamed items are
+            only reused if they are exactly the final section items.
+    """
+    escaped_sections = escaped_sections or {}
+    escaped_resume = {}
+    for key, value in json_resume.items():
+        streamed = escaped_sections.get(key)
+        if streamed and isinstance(value, list):
+            streamed = [streamed[index] for index in sorted(streamed)]
+            if [item for item, _ in streamed] == value:
+                escaped_resume[key] = [escaped_item for _, escaped_item in streamed]
+                continue
+        escaped_resume[key] = escape_for_latex(value)
+    return escaped_resume
+
+def latex_to_pdf(json_resume, dst_path, escaped_sections=None):
     try:
         module_dir = os.path.dirname(__file__)
         templates_path = os.path.join(os.path.dirname(module_dir), 'templates')
@@ -63,7 +83,7 @@ def latex_to_pdf(json_resume, dst_path):
             loader=jinja2.FileSystemLoader(templates_path),
         )
 
-        escaped_json_resume = escape_for_latex(json_resume)
+        escaped_json_resume = escape_resume_for_latex(json_resume, escaped_sections)
 
         resume_latex = use_template(latex_jinja_env, escaped_json_resume)
 
@@ -8,165 +8,477 @@
 -----------------------------------------------------------------------
 '''
 import json
+import asyncio
 import textwrap
-import pandas as pd
+import numpy as np
 import streamlit as st
-from openai import OpenAI
+from openai import OpenAI, AsyncOpenAI
 from langchain_community.llms.ollama import Ollama
 from langchain_ollama import OllamaEmbeddings
 import google.generativeai as genai
 from google.generativeai.types.generation_types import GenerationConfig
 
+from zlm.utils.cache import get_llm_cache, make_key
+from zlm.utils.cassette import get_active_cassette
+from zlm.utils.embedding_store import get_embedding_store
+from zlm.utils.client_pool import aprovider_limit, get_async_client, get_client, provider_limit
+from zlm.utils.rate_limiter import get_rate_limiter
+from zlm.utils.token_budget import count_tokens, usage_tracker
 from zlm.utils.utils import parse_json_markdown
-from zlm.variables import GEMINI_EMBEDDING_MODEL, GPT_EMBEDDING_MODEL, OLLAMA_EMBEDDING_MODEL
+from zlm.variables import EMBEDDING_BATCH_SIZE, GEMINI_EMBEDDING_MODEL, GPT_EMBEDDING_MODEL, LLM_BASE_URLS, MAX_OUTPUT_TOKENS, OLLAMA_EMBEDDING_MODEL
 
-class ChatGPT:
-    def __init__(self, api_key, model, system_prompt):
-        if system_prompt.strip():
-            self.system_prompt = {"role": "system", "content": system_prompt}
-        self.client = OpenAI(api_key=api_key)
-        self.model = model
-    
-    def get_response(self, prompt, expecting_longer_output=False, need_json_output=False):
-        user_prompt = {"role": "user", "content": prompt}
+def get_cached_response(cache, cache_key, bypass_cache=False):
+    """Returns the cached raw response, or None when caching is disabled, bypassed or missed."""
+    if cache is None or bypass_cache:
+        return None
+    return cache.get(cache_key)
 
-        try:
-            # TODO: Decide value(temperature, top_p, max_tokens, stop) to get apt response
-            completion = self.client.chat.completions.create(
-                model=self.model,
-                messages = [self.system_prompt, user_prompt],
-                temperature=0,
-                max_tokens = 4000 if expecting_longer_output else None,
-                response_format = { "type": "json_object" } if need_json_output else None
-            )
+def set_cached_response(cache, cache_key, content, result):
+    """Caches the raw response, only if it was successfully parsed."""
+    if cache is not None and content and result is not None:
+        cache.set(cache_key, content)
+
+class BaseLLM:
+    """
+    Shared response handling for all LLM providers.
 
-            response = completion.choices[0].message
-            content = response.content.strip()
-            
-            if need_json_output:
-                return parse_json_markdown(content)
+    Subclasses implement the provider specific calls `_params`, `_generate`, `_agenerate`, `_stream`, `_embed` and `_aembed`,
+    while caching, rate limiting, JSON parsing and error reporting are done here for both the sync and async APIs.
+    """
+    provider = None
+    error_label = "LLM API"
+    embedding_model = None
+    # Whether errors are shown in the Streamlit UI, or only logged. e.g. when another LLM will retry the call
+    report_errors = True
+
+    @property
+    def rate_limiter(self):
+        return get_rate_limiter(self.provider, self.model)
+
+    def _estimate_tokens(self, prompt, params):
+        max_output_tokens = params.get("max_tokens") or params.get("max_output_tokens") or params.get("num_predict") or 0
+        return count_tokens(prompt, self.provider, self.model) + max_output_tokens
+
+    def _record_usage(self, prompt, content, prompt_tokens=None, output_tokens=None):
+        """Records the tokens used by a call, counting them locally when the provider doesn't report usage."""
+        if prompt_tokens is None:
+            prompt_tokens = count_tokens(prompt, self.provider, self.model)
+        if output_tokens is None:
+            output_tokens = count_tokens(content, self.provider, self.model)
+        usage_tracker.record(self.provider, self.model, prompt_tokens, output_tokens)
+
+    def _limited(self, fn, *args):
+        with provider_limit(self.provider):
+            cassette = get_active_cassette()
+            if cassette is not None and cassette.recording:
+                return cassette.record(self, fn, *args)
+            return fn(*args)
+
+    async def _alimited(self, fn, *args):
+        async with aprovider_limit(self.provider):
+            cassette = get_active_cassette()
+            if cassette is not None and cassette.recording:
+                return await cassette.arecord(self, fn, *args)
+            return await fn(*args)
+
+    def _limited_stream(self, prompt, params):
+        with provider_limit(self.provider):
+            cassette = get_active_cassette()
+            if cassette is not None and cassette.recording:
+                yield from cassette.record_stream(self, self._stream, prompt, params)
             else:
-                return content
-        
-        except Exception as e:
-            print(e)
-            st.error(f"Error in OpenAI API, {e}")
-            st.markdown("<h3 style='text-align: center;'>Please try again! Check the log in the dropdown for more details.</h3>", unsafe_allow_html=True)
-    
-    def get_embedding(self, text, model=GPT_EMBEDDING_MODEL, task_type="retrieval_document"):
+                yield from self._stream(prompt, params)
+
+    def _open_stream(self, prompt, params):
+        """Opens the provider stream and waits for its first chunk, so errors raised before any token can be retried.
+
+        Returns:
+            tuple: The first chunk, empty if the stream had none, and the rest of the stream.
+        """
+        stream = self._limited_stream(prompt, params)
+        for chunk in stream:
+            if chunk:
+                return chunk, stream
+        return "", stream
+
+    def _call_provider(self, fn, *args, estimated_tokens=0):
+        """Calls the provider within the rate limits, or replays the call from the active cassette."""
+        cassette = get_active_cassette()
+        if cassette is not None and cassette.replaying:
+            return cassette.replay(self, fn, *args)
+        return self.rate_limiter.call(self._limited, fn, *args, estimated_tokens=estimated_tokens)
+
+    async def _acall_provider(self, fn, *args, estimated_tokens=0):
+        cassette = get_active_cassette()
+        if cassette is not None and cassette.replaying:
+            return await cassette.areplay(self, fn, *args)
+        return await self.rate_limiter.acall(self._alimited, fn, *args, estimated_tokens=estimated_tokens)
+
+    def _bypass_cache(self, bypass_cache):
+        # Every call goes to the providers while a cassette is active, so the run can be replayed on a cold cache
+        return bypass_cache or get_active_cassette() is not None
+
+    def get_response(self, prompt, expecting_longer_output=False, need_json_output=False, bypass_cache=False, max_output_tokens=None, raw_output=False):
+        """Returns the LLM response, parsed as JSON if `need_json_output`, or None on error.
+
+        With `raw_output` the response text is returned as is, e.g. to salvage a JSON response that fails to parse.
+        """
         try:
-            text = text.replace("\n", " ")
-            return self.client.embeddings.create(input = [text], model=model).data[0].embedding
+            params = self._params(expecting_longer_output, need_json_output, max_output_tokens)
+            cache_key = make_key(self.provider, self.model, self.system_prompt, prompt, params)
+            content = cached = get_cached_response(self.cache, cache_key, self._bypass_cache(bypass_cache))
+
+            if content is None:
+                content = self._call_provider(self._generate, prompt, params, estimated_tokens=self._estimate_tokens(prompt, params))
+
+            return self._handle_response(content, need_json_output, cache_key, is_cached=cached is not None, raw_output=raw_output)
+
         except Exception as e:
-            print(e)
+            self._handle_error(e)
+            return None
 
-class Gemini:
-    # TODO: Test and Improve support for Gemini API
-    def __init__(self, api_key, model, system_prompt):
-        genai.configure(api_key=api_key)
-        self.system_prompt = system_prompt
-        self.model = model
-    
-    def get_response(self, prompt, expecting_longer_output=False, need_json_output=False):
+    async def aget_response(self, prompt, expecting_longer_output=False, need_json_output=False, bypass_cache=False, max_output_tokens=None, raw_output=False):
         try:
-            model = genai.GenerativeModel(
-                model_name=self.model,
-                system_instruction=self.system_prompt
-                )
-            
-            content = model.generate_content(
-                contents=prompt,
-                generation_config=GenerationConfig(
-                    temperature=0.7,
-                    max_output_tokens = 4000 if expecting_longer_output else None,
-                    response_mime_type = "application/json" if need_json_output else None
-                    )
-                )
+            params = self._params(expecting_longer_output, need_json_output, max_output_tokens)
+            cache_key = make_key(self.provider, self.model, self.system_prompt, prompt, params)
+            content = cached = await asyncio.to_thread(get_cached_response, self.cache, cache_key, self._bypass_cache(bypass_cache))
+
+            if content is None:
+                content = await self._acall_provider(self._agenerate, prompt, params, estimated_tokens=self._estimate_tokens(prompt, params))
+
+            return self._handle_response(content, need_json_output, cache_key, is_cached=cached is not None, raw_output=raw_output)
 
-            if need_json_output:
-                result = parse_json_markdown(content.text)
-            else:
-                result = content.text
-            
-            if result is None:
-                st.write("LLM Response")
-                st.markdown(f"```json\n{content.text}\n```")
-
-            return result
-        
         except Exception as e:
-            print(e)
-            st.error(f"Error in Gemini API, {e}")
-            st.markdown("<h3 style='text-align: center;'>Please try again! Check the log in the dropdown for more details.</h3>", unsafe_allow_html=True)
+            self._handle_error(e)
             return None
-    
-    def get_embedding(self, content, model=GEMINI_EMBEDDING_MODEL, task_type="retrieval_document"):
+
+    def stream_response(self, prompt, expecting_longer_output=False, need_json_output=False, bypass_cache=False, max_output_tokens=None):
+        """Yields the response text chunks as they are generated by the provider.
+
+        A cached response is yielded as a single chunk, and the full response is cached once the stream closes.
+        """
         try:
-            def embed_fn(data):
-                result = genai.embed_content(
-                    model=model,
-                    content=data,
-                    task_type=task_type,
-                    title="Embedding of json text" if task_type in ["retrieval_document", "document"] else None)
-                
-                return result['embedding']
-            
-            df = pd.DataFrame(content)
-            df.columns = ['chunk']
-            df['embedding'] = df.apply(lambda row: embed_fn(row['chunk']), axis=1)
-            
-            return df
-        
+            params = self._params(expecting_longer_output, need_json_output, max_output_tokens)
+            cache_key = make_key(self.provider, self.model, self.system_prompt, prompt, params)
+            cached = get_cached_response(self.cache, cache_key, self._bypass_cache(bypass_cache))
+
+            if cached is not None:
+                yield cached
+                return
+
+            chunks = []
+            cassette = get_active_cassette()
+            if cassette is not None and cassette.replaying:
+                for chunk in cassette.replay_stream(self, self._stream, prompt, params):
+                    if chunk:
+                        chunks.append(chunk)
+                        yield chunk
+            else:
+                # Opening the stream is retried like any other call, but once a token is yielded it can't be
+                first_chunk, stream = self.rate_limiter.call(self._open_stream, prompt, params, estimated_tokens=self._estimate_tokens(prompt, params))
+                try:
+                    if first_chunk:
+                        chunks.append(first_chunk)
+                        yield first_chunk
+                    for chunk in stream:
+                        if chunk:
+                            chunks.append(chunk)
+                            yield chunk
+                except Exception as e:
+                    self.rate_limiter.record_error(e)
+                    raise
+                finally:
+                    # e.g. the consumer closed the stream early
+                    stream.close()
+
+            content = "".join(chunks)
+            self._record_usage(prompt, content)
+            set_cached_response(self.cache, cache_key, content, parse_json_markdown(content) if need_json_output else content)
+
         except Exception as e:
-            print(e)
+            self._handle_error(e)
 
-class OllamaModel:
-    def __init__(self, model, system_prompt):
-        self.model = model
-        self.system_prompt = system_prompt
-    
-    def get_response(self, prompt, expecting_longer_output=False, need_json_output=False):
+    def _missing_embeddings(self, content, model, task_type):
+        chunks = [content] if isinstance(content, str) else list(content)
+        store_model = f"{self.provider}/{model}/{task_type}"
+        if get_active_cassette() is None:
+            vectors = get_embedding_store().get_many(store_model, chunks)
+        else:
+            vectors = [None] * len(chunks)
+        # Unique chunks that are not in the store yet
+        missing = list(dict.fromkeys(chunk for chunk, vector in zip(chunks, vectors) if vector is None))
+        return chunks, store_model, vectors, missing
+
+    def _fill_embeddings(self, chunks, store_model, vectors, missing, embedded, content):
+        get_embedding_store().put_many(store_model, missing, embedded)
+        new_vectors = dict(zip(missing, np.asarray(embedded, dtype=np.float32)))
+        vectors = np.vstack([new_vectors[chunk] if vector is None else vector for chunk, vector in zip(chunks, vectors)])
+        return vectors[0] if isinstance(content, str) else vectors
+
+    def get_embedding(self, content, model=None, task_type="retrieval_document", batch_size=EMBEDDING_BATCH_SIZE):
+        """Embeds a text chunk or a list of chunks.
+
+        Chunks already in the embedding store are not embedded again, the rest are embedded
+        with one request per `batch_size` chunks.
+
+        Returns:
+            np.ndarray: A vector for a single chunk, or a (n_chunks, dim) matrix for a list of chunks.
+        """
         try:
-            llm = Ollama(
-                model=self.model, 
-                system=self.system_prompt,
-                temperature=0.8, 
-                top_p=0.999, 
-                top_k=250,
-                num_predict=4000 if expecting_longer_output else None,
-                # format='json' if need_json_output else None,
-                )
-            content = llm.invoke(prompt)
-
-            if need_json_output:
-                result = parse_json_markdown(content)
-            else:
-                result = content
-            
-            if result is None:
-                st.write("LLM Response")
-                st.markdown(f"```json\n{content.text}\n```")
-
-            return result
-        
+            model = model or self.embedding_model
+            chunks, store_model, vectors, missing = self._missing_embeddings(content, model, task_type)
+
+            embedded = []
+            for i in range(0, len(missing), batch_size):
+                batch = missing[i:i + batch_size]
+                embedded.extend(self._call_provider(
+                    self._embed, batch, model, task_type, estimated_tokens=sum(len(chunk) for chunk in batch) // 4
+                    ))
+
+            return self._fill_embeddings(chunks, store_model, vectors, missing, embedded, content)
+
         except Exception as e:
             print(e)
-            st.error(f"Error in Ollama model - {self.model}, {e}")
-            st.markdown("<h3 style='text-align: center;'>Please try again! Check the log in the dropdown for more details.</h3>", unsafe_allow_html=True)
-            return None
-    
-    def get_embedding(self, content, model=OLLAMA_EMBEDDING_MODEL, task_type="retrieval_document"):
+
+    async def aget_embedding(self, content, model=None, task_type="retrieval_document", batch_size=EMBEDDING_BATCH_SIZE):
+        """Async version of `get_embedding`, batches are embedded concurrently."""
         try:
-            def embed_fn(data):
-                embedding = OllamaEmbeddings(model=model)
-                result = embedding.embed_query(data)
-                return result
-            
-            df = pd.DataFrame(content)
-            df.columns = ['chunk']
-            df['embedding'] = df.apply(lambda row: embed_fn(row['chunk']), axis=1)
-            
-            return df
-        
+            model = model or self.embedding_model
+            chunks, store_model, vectors, missing = await asyncio.to_thread(self._missing_embeddings, content, model, task_type)
+
+            async def embed_batch(batch):
+                return await self._acall_provider(
+                    self._aembed, batch, model, task_type, estimated_tokens=sum(len(chunk) for chunk in batch) // 4
+                    )
+
+            batches = await asyncio.gather(*[embed_batch(missing[i:i + batch_size]) for i in range(0, len(missing), batch_size)])
+            embedded = [vector for batch in batches for vector in batch]
+
+            return await asyncio.to_thread(self._fill_embeddings, chunks, store_model, vectors, missing, embedded, content)
+
         except Exception as e:
-            print(e)
\ No newline at end of file
+            print(e)
+
+    def _handle_response(self, content, need_json_output, cache_key, is_cached=False, raw_output=False):
+        if need_json_output:
+            result = parse_json_markdown(content)
+        else:
+            result = content
+
+        if result is None:
+            st.write("LLM Response")
+            st.markdown(f"```json\n{content}\n```")
+
+        if not is_cached:
+            set_cached_response(self.cache, cache_key, content, result)
+        return content if raw_output else result
+
+    def _handle_error(self, e):
+        print(e)
+        if not self.report_errors:
+            return
+        st.error(f"Error in {self.error_label}, {e}")
+        st.markdown("<h3 style='text-align: center;'>Please try again! Check the log in the dropdown for more details.</h3>", unsafe_allow_html=True)
+
+class ChatGPT(BaseLLM):
+    provider = "GPT"
+    error_label = "OpenAI API"
+    embedding_model = GPT_EMBEDDING_MODEL
+
+    # Responses are deterministic with temperature=0, so caching is enabled by default
+    def __init__(self, api_key, model, system_prompt, use_cache=True, base_url=None):
+        if system_prompt.strip():
+            self.system_prompt = {"role": "system", "content": system_prompt}
+        self.api_key = api_key
+        self.base_url = base_url or LLM_BASE_URLS.get(self.provider)
+        # Retries are done by the shared rate limiter, so SDK retries are disabled
+        self.client = get_client(
+            lambda: OpenAI(api_key=api_key, base_url=self.base_url, max_retries=0),
+            self.provider, api_key=api_key, base_url=self.base_url
+            )
+        self.model = model
+        self.cache = get_llm_cache() if use_cache else None
+
+    @property
+    def async_client(self):
+        return get_async_client(
+            lambda: AsyncOpenAI(api_key=self.api_key, base_url=self.base_url, max_retries=0),
+            self.provider, api_key=self.api_key, base_url=self.base_url
+            )
+
+    def _params(self, expecting_longer_output=False, need_json_output=False, max_output_tokens=None):
+        # TODO: Decide value(temperature, top_p, max_tokens, stop) to get apt response
+        return dict(
+            temperature=0,
+            max_tokens = max_output_tokens or (MAX_OUTPUT_TOKENS if expecting_longer_output else None),
+            response_format = { "type": "json_object" } if need_json_output else None
+        )
+
+    def _generate(self, prompt, params):
+        user_prompt = {"role": "user", "content": prompt}
+        completion = self.client.chat.completions.create(
+            model=self.model,
+            messages = [self.system_prompt, user_prompt],
+            **params
+        )
+        content = completion.choices[0].message.content.strip()
+        self._record_usage(prompt, content, completion.usage.prompt_tokens, completion.usage.completion_tokens)
+        return content
+
+    async def _agenerate(self, prompt, params):
+        user_prompt = {"role": "user", "content": prompt}
+        completion = await self.async_client.chat.completions.create(
+            model=self.model,
+            messages = [self.system_prompt, user_prompt],
+            **params
+        )
+        content = completion.choices[0].message.content.strip()
+        self._record_usage(prompt, content, completion.usage.prompt_tokens, completion.usage.completion_tokens)
+        return content
+
+    def _stream(self, prompt, params):
+        user_prompt = {"role": "user", "content": prompt}
+        stream = self.client.chat.completions.create(
+            model=self.model,
+            messages = [self.system_prompt, user_prompt],
+            stream=True,
+            **params
+        )
+        for chunk in stream:
+            if chunk.choices:
+                yield chunk.choices[0].delta.content
+
+    def _embed(self, texts, model, task_type):
+        response = self.client.embeddings.create(input = [text.replace("\n", " ") for text in texts], model=model)
+        return [data.embedding for data in sorted(response.data, key=lambda data: data.index)]
+
+    async def _aembed(self, texts, model, task_type):
+        response = await self.async_client.embeddings.create(input = [text.replace("\n", " ") for text in texts], model=model)
+        return [data.embedding for data in sorted(response.data, key=lambda data: data.index)]
+
+class Gemini(BaseLLM):
+    provider = "Gemini"
+    error_label = "Gemini API"
+    embedding_model = GEMINI_EMBEDDING_MODEL
+
+    # TODO: Test and Improve support for Gemini API
+    # Responses are sampled with temperature=0.7, so caching is opt-in
+    def __init__(self, api_key, model, system_prompt, use_cache=False, base_url=None):
+        self.base_url = base_url or LLM_BASE_URLS.get(self.provider)
+        if self.base_url:
+            # Custom endpoints speak the REST API, the default transport is gRPC
+            genai.configure(api_key=api_key, transport="rest", client_options={"api_endpoint": self.base_url})
+        else:
+            genai.configure(api_key=api_key)
+        self.api_key = api_key
+        self.system_prompt = system_prompt
+        self.model = model
+        self.cache = get_llm_cache() if use_cache else None
+
+    def _params(self, expecting_longer_output=False, need_json_output=False, max_output_tokens=None):
+        return dict(
+            temperature=0.7,
+            max_output_tokens = max_output_tokens or (MAX_OUTPUT_TOKENS if expecting_longer_output else None),
+            response_mime_type = "application/json" if need_json_output else None
+        )
+
+    def _get_model(self):
+        return get_client(
+            lambda: genai.GenerativeModel(model_name=self.model, system_instruction=self.system_prompt),
+            self.provider, self.model, self.system_prompt, api_key=self.api_key, base_url=self.base_url
+            )
+
+    def _record_gemini_usage(self, prompt, response):
+        usage = getattr(response, "usage_metadata", None)
+        self._record_usage(
+            prompt, response.text,
+            getattr(usage, "prompt_token_count", None), getattr(usage, "candidates_token_count", None)
+            )
+
+    def _generate(self, prompt, params):
+        model = self._get_model()
+        response = model.generate_content(contents=prompt, generation_config=GenerationConfig(**params))
+        self._record_gemini_usage(prompt, response)
+        return response.text
+
+    async def _agenerate(self, prompt, params):
+        # The REST transport used for custom endpoints has no async client
+        if self.base_url:
+            return await asyncio.to_thread(self._generate, prompt, params)
+        model = self._get_model()
+        response = await model.generate_content_async(contents=prompt, generation_config=GenerationConfig(**params))
+        self._record_gemini_usage(prompt, response)
+        return response.text
+
+    def _stream(self, prompt, params):
+        model = self._get_model()
+        for chunk in model.generate_content(contents=prompt, generation_config=GenerationConfig(**params), stream=True):
+            yield chunk.text
+
+    def _embed_kwargs(self, model, task_type):
+        return dict(
+            model=model,
+            task_type=task_type,
+            title="Embedding of json text" if task_type in ["retrieval_document", "document"] else None)
+
+    def _embed(self, texts, model, task_type):
+        return genai.embed_content(content=texts, **self._embed_kwargs(model, task_type))['embedding']
+
+    async def _aembed(self, texts, model, task_type):
+        if self.base_url:
+            return await asyncio.to_thread(self._embed, texts, model, task_type)
+        result = await genai.embed_content_async(content=texts, **self._embed_kwargs(model, task_type))
+        return result['embedding']
+
+class OllamaModel(BaseLLM):
+    provider = "Ollama"
+    embedding_model = OLLAMA_EMBEDDING_MODEL
+
+    # Responses are sampled with temperature=0.8, so caching is opt-in
+    def __init__(self, model, system_prompt, use_cache=False, base_url=None):
+        self.model = model
+        self.system_prompt = system_prompt
+        self.base_url = base_url or LLM_BASE_URLS.get(self.provider)
+        self.client_kwargs = {"base_url": self.base_url} if self.base_url else {}
+        self.cache = get_llm_cache() if use_cache else None
+
+    @property
+    def error_label(self):
+        return f"Ollama model - {self.model}"
+
+    def _params(self, expecting_longer_output=False, need_json_output=False, max_output_tokens=None):
+        return dict(
+            temperature=0.8,
+            top_p=0.999,
+            top_k=250,
+            num_predict=max_output_tokens or (MAX_OUTPUT_TOKENS if expecting_longer_output else None),
+            # format='json' if need_json_output else None,
+        )
+
+    def _get_llm(self, params):
+        return get_client(
+            lambda: Ollama(model=self.model, system=self.system_prompt, **self.client_kwargs, **params),
+            self.provider, self.model, self.system_prompt, **self.client_kwargs, **params
+            )
+
+    def _get_embeddings(self, model):
+        return get_client(lambda: OllamaEmbeddings(model=model, **self.client_kwargs), self.provider, model, **self.client_kwargs)
+
+    def _generate(self, prompt, params):
+        content = self._get_llm(params).invoke(prompt)
+        self._record_usage(prompt, content)
+        return content
+
+    async def _agenerate(self, prompt, params):
+        content = await self._get_llm(params).ainvoke(prompt)
+        self._record_usage(prompt, content)
+        return content
+
+    def _stream(self, prompt, params):
+        yield from self._get_llm(params).stream(prompt)
+
+    def _embed(self, texts, model, task_type):
+        return self._get_embeddings(model).embed_documents(texts)
+
+    async def _aembed(self, texts, model, task_type):
+        return await self._get_embeddings(model).aembed_documents(texts)
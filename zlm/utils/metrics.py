@@ -10,11 +10,15 @@
 import re
 import json
 import math
+import hashlib
+import threading
 import numpy as np
-import pandas as pd
 from sklearn.feature_extraction.text import TfidfVectorizer
 from sklearn.metrics import pairwise
+from collections import OrderedDict
+from functools import lru_cache
 from zlm.utils.utils import key_value_chunking
+from zlm.variables import STEM_CACHE_SIZE, TOKEN_SET_CACHE_SIZE
 
 import nltk
 from nltk.corpus import stopwords
@@ -24,6 +28,73 @@
 nltk.download('stopwords')
 nltk.download('punkt')
 
+
+class TextNormalizer:
+    """
+    Tokenizes text, removes stopwords and punctuation, and stems words, reusing work across calls.
+
+    The stopword set is loaded once on first use, the stem of each distinct word is memoized in a bounded
+    LRU cache, and the normalized token set of each document is cached by its hash, so comparing the same
+    resume or job description again is a dictionary lookup.
+
+    Args:
+        stem_cache_size (int, optional): Max distinct words whose stem is cached. Defaults to STEM_CACHE_SIZE.
+        token_set_cache_size (int, optional): Max documents whose token set is cached. Defaults to TOKEN_SET_CACHE_SIZE.
+    """
+
+    NON_ALPHA_PATTERN = re.compile('[^a-zA-Z]')
+
+    def __init__(self, stem_cache_size: int = STEM_CACHE_SIZE, token_set_cache_size: int = TOKEN_SET_CACHE_SIZE):
+        self._stop_words = None
+        self.stemmer = PorterStemmer()
+        self.stem = lru_cache(maxsize=stem_cache_size)(self.stemmer.stem)
+        self.token_set_cache_size = token_set_cache_size
+        self._token_sets = OrderedDict()
+        self._lock = threading.Lock()
+
+    @property
+    def stop_words(self) -> frozenset:
+        if self._stop_words is None:
+            self._stop_words = frozenset(stopwords.words('english'))
+        return self._stop_words
+
+    def normalize(self, text: str) -> list:
+        """Returns the normalized words of the text, in order and with repetitions."""
+        stop_words = self.stop_words
+        words = (self.NON_ALPHA_PATTERN.sub('', word).lower() for word in word_tokenize(text))
+        return [self.stem(word) for word in words if word and word not in stop_words]
+
+    def normalize_many(self, texts: list) -> list:
+        """Returns the normalized words of each text."""
+        return [self.normalize(text) for text in texts]
+
+    def token_set(self, text: str) -> frozenset:
+        """Returns the set of normalized words of the text, cached by the text's hash."""
+        key = hashlib.sha256(text.encode('utf-8')).digest()
+        with self._lock:
+            tokens = self._token_sets.get(key)
+            if tokens is not None:
+                self._token_sets.move_to_end(key)
+                return tokens
+
+        tokens = frozenset(self.normalize(text))
+        with self._lock:
+            self._token_sets[key] = tokens
+            if len(self._token_sets) > self.token_set_cache_size:
+                self._token_sets.popitem(last=False)
+        return tokens
+
+    def token_sets(self, texts: list) -> list:
+        """Returns the cached token set of each text."""
+        return [self.token_set(text) for text in texts]
+
+    def cache_info(self) -> dict:
+        stem_info = self.stem.cache_info()
+        return {"stem_hits": stem_info.hits, "stem_misses": stem_info.misses, "stems": stem_info.currsize, "token_sets": len(self._token_sets)}
+
+
+text_normalizer = TextNormalizer()
+
 def remove_urls(list_of_strings):
     """Removes strings containing URLs from a list using regular expressions."""
     filtered_list = [string for string in list_of_strings if not re.search(r"https?://\S+", string)]
@@ -44,8 +115,7 @@ def overlap_coefficient(document1: str, document2: str) -> float:
         float: The overlap coefficient between the two documents.
     """    
     # List the unique words in a document
-    words_in_document1 = set(normalize_text(document1))
-    words_in_document2 = set(normalize_text(document2))
+    words_in_document1, words_in_document2 = text_normalizer.token_sets([document1, document2])
 
     # Find the intersection of words list of document1 & document2
     intersection = words_in_document1.intersection(words_in_document2)
@@ -73,8 +143,7 @@ def jaccard_similarity(document1: str, document2: str) -> float:
         float: The Jaccard similarity between the two documents.
     """    
     # List the unique words in a document
-    words_in_document1 = set(normalize_text(document1))
-    words_in_document2 = set(normalize_text(document2))
+    words_in_document1, words_in_document2 = text_normalizer.token_sets([document1, document2])
 
     # Find the intersection of words list of document1 & document2
     intersection = words_in_document1.intersection(words_in_document2)
@@ -119,10 +188,7 @@ def vector_embedding_similarity(llm, document1: str, document2: str) -> float:
     emb_1 = llm.get_embedding(document1, task_type="retrieval_query")
     emb_2 = llm.get_embedding(document2, task_type="retrieval_query")
 
-    df1 = pd.DataFrame(emb_1.embedding.to_list())
-    df2 = pd.DataFrame(emb_2.embedding.to_list())
-
-    emb_sem = pairwise.cosine_similarity(df1, df2)
+    emb_sem = pairwise.cosine_similarity(emb_1, emb_2)
 
     return emb_sem.mean()
 
@@ -141,25 +207,4 @@ def normalize_text(text: str) -> list:
     Returns:
         list: The list of normalized words.
     """    
-    # Step 1: Tokenization
-    words = word_tokenize(text)
-
-    # Step 2: Data Cleaning - Remove Stopwords and Punctuations 
-    words = [re.sub('[^a-zA-Z]', '', word).lower() for word in words]
-
-    # Step 3: Remove empty tokens
-    words = [word for word in words if len(word)] 
-
-    # Step 4: Remove Stopwords
-    stop_words = set(stopwords.words('english'))
-    words = [word for word in words if word not in stop_words]
-
-    # Step 5: Stemming
-    stemmer = PorterStemmer()
-    words = [stemmer.stem(word) for word in words]
-
-    #STEP 3 : LEMMATIZATION
-    # lemmatizer=WordNetLemmatizer()
-    # words=[lemmatizer.lemmatize(word) for word in words]
-    
-    return words 
\ No newline at end of file
+    return text_normalizer.normalize(text)
@@ -0,0 +1,373 @@
+'''
+-----------------------------------------------------------------------
+File: utils/page_fetcher.py
+Creation Time: Oct 17th 2026, 10:05 pm
+Author: Saurabh Zinjad
+Developer Email: saurabhzinjad@gmail.com
+Copyright (c) 2023-2024 Saurabh Zinjad. All rights reserved | https://github.com/Ztrimus
+-----------------------------------------------------------------------
+
+Tiered job page fetcher. A page is fetched with plain HTTP first, which takes milliseconds for static pages,
+and only escalated to a warm headless browser when its text is empty or needs JavaScript to render.
+'''
+
+import re
+import json
+import time
+import codecs
+import atexit
+import asyncio
+import threading
+import requests
+from requests.adapters import HTTPAdapter
+
+from zlm.utils.cache import get_page_cache, make_key
+from zlm.utils.html_text import html_to_text, site_profile, text_extractor
+from zlm.variables import (
+    FETCH_BROWSER_CONTEXTS, FETCH_BROWSER_TIMEOUT, FETCH_HTTP_CONCURRENCY, FETCH_HTTP_TIMEOUT, FETCH_MIN_TEXT_CHARS, FETCH_USER_AGENT,
+    PAGE_CACHE_FRESHNESS
+)
+
+# Page chrome removed from every page
+BASIC_SELECTORS = ["header", "footer"]
+
+# Text of pages that only render with JavaScript
+JS_REQUIRED_MARKERS = ("enable javascript", "javascript is required", "javascript is disabled", "requires javascript", "turn on javascript")
+
+# Browser requests that are not needed to read a page's text
+BLOCKED_RESOURCE_TYPES = {"image", "media", "font", "stylesheet"}
+
+# Size of the chunks fed to the text extractor while a page downloads
+FETCH_CHUNK_SIZE = 16 * 1024
+
+# <meta charset="..."> or <meta http-equiv="Content-Type" content="...; charset=...">, declared within the first 1024 bytes of the page
+META_CHARSET_PATTERN = re.compile(rb"""<meta[^>]*?charset\s*=\s*["']?\s*([\w.:-]+)""", re.IGNORECASE)
+META_CHARSET_BYTES = 1024
+
+
+def needs_browser(text: str, status: int = None) -> bool:
+    """Whether a plain HTTP fetch missed the page content, so it should be fetched again with a browser."""
+    if status is None or status >= 400 or len(text) < FETCH_MIN_TEXT_CHARS:
+        return True
+    lower_text = text.lower()
+    return any(marker in lower_text for marker in JS_REQUIRED_MARKERS)
+
+
+_session = None
+_session_lock = threading.Lock()
+_http_limit = threading.BoundedSemaphore(FETCH_HTTP_CONCURRENCY)
+
+def get_http_session() -> requests.Session:
+    """Returns the process-wide HTTP session, which keeps connections to job sites alive between fetches."""
+    global _session
+    with _session_lock:
+        if _session is None:
+            _session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=FETCH_HTTP_CONCURRENCY, pool_maxsize=FETCH_HTTP_CONCURRENCY)
+            _session.mount("http://", adapter)
+            _session.mount("https://", adapter)
+            _session.headers.update({"User-Agent": FETCH_USER_AGENT, "Accept": "text/html,application/xhtml+xml;q=0.9,*/*;q=0.8"})
+        return _session
+
+
+def response_encoding(headers, head: bytes) -> str:
+    """Returns the page encoding: the Content-Type charset, else the <meta> charset in the page head, else UTF-8.
+
+    `requests` assumes ISO-8859-1 for text/html without a charset, which garbles the UTF-8 pages most job sites serve.
+    """
+    encoding = None
+    if "charset" in headers.get("content-type", "").lower():
+        encoding = requests.utils.get_encoding_from_headers(headers)
+    if encoding is None:
+        match = META_CHARSET_PATTERN.search(head[:META_CHARSET_BYTES])
+        encoding = match.group(1).decode("ascii") if match else "utf-8"
+    try:
+        codecs.lookup(encoding)
+    except LookupError:
+        encoding = "utf-8"
+    return encoding
+
+
+def fetch_http(url: str, timeout: float = FETCH_HTTP_TIMEOUT, headers: dict = None, remove_selectors=()) -> tuple:
+    """Fetches the page with a plain GET request, at most FETCH_HTTP_CONCURRENCY at a time.
+
+    The body is fed to the text extractor as it downloads, so the page HTML is never held in memory as a whole.
+
+    Returns:
+        tuple: (status code, page text, response headers).
+    """
+    with _http_limit:
+        with get_http_session().get(url, timeout=timeout, headers=headers, stream=True) as res:
+            chunks = res.iter_content(chunk_size=FETCH_CHUNK_SIZE)
+            # The encoding is picked once the head of the page, which may declare the charset, is downloaded
+            head = b""
+            for chunk in chunks:
+                head += chunk
+                if len(head) >= META_CHARSET_BYTES:
+                    break
+            decoder = codecs.getincrementaldecoder(response_encoding(res.headers, head))(errors="replace")
+
+            extractor = text_extractor(url, remove_selectors)
+            extractor.feed(decoder.decode(head))
+            for chunk in chunks:
+                extractor.feed(decoder.decode(chunk))
+            extractor.feed(decoder.decode(b"", final=True))
+            return res.status_code, extractor.close(), res.headers
+
+
+def page_cache_key(url: str, remove_selectors=()) -> str:
+    # The site profile is part of the key, so pages are extracted again when their profile changes
+    return make_key("page", url, list(remove_selectors), site_profile(url))
+
+
+def get_cached_page(url: str, remove_selectors=()):
+    """Returns the cached page entry, or None if the page was never fetched or expired."""
+    cached = get_page_cache().get(page_cache_key(url, remove_selectors))
+    return json.loads(cached) if cached is not None else None
+
+
+def is_fresh(entry: dict, freshness: float = PAGE_CACHE_FRESHNESS) -> bool:
+    return entry is not None and time.time() - entry["fetched_at"] < freshness
+
+
+def conditional_headers(entry: dict) -> dict:
+    """Returns the If-None-Match/If-Modified-Since headers that revalidate a cached page, empty if it has no validators."""
+    headers = {}
+    if entry is not None and entry.get("etag"):
+        headers["If-None-Match"] = entry["etag"]
+    if entry is not None and entry.get("last_modified"):
+        headers["If-Modified-Since"] = entry["last_modified"]
+    return headers
+
+
+def save_page(url: str, remove_selectors, text: str, tier: str, status: int, headers=None):
+    """Caches the text of a fetched page with its validators.
+
+    Only pages read over plain HTTP keep their ETag/Last-Modified. The HTML of a JavaScript rendered page
+    doesn't change when its content does, so those pages are fetched again once they are stale.
+    """
+    if not text or status is None or status >= 400:
+        return
+    headers = headers if tier == "http" and headers is not None else {}
+    entry = {
+        "url": url, "text": text, "tier": tier, "status": status, "fetched_at": time.time(),
+        "etag": headers.get("ETag"), "last_modified": headers.get("Last-Modified"),
+    }
+    get_page_cache().set(page_cache_key(url, remove_selectors), json.dumps(entry, ensure_ascii=False))
+
+
+def refresh_page(url: str, remove_selectors, entry: dict, headers=None):
+    """Marks a cached page as fresh again after a 304 Not Modified response."""
+    entry["fetched_at"] = time.time()
+    if headers is not None:
+        entry["etag"] = headers.get("ETag") or entry.get("etag")
+        entry["last_modified"] = headers.get("Last-Modified") or entry.get("last_modified")
+    get_page_cache().set(page_cache_key(url, remove_selectors), json.dumps(entry, ensure_ascii=False))
+
+
+class BrowserPool:
+    """
+    A headless Chromium browser with warm, reusable contexts, launched on first use and kept for the process lifetime.
+
+    Playwright objects are bound to the thread that created them, so the browser runs on an event loop in its own thread
+    and fetches from any thread are sent to it. The number of contexts caps concurrent browser fetches, and images,
+    fonts and stylesheets are not downloaded.
+
+    Args:
+        size (int, optional): Number of browser contexts. Defaults to FETCH_BROWSER_CONTEXTS.
+    """
+
+    def __init__(self, size: int = FETCH_BROWSER_CONTEXTS):
+        self.size = size
+        self._loop = None
+        self._playwright = None
+        self._browser = None
+        self._contexts = None
+        self._lock = threading.Lock()
+
+    def _ensure_started(self):
+        with self._lock:
+            if self._loop is not None:
+                return
+            loop = asyncio.new_event_loop()
+            threading.Thread(target=loop.run_forever, name="browser-pool", daemon=True).start()
+            try:
+                asyncio.run_coroutine_threadsafe(self._start(), loop).result(FETCH_BROWSER_TIMEOUT)
+            except Exception:
+                loop.call_soon_threadsafe(loop.stop)
+                raise
+            self._loop = loop
+
+    async def _start(self):
+        from playwright.async_api import async_playwright
+
+        self._playwright = await async_playwright().start()
+        self._browser = await self._playwright.chromium.launch(headless=True)
+        self._contexts = asyncio.Queue()
+        for _ in range(self.size):
+            self._contexts.put_nowait(await self._new_context())
+
+    async def _new_context(self):
+        context = await self._browser.new_context(user_agent=FETCH_USER_AGENT)
+        await context.route("**/*", self._route)
+        return context
+
+    @staticmethod
+    async def _route(route):
+        if route.request.resource_type in BLOCKED_RESOURCE_TYPES:
+            await route.abort()
+        else:
+            await route.continue_()
+
+    async def _fetch(self, url: str, timeout: float) -> tuple:
+        context = await self._contexts.get()
+        try:
+            page = await context.new_page()
+            try:
+                response = await page.goto(url, timeout=timeout * 1000, wait_until="domcontentloaded")
+                try:
+                    # Give client side rendering a moment to settle, the DOM loaded so far is used if it doesn't
+                    await page.wait_for_load_state("networkidle", timeout=timeout * 1000 / 3)
+                except Exception:
+                    pass
+                return (response.status if response else None), await page.content()
+            finally:
+                await page.close()
+        except Exception:
+            # Replace the context in case the failure broke it
+            try:
+                await context.close()
+            except Exception:
+                pass
+            context = await self._new_context()
+            raise
+        finally:
+            self._contexts.put_nowait(context)
+
+    def fetch(self, url: str, timeout: float = FETCH_BROWSER_TIMEOUT) -> tuple:
+        """Renders the page in the browser, waiting for a free context if all are busy.
+
+        Returns:
+            tuple: (status code, rendered HTML).
+        """
+        self._ensure_started()
+        future = asyncio.run_coroutine_threadsafe(asyncio.wait_for(self._fetch(url, timeout), timeout), self._loop)
+        return future.result()
+
+    async def _close(self):
+        while not self._contexts.empty():
+            await self._contexts.get_nowait().close()
+        await self._browser.close()
+        await self._playwright.stop()
+
+    def close(self):
+        with self._lock:
+            if self._loop is None:
+                return
+            try:
+                asyncio.run_coroutine_threadsafe(self._close(), self._loop).result(FETCH_BROWSER_TIMEOUT)
+            except Exception as e:
+                print(f"Closing the browser pool failed. {e}")
+            self._loop.call_soon_threadsafe(self._loop.stop)
+            self._loop = None
+
+
+browser_pool = BrowserPool()
+atexit.register(browser_pool.close)
+
+
+# The steps below are shared by `fetch_page` and `BulkCrawler`, which only differ in how the HTTP request is sent.
+# A page is a dict with its "text", "status" code, the "tier" it was read with and the HTTP response "headers".
+
+def empty_page() -> dict:
+    return {"text": "", "status": None, "tier": "http", "headers": None}
+
+
+def cached_page(url: str, remove_selectors=(), use_cache: bool = True, freshness: float = PAGE_CACHE_FRESHNESS) -> tuple:
+    """Looks the page up in the page cache.
+
+    Returns:
+        tuple: (the cached entry to revalidate, None if there is none; the cached page if the entry is fresh, else None).
+    """
+    entry = get_cached_page(url, remove_selectors) if use_cache else None
+    if is_fresh(entry, freshness):
+        return entry, {"text": entry["text"], "status": entry["status"], "tier": "cache", "headers": None}
+    return entry, None
+
+
+def http_page(url: str, remove_selectors, entry: dict, status: int, text: str, headers=None) -> dict:
+    """Returns the page read from a conditional HTTP request, the cached entry if the server answered 304 Not Modified."""
+    if status == 304 and entry is not None:
+        refresh_page(url, remove_selectors, entry, headers)
+        return {"text": entry["text"], "status": entry["status"], "tier": "revalidated", "headers": headers}
+    return {"text": text, "status": status, "tier": "http", "headers": headers}
+
+
+def escalate_page(url: str, remove_selectors, page: dict, use_browser: bool = True, timeout: float = FETCH_BROWSER_TIMEOUT) -> dict:
+    """Fetches the page again with the browser pool if plain HTTP missed its content.
+
+    Returns:
+        dict: The browser page if it has at least as much text, else the given page. Raises if the browser fetch fails.
+    """
+    if page["tier"] != "http" or not use_browser or not needs_browser(page["text"], page["status"]):
+        return page
+    browser_status, html = browser_pool.fetch(url, timeout)
+    browser_text = html_to_text(html, remove_selectors, url)
+    if len(browser_text) >= len(page["text"]):
+        return {"text": browser_text, "status": browser_status, "tier": "browser", "headers": None}
+    return page
+
+
+def store_page(url: str, remove_selectors, page: dict, use_cache: bool = True, use_browser: bool = True):
+    """Caches a page that was fetched over the network.
+
+    A JavaScript shell left over from a failed browser fetch is not cached, so the next fetch tries the browser again.
+    """
+    if page["tier"] == "http" and use_browser and needs_browser(page["text"], page["status"]):
+        return
+    if use_cache and page["tier"] in ("http", "browser"):
+        save_page(url, remove_selectors, page["text"], page["tier"], page["status"], page["headers"])
+
+
+def fetch_page(
+    url: str, remove_selectors=(), http_timeout: float = FETCH_HTTP_TIMEOUT, browser_timeout: float = FETCH_BROWSER_TIMEOUT,
+    use_browser: bool = True, use_cache: bool = True, freshness: float = PAGE_CACHE_FRESHNESS
+) -> dict:
+    """Fetches the text of a web page, escalating from plain HTTP to the browser pool only when needed.
+
+    Pages are cached on disk. A cached page younger than `freshness` is returned without any request,
+    an older one is revalidated with a conditional request and reused if the server answers 304 Not Modified.
+
+    Args:
+        url (str): The page URL.
+        remove_selectors (list, optional): CSS selectors of elements to drop from the page text.
+        http_timeout (float, optional): Timeout of the HTTP fetch in seconds.
+        browser_timeout (float, optional): Timeout of the browser fetch in seconds.
+        use_browser (bool, optional): Whether to escalate JavaScript rendered pages to the browser pool. Defaults to True.
+        use_cache (bool, optional): Whether to use the page cache. Defaults to True.
+        freshness (float, optional): Seconds a cached page is used without revalidation. Defaults to PAGE_CACHE_FRESHNESS.
+
+    Returns:
+        dict: The page "text", the "tier" it was fetched with ("cache", "revalidated", "http" or "browser"), its "status" code and "elapsed" seconds.
+    """
+    start_time = time.perf_counter()
+
+    entry, page = cached_page(url, remove_selectors, use_cache, freshness)
+    if page is None:
+        page = empty_page()
+        try:
+            status, text, headers = fetch_http(url, http_timeout, conditional_headers(entry), remove_selectors)
+            page = http_page(url, remove_selectors, entry, status, text, headers)
+        except Exception as e:
+            print(f"HTTP fetch of {url} failed. {e}")
+
+        try:
+            page = escalate_page(url, remove_selectors, page, use_browser, browser_timeout)
+        except Exception as e:
+            print(f"Browser fetch of {url} failed. {e}")
+
+        store_page(url, remove_selectors, page, use_cache, use_browser)
+
+    elapsed = time.perf_counter() - start_time
+    print(f"Fetched {url} with {page['tier']} in {elapsed:.2f}s")
+    return {"url": url, "text": page["text"], "tier": page["tier"], "status": page["status"], "elapsed": elapsed}
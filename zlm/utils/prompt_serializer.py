@@ -0,0 +1,140 @@
+'''
+-----------------------------------------------------------------------
+File: utils/prompt_serializer.py
+Creation Time: Oct 17th 2026, 5:05 pm
+Author: Saurabh Zinjad
+Developer Email: saurabhzinjad@gmail.com
+Copyright (c) 2023-2024 Saurabh Zinjad. All rights reserved | https://github.com/Ztrimus
+-----------------------------------------------------------------------
+'''
+
+import json
+
+from zlm.utils.token_budget import count_tokens
+from zlm.variables import SECTION_JD_FIELDS
+
+
+def prune_empty(data):
+    """Recursively removes None, empty strings, lists and dicts."""
+    if isinstance(data, dict):
+        pruned = {key: prune_empty(value) for key, value in data.items()}
+        return {key: value for key, value in pruned.items() if value not in (None, "", [], {})}
+    elif isinstance(data, list):
+        pruned = [prune_empty(item) for item in data]
+        return [item for item in pruned if item not in (None, "", [], {})]
+    elif isinstance(data, str):
+        return data.strip()
+    return data
+
+
+def compact_json(data) -> str:
+    """Serializes data as minified JSON without empty values."""
+    return json.dumps(prune_empty(data), separators=(",", ":"), ensure_ascii=False)
+
+
+def non_empty_lists(data):
+    """Yields every non-empty list in the data, outer lists first."""
+    if isinstance(data, dict):
+        for value in data.values():
+            yield from non_empty_lists(value)
+    elif isinstance(data, list):
+        if data:
+            yield data
+        for item in data:
+            yield from non_empty_lists(item)
+
+
+def string_slots(data):
+    """Yields (container, key) of every string in the data."""
+    items = data.items() if isinstance(data, dict) else enumerate(data) if isinstance(data, list) else ()
+    for key, value in items:
+        if isinstance(value, str):
+            yield data, key
+        else:
+            yield from string_slots(value)
+
+
+def trim_to_budget(data, max_tokens: int, provider: str = None, model: str = None):
+    """Trims the data until its compact JSON fits in `max_tokens`, so the JSON sent to the LLM stays valid.
+
+    Trailing entries of the largest list are dropped first, e.g. the oldest projects of a section, then the longest strings are halved.
+
+    Returns:
+        The trimmed copy of the data, empty values removed.
+    """
+    data = prune_empty(data)
+    n_tokens = count_tokens(compact_json(data), provider, model)
+    original_tokens, n_dropped = n_tokens, 0
+
+    while n_tokens > max_tokens:
+        lists = list(non_empty_lists(data))
+        if lists:
+            max(lists, key=lambda entries: len(compact_json(entries))).pop()
+            n_dropped += 1
+        else:
+            slots = list(string_slots(data))
+            if not slots:
+                break
+            container, key = max(slots, key=lambda slot: len(slot[0][slot[1]]))
+            if len(container[key]) <= 1:
+                break
+            container[key] = container[key][:len(container[key]) // 2] + "..."
+        data = prune_empty(data)
+        n_tokens = count_tokens(compact_json(data), provider, model)
+
+    if n_tokens < original_tokens:
+        print(f"Trimmed data from {original_tokens} to {n_tokens} tokens for a {max_tokens} tokens budget, dropped {n_dropped} list entries.")
+    return data
+
+
+def serialize_for_prompt(data, fields: list = None, label: str = "data", provider: str = None, model: str = None, max_tokens: int = None) -> str:
+    """Serializes data for a prompt in a compact form and reports the tokens saved.
+
+    Args:
+        data (dict | list): The data to serialize. e.g. job details or a user data section.
+        fields (list, optional): Keys of a dict to keep, in this order. Defaults to all keys.
+        label (str, optional): Name of the data in the savings report.
+        provider (str, optional): The LLM provider, used to count tokens.
+        model (str, optional): The LLM model, used to count tokens.
+        max_tokens (int, optional): Token budget of the JSON, the data is trimmed with `trim_to_budget` to fit. Defaults to no budget.
+
+    Returns:
+        str: The compact JSON string.
+    """
+    if fields is not None and isinstance(data, dict):
+        selected = {field: data[field] for field in fields if field in data}
+    else:
+        selected = data
+
+    if max_tokens is not None:
+        selected = trim_to_budget(selected, max_tokens, provider, model)
+    compact = compact_json(selected)
+
+    original_tokens = count_tokens(json.dumps(data), provider, model)
+    compact_tokens = count_tokens(compact, provider, model)
+    if original_tokens:
+        saved = original_tokens - compact_tokens
+        print(f"Compact {label}: {original_tokens} -> {compact_tokens} tokens, saved {saved} ({saved / original_tokens:.0%})")
+
+    return compact
+
+
+def job_details_fields(sections) -> list:
+    """Returns the job details fields needed by one section or the union for a list of sections, None means all fields."""
+    if not sections:
+        return None
+    if isinstance(sections, str):
+        sections = [sections]
+
+    fields = []
+    for section in sections:
+        if section not in SECTION_JD_FIELDS:
+            return None
+        fields.extend(field for field in SECTION_JD_FIELDS[section] if field not in fields)
+    return fields
+
+
+def serialize_job_details(job_details: dict, sections=None, provider: str = None, model: str = None, max_tokens: int = None) -> str:
+    """Serializes only the job details fields needed by the given section(s), or all fields if no section is given."""
+    label = f"job details for {sections}" if isinstance(sections, str) else "job details"
+    return serialize_for_prompt(job_details, job_details_fields(sections), label, provider, model, max_tokens)
@@ -0,0 +1,262 @@
+'''
+-----------------------------------------------------------------------
+File: utils/rate_limiter.py
+Creation Time: Oct 17th 2026, 2:05 pm
+Author: Saurabh Zinjad
+Developer Email: saurabhzinjad@gmail.com
+Copyright (c) 2023-2024 Saurabh Zinjad. All rights reserved | https://github.com/Ztrimus
+-----------------------------------------------------------------------
+'''
+
+import time
+import random
+import asyncio
+import threading
+from email.utils import parsedate_to_datetime
+
+from zlm.variables import (
+    CIRCUIT_BREAKER_FAILURES, CIRCUIT_BREAKER_RESET_TIMEOUT, LLM_MAX_RETRIES,
+    LLM_RETRY_BASE_DELAY, LLM_RETRY_MAX_DELAY, RATE_LIMITS
+)
+
+RETRYABLE_STATUS_CODES = {408, 409, 429, 500, 502, 503, 504}
+RETRYABLE_ERROR_NAMES = {
+    "RateLimitError", "APIConnectionError", "APITimeoutError", "InternalServerError", # openai
+    "ResourceExhausted", "ServiceUnavailable", "DeadlineExceeded", "TooManyRequests", # google
+}
+RATE_LIMIT_ERROR_NAMES = {"RateLimitError", "ResourceExhausted", "TooManyRequests"}
+
+
+class CircuitOpenError(Exception):
+    """Raised when a provider model has failed too many times in a row and calls are paused."""
+
+
+class TokenBucket:
+    """
+    A token bucket refilled continuously at `rate_per_min`, holding at most one minute of tokens.
+
+    Tokens are reserved even when the bucket can't cover them yet, so concurrent callers
+    queue up behind each other instead of all waking at the same time.
+    """
+
+    def __init__(self, rate_per_min: float):
+        self.rate = rate_per_min / 60.0
+        self.capacity = rate_per_min
+        self.tokens = rate_per_min
+        self.updated_at = time.monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self, amount: float) -> float:
+        """Reserves the tokens and returns the seconds to wait before using them."""
+        with self._lock:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) * self.rate)
+            self.updated_at = now
+
+            # A single request larger than the bucket would never fit, so cap it to the capacity
+            self.tokens -= min(amount, self.capacity)
+            return 0.0 if self.tokens >= 0 else -self.tokens / self.rate
+
+
+class CircuitBreaker:
+    """
+    Opens after `failure_threshold` consecutive failures and lets a single trial call through after `reset_timeout` seconds.
+
+    While the trial call is in flight every other call is rejected. The breaker closes when the trial succeeds and
+    re-opens when it fails. A trial that ends without either, e.g. cancelled, frees the slot with `end_trial`,
+    and a trial that never reports back is replaced after another `reset_timeout`.
+    """
+
+    def __init__(self, failure_threshold: int = CIRCUIT_BREAKER_FAILURES, reset_timeout: float = CIRCUIT_BREAKER_RESET_TIMEOUT):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self.opened_at = None
+        self.trial_in_flight = False
+        self._trial_started_at = None
+        self._lock = threading.Lock()
+
+    def allow(self) -> bool:
+        with self._lock:
+            if self.opened_at is None:
+                return True
+            now = time.monotonic()
+            if self.trial_in_flight and now - self._trial_started_at < self.reset_timeout:
+                return False
+            # Half open, let a single trial call through
+            if now - self.opened_at >= self.reset_timeout:
+                self.trial_in_flight = True
+                self._trial_started_at = now
+                return True
+            return False
+
+    def end_trial(self):
+        """Frees the trial slot when a call ends without a success or retryable failure, e.g. a bad request or cancellation."""
+        with self._lock:
+            self.trial_in_flight = False
+
+    def record_success(self):
+        with self._lock:
+            self.failures = 0
+            self.opened_at = None
+            self.trial_in_flight = False
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            if self.trial_in_flight or self.failures >= self.failure_threshold:
+                self.opened_at = time.monotonic()
+            self.trial_in_flight = False
+
+
+def get_status_code(error: Exception):
+    status_code = getattr(error, "status_code", None)
+    if status_code is None and isinstance(getattr(error, "code", None), int):
+        status_code = error.code
+    if status_code is None:
+        status_code = getattr(getattr(error, "response", None), "status_code", None)
+    return status_code
+
+
+def is_retryable(error: Exception) -> bool:
+    """Whether the error is a rate limit or transient server/network error worth retrying."""
+    if isinstance(error, (ConnectionError, TimeoutError)):
+        return True
+    if type(error).__name__ in RETRYABLE_ERROR_NAMES:
+        return True
+    return get_status_code(error) in RETRYABLE_STATUS_CODES
+
+
+def is_rate_limited(error: Exception) -> bool:
+    """Whether the provider asked to slow down, which is backed off but doesn't mean the provider is down."""
+    if type(error).__name__ in RATE_LIMIT_ERROR_NAMES or get_status_code(error) == 429:
+        return True
+    return get_retry_after(error) is not None
+
+
+def get_retry_after(error: Exception):
+    """Returns the seconds asked by the provider's Retry-After header, if any."""
+    headers = getattr(getattr(error, "response", None), "headers", None)
+    if not headers:
+        return None
+
+    try:
+        if headers.get("retry-after-ms"):
+            return float(headers["retry-after-ms"]) / 1000
+
+        retry_after = headers.get("retry-after")
+        if retry_after is None:
+            return None
+        try:
+            return float(retry_after)
+        except ValueError:
+            return max(0.0, parsedate_to_datetime(retry_after).timestamp() - time.time())
+    except Exception:
+        return None
+
+
+class RateLimiter:
+    """
+    Rate limiting, retries and circuit breaking for one provider model.
+
+    Args:
+        requests_per_min (int, optional): Max requests per minute. None means unlimited.
+        tokens_per_min (int, optional): Max prompt + output tokens per minute. None means unlimited.
+        max_retries (int, optional): Max retries of a failed retryable call.
+    """
+
+    def __init__(self, requests_per_min: int = None, tokens_per_min: int = None, max_retries: int = LLM_MAX_RETRIES):
+        self.request_bucket = TokenBucket(requests_per_min) if requests_per_min else None
+        self.token_bucket = TokenBucket(tokens_per_min) if tokens_per_min else None
+        self.max_retries = max_retries
+        self.breaker = CircuitBreaker()
+
+    def check_circuit(self):
+        """Raises if the breaker is open. Checked once per call, so the retries of a trial call are not rejected."""
+        if not self.breaker.allow():
+            raise CircuitOpenError("Too many consecutive failures, provider calls are paused. Please try again later.")
+
+    def wait_time(self, estimated_tokens: int = 0) -> float:
+        """Reserves a request and the estimated tokens, and returns the seconds to wait."""
+        wait = 0.0
+        if self.request_bucket is not None:
+            wait = max(wait, self.request_bucket.reserve(1))
+        if self.token_bucket is not None and estimated_tokens:
+            wait = max(wait, self.token_bucket.reserve(estimated_tokens))
+        return wait
+
+    def backoff(self, attempt: int, error: Exception) -> float:
+        retry_after = get_retry_after(error)
+        if retry_after is not None:
+            return min(retry_after, LLM_RETRY_MAX_DELAY)
+        # Full jitter exponential backoff
+        return random.uniform(0, min(LLM_RETRY_MAX_DELAY, LLM_RETRY_BASE_DELAY * 2 ** attempt))
+
+    def record_error(self, error: Exception):
+        """Records a call that failed for good.
+
+        Only server and network errors count toward the breaker, once per call, so it trips on a provider that is down
+        and not on one that is rate limiting us.
+        """
+        if is_retryable(error) and not is_rate_limited(error):
+            self.breaker.record_failure()
+        else:
+            self.breaker.end_trial()
+
+    def _on_error(self, attempt: int, error: Exception):
+        """Returns the seconds to wait before retrying, or records the failure and raises if it shouldn't be retried."""
+        if not is_retryable(error) or attempt >= self.max_retries:
+            self.record_error(error)
+            raise error
+
+        delay = self.backoff(attempt, error)
+        print(f"Retrying in {delay:.2f} seconds after error: {error}")
+        return delay
+
+    def call(self, fn, *args, estimated_tokens: int = 0, **kwargs):
+        """Calls `fn` within the rate limits, retrying rate limit and transient errors."""
+        self.check_circuit()
+        try:
+            for attempt in range(self.max_retries + 1):
+                time.sleep(self.wait_time(estimated_tokens))
+                try:
+                    result = fn(*args, **kwargs)
+                except Exception as e:
+                    time.sleep(self._on_error(attempt, e))
+                    continue
+                self.breaker.record_success()
+                return result
+        except BaseException:
+            # Frees the trial slot if the call is interrupted, e.g. while backing off
+            self.breaker.end_trial()
+            raise
+
+    async def acall(self, fn, *args, estimated_tokens: int = 0, **kwargs):
+        """Async version of `call`, `fn` must be a coroutine function."""
+        self.check_circuit()
+        try:
+            for attempt in range(self.max_retries + 1):
+                await asyncio.sleep(self.wait_time(estimated_tokens))
+                try:
+                    result = await fn(*args, **kwargs)
+                except Exception as e:
+                    await asyncio.sleep(self._on_error(attempt, e))
+                    continue
+                self.breaker.record_success()
+                return result
+        except BaseException:
+            # e.g. a hedged call cancelled because another provider answered first
+            self.breaker.end_trial()
+            raise
+
+_rate_limiters = {}
+_rate_limiters_lock = threading.Lock()
+
+def get_rate_limiter(provider: str, model: str) -> RateLimiter:
+    """Returns the process-wide rate limiter of the provider model."""
+    key = (provider, model)
+    with _rate_limiters_lock:
+        if key not in _rate_limiters:
+            limits = RATE_LIMITS.get(provider) or {}
+            _rate_limiters[key] = RateLimiter(limits.get("requests_per_min"), limits.get("tokens_per_min"))
+        return _rate_limiters[key]
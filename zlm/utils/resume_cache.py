@@ -0,0 +1,30 @@
+'''
+-----------------------------------------------------------------------
+File: utils/resume_cache.py
+Creation Time: Oct 17th 2026, 9:40 pm
+Author: Saurabh Zinjad
+Developer Email: saurabhzinjad@gmail.com
+Copyright (c) 2023-2024 Saurabh Zinjad. All rights reserved | https://github.com/Ztrimus
+-----------------------------------------------------------------------
+'''
+
+import hashlib
+
+from zlm.schemas.sections_schemas import ResumeSchema
+from zlm.prompts.resume_prompt import RESUME_DETAILS_EXTRACTOR
+from zlm.utils.cache import JSONResultCache, get_resume_json_cache
+from zlm.variables import RESUME_TEXT_TOKEN_BUDGET
+
+
+def file_sha256(path: str) -> str:
+    hasher = hashlib.sha256()
+    with open(path, "rb") as file:
+        for block in iter(lambda: file.read(1024 * 1024), b""):
+            hasher.update(block)
+    return hasher.hexdigest()
+
+
+# Resume JSON keyed by the PDF's sha256. Entries expire after RESUME_JSON_CACHE_TTL.
+resume_json_cache = JSONResultCache(
+    get_resume_json_cache, file_sha256, lambda: (ResumeSchema.model_json_schema(), RESUME_DETAILS_EXTRACTOR, RESUME_TEXT_TOKEN_BUDGET)
+)
@@ -0,0 +1,147 @@
+'''
+-----------------------------------------------------------------------
+File: utils/schema_repair.py
+Creation Time: Oct 17th 2026, 8:50 pm
+Author: Saurabh Zinjad
+Developer Email: saurabhzinjad@gmail.com
+Copyright (c) 2023-2024 Saurabh Zinjad. All rights reserved | https://github.com/Ztrimus
+-----------------------------------------------------------------------
+'''
+
+import re
+import json
+import typing
+from functools import lru_cache
+from pydantic import TypeAdapter, ValidationError
+
+from zlm.utils.json_stream import StreamingJSONParser
+from zlm.utils.utils import parse_json_markdown
+
+JSON_FENCE_PATTERN = re.compile(r"```(?:json)?\s*(.*?)\s*```", re.DOTALL | re.IGNORECASE)
+
+
+@lru_cache(maxsize=None)
+def get_type_adapter(schema) -> TypeAdapter:
+    """Returns the cached TypeAdapter of a schema, building its validator only once."""
+    return TypeAdapter(schema)
+
+
+def validation_errors(schema, data) -> list:
+    """Returns the pydantic errors of the data against the schema, empty if it is valid."""
+    try:
+        get_type_adapter(schema).validate_python(data)
+        return []
+    except ValidationError as e:
+        return e.errors(include_url=False)
+
+
+def is_complete_json(content) -> bool:
+    """Whether the response is a whole JSON document, unlike a truncated one that `parse_response` would salvage."""
+    if isinstance(content, (dict, list)):
+        return True
+    if not isinstance(content, str):
+        return False
+    match = JSON_FENCE_PATTERN.search(content)
+    try:
+        json.loads(match.group(1) if match else content.strip())
+        return True
+    except ValueError:
+        return False
+
+
+def parse_response(content):
+    """Parses a JSON response, salvaging the complete array entries of a truncated or broken response.
+
+    Returns:
+        dict | list: The parsed response, or None if nothing could be parsed.
+    """
+    if content is None or isinstance(content, dict):
+        return content
+
+    response = parse_json_markdown(content)
+    if isinstance(response, (dict, list)):
+        return response
+
+    parser = StreamingJSONParser()
+    parser.feed(content)
+    salvaged = {key: items for key, items in parser.items.items() if key is not None}
+    if salvaged:
+        print(f"Salvaged {sum(len(items) for items in salvaged.values())} entries of a broken JSON response")
+        return salvaged
+    return None
+
+
+def list_item_type(annotation):
+    """Returns the item type of a List or Optional[List] annotation, or None."""
+    if typing.get_origin(annotation) is typing.Union:
+        annotation = next((arg for arg in typing.get_args(annotation) if arg is not type(None)), None)
+    if typing.get_origin(annotation) is list:
+        return typing.get_args(annotation)[0]
+    return None
+
+
+def find_broken_fragments(schema, data: dict):
+    """Groups the validation errors by the list entry they are in.
+
+    Args:
+        schema (BaseModel): The section schema. e.g. Experiences.
+        data (dict): The section response.
+
+    Returns:
+        list: (path, errors, item type) of each invalid entry, where path is (field, index) and errors are
+            messages relative to the entry. Empty if the data is valid, None if an error is outside list entries.
+    """
+    fragments = {}
+    for error in validation_errors(schema, data):
+        loc = error["loc"]
+        if len(loc) < 2 or not isinstance(loc[1], int) or loc[0] not in schema.model_fields:
+            return None
+
+        item_type = list_item_type(schema.model_fields[loc[0]].annotation)
+        if item_type is None:
+            return None
+
+        path = (loc[0], loc[1])
+        relative_path = ".".join(str(part) for part in loc[2:]) or "(entry)"
+        fragments.setdefault(path, (path, [], item_type))[1].append(f"{relative_path}: {error['msg']}")
+
+    return list(fragments.values())
+
+
+def unwrap_fragment(response):
+    """Returns the fixed fragment of a repair response."""
+    if isinstance(response, dict) and "fragment" in response:
+        return response["fragment"]
+    return response
+
+
+def fragment_schema(item_type) -> str:
+    return json.dumps(get_type_adapter(item_type).json_schema(), separators=(",", ":"))
+
+
+def merge_repairs(schema, data: dict, repairs: dict):
+    """Merges repaired entries back into the section data.
+
+    Entries whose repair is missing or still invalid are dropped instead of the whole section.
+
+    Args:
+        schema (BaseModel): The section schema.
+        data (dict): The section response.
+        repairs (dict): (field, index) path to (item type, repaired entry or None).
+
+    Returns:
+        dict: The valid section data, or None if it is still invalid.
+    """
+    dropped = []
+    for (field, index), (item_type, repaired) in repairs.items():
+        if repaired is not None and not validation_errors(item_type, repaired):
+            data[field][index] = repaired
+        else:
+            dropped.append((field, index))
+
+    # Remove from the end, so indexes of the other dropped entries stay valid
+    for field, index in sorted(dropped, reverse=True):
+        print(f"Dropping {field}[{index}], it could not be repaired")
+        del data[field][index]
+
+    return data if not validation_errors(schema, data) else None
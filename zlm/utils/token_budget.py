@@ -0,0 +1,122 @@
+'''
+-----------------------------------------------------------------------
+File: utils/token_budget.py
+Creation Time: Oct 17th 2026, 3:10 pm
+Author: Saurabh Zinjad
+Developer Email: saurabhzinjad@gmail.com
+Copyright (c) 2023-2024 Saurabh Zinjad. All rights reserved | https://github.com/Ztrimus
+-----------------------------------------------------------------------
+'''
+
+import json
+import threading
+from functools import lru_cache
+
+from zlm.variables import MAX_OUTPUT_TOKENS, OUTPUT_TOKEN_OVERHEAD, OUTPUT_TOKEN_RATIO
+
+try:
+    import tiktoken
+except ImportError:
+    tiktoken = None
+
+# Average characters per token of English text, used when no tokenizer is available for the model
+CHARS_PER_TOKEN = 4
+TRUNCATION_MARKER = "\n[...truncated]"
+
+_warned_no_tiktoken = False
+
+
+@lru_cache(maxsize=32)
+def get_encoding(model: str):
+    global _warned_no_tiktoken
+    if tiktoken is None:
+        if not _warned_no_tiktoken:
+            _warned_no_tiktoken = True
+            print(f"tiktoken is not installed, GPT token counts are estimated as {CHARS_PER_TOKEN} characters per token. Run `pip install tiktoken` for exact budgets.")
+        return None
+    try:
+        return tiktoken.encoding_for_model(model)
+    except KeyError:
+        return tiktoken.get_encoding("o200k_base")
+
+
+def count_tokens(text: str, provider: str = None, model: str = None) -> int:
+    """Counts the tokens of the text for the provider model.
+
+    GPT models are counted with tiktoken when it is installed, other providers
+    are estimated from the number of characters.
+    """
+    if not text:
+        return 0
+    if provider == "GPT" and model:
+        encoding = get_encoding(model)
+        if encoding is not None:
+            return len(encoding.encode(text, disallowed_special=()))
+    return -(-len(text) // CHARS_PER_TOKEN)
+
+
+def fit_to_budget(text: str, max_tokens: int, provider: str = None, model: str = None) -> str:
+    """Trims the text to fit in `max_tokens`, keeping the beginning and cutting at a line boundary.
+
+    Only meant for plain text, JSON is trimmed before serializing with `prompt_serializer.trim_to_budget`.
+
+    Args:
+        text (str): The text to fit.
+        max_tokens (int): The token budget.
+        provider (str, optional): The LLM provider, used to count tokens.
+        model (str, optional): The LLM model, used to count tokens.
+
+    Returns:
+        str: The text, trimmed if it was over the budget.
+    """
+    n_tokens = count_tokens(text, provider, model)
+    if max_tokens is None or n_tokens <= max_tokens:
+        return text
+
+    # Assume tokens are evenly spread over the text, then shrink until it fits
+    keep_chars = int(len(text) * max_tokens / n_tokens)
+    while keep_chars > 0:
+        trimmed = text[:keep_chars]
+        if "\n" in trimmed:
+            trimmed = trimmed[:trimmed.rindex("\n")]
+        trimmed += TRUNCATION_MARKER
+        if count_tokens(trimmed, provider, model) <= max_tokens:
+            print(f"Trimmed input from {n_tokens} to {max_tokens} tokens budget.")
+            return trimmed
+        keep_chars = int(keep_chars * 0.9)
+
+    return ""
+
+
+def output_token_budget(expected_input, provider: str = None, model: str = None) -> int:
+    """Sizes max output tokens from the input the LLM is expected to rewrite. e.g. the user's section data."""
+    if not isinstance(expected_input, str):
+        expected_input = json.dumps(expected_input)
+    expected_tokens = count_tokens(expected_input, provider, model) * OUTPUT_TOKEN_RATIO + OUTPUT_TOKEN_OVERHEAD
+    return int(min(MAX_OUTPUT_TOKENS, expected_tokens))
+
+
+class UsageTracker:
+    """Records actual prompt and output tokens used per provider model."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.usage = {}
+
+    def record(self, provider: str, model: str, prompt_tokens: int, output_tokens: int):
+        with self._lock:
+            usage = self.usage.setdefault((provider, model), {"calls": 0, "prompt_tokens": 0, "output_tokens": 0})
+            usage["calls"] += 1
+            usage["prompt_tokens"] += prompt_tokens or 0
+            usage["output_tokens"] += output_tokens or 0
+
+    def summary(self) -> dict:
+        with self._lock:
+            return {f"{provider}/{model}": dict(usage) for (provider, model), usage in self.usage.items()}
+
+    def reset(self):
+        with self._lock:
+            self.usage.clear()
+
+
+usage_tracker = UsageTracker()
@@ -13,6 +13,7 @@
 import time
 import json
 import base64
+import inspect
 import platform
 import subprocess
 import streamlit as st
@@ -30,6 +31,24 @@ def write_file(file_path, data):
         file.write(data)
 
 
+def stream_to_file(chunks, file_path):
+    """Writes text chunks to the file as they arrive, and yields them back to the caller.
+
+    The file is only created once the first chunk arrives, so a stream that fails before any text doesn't leave an empty file.
+    """
+    file = None
+    try:
+        for chunk in chunks:
+            if file is None:
+                file = open(file_path, "w")
+            file.write(chunk)
+            file.flush()
+            yield chunk
+    finally:
+        if file is not None:
+            file.close()
+
+
 def read_file(file_path, mode="r"):
     with open(file_path, mode) as file:
         file_contents = file.read()
@@ -96,6 +115,16 @@ def save_log(content: any, file_name: str):
 
 
 def measure_execution_time(func):
+    if inspect.iscoroutinefunction(func):
+        async def async_wrapper(*args, **kwargs):
+            start_time = time.time()
+            result = await func(*args, **kwargs)
+            execution_time = time.time() - start_time
+            print(f"Function {func.__name__} took {execution_time:.4f} seconds to execute")
+            return result
+
+        return async_wrapper
+
     def wrapper(*args, **kwargs):
         start_time = time.time()
         result = func(*args, **kwargs)
@@ -8,6 +8,8 @@
 -----------------------------------------------------------------------
 '''
 
+import os
+from pathlib import Path
 from zlm.prompts.sections_prompt import EXPERIENCE, SKILLS, PROJECTS, EDUCATIONS, CERTIFICATIONS, ACHIEVEMENTS
 from zlm.schemas.sections_schemas import Achievements, Certifications, Educations, Experiences, Projects, SkillSections
 
@@ -19,6 +21,148 @@
 
 OLLAMA_EMBEDDING_MODEL = "bge-m3"
 
+# Base URLs of the provider APIs, None uses the provider's default.
+# e.g. point them to zlm.utils.fake_llm_server to benchmark without API quota
+LLM_BASE_URLS = {
+    "GPT": os.environ.get("OPENAI_BASE_URL"),
+    "Gemini": os.environ.get("GEMINI_BASE_URL"),
+    "Ollama": os.environ.get("OLLAMA_HOST"),
+}
+
+# LLM call cassettes, "record" saves every provider call of a run and "replay" serves them back
+# with the "observed" latencies or "zero" latency, see zlm.utils.cassette
+CASSETTE_MODES = ["record", "replay"]
+REPLAY_LATENCIES = ["observed", "zero"]
+
+# Max number of chunks sent in one embedding request
+EMBEDDING_BATCH_SIZE = 64
+
+# Root folder for on-disk caches, can be overridden with ZLM_CACHE_DIR env variable
+CACHE_DIR = os.environ.get("ZLM_CACHE_DIR", os.path.join(str(Path.home()), "Downloads", "JobLLM_Resume_CV", ".cache"))
+
+# LLM response cache limits, least recently used entries are evicted first
+LLM_CACHE_MAX_ENTRIES = 5000
+LLM_CACHE_MAX_SIZE_MB = 200
+LLM_CACHE_TTL = 7 * 24 * 60 * 60 # seconds
+
+# Extracted PDF text cache, keyed by the file's content hash so entries never go stale
+PDF_TEXT_CACHE_MAX_ENTRIES = 1000
+PDF_TEXT_CACHE_MAX_SIZE_MB = 50
+
+# Resume JSON cache, extracted profiles are reused when the same PDF is uploaded again
+RESUME_JSON_CACHE_MAX_ENTRIES = 1000
+RESUME_JSON_CACHE_TTL = 30 * 24 * 60 * 60 # seconds
+
+# Job details cache, keyed by the normalized job description so a posting is extracted once for all users
+JOB_DETAILS_CACHE_MAX_ENTRIES = 5000
+JOB_DETAILS_CACHE_TTL = 7 * 24 * 60 * 60 # seconds
+
+# PDFs with at least this many pages are extracted in parallel by a process pool, only where workers are forked.
+# Pages take ~5ms each, a forked pool ~50ms to start and ~15ms per batch, so resumes are always extracted serially.
+PDF_PARALLEL_MIN_PAGES = 20
+PDF_MAX_WORKERS = min(4, os.cpu_count() or 1)
+
+# Job pages are fetched with plain HTTP first, and with a headless browser only if the page needs JavaScript, see zlm.utils.page_fetcher
+FETCH_HTTP_TIMEOUT = 10 # seconds
+FETCH_BROWSER_TIMEOUT = 30 # seconds
+FETCH_HTTP_CONCURRENCY = 16
+FETCH_BROWSER_CONTEXTS = 2 # warm browser contexts, which also caps concurrent browser fetches
+FETCH_MIN_TEXT_CHARS = 500 # pages with less text are treated as JavaScript rendered
+FETCH_USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/126.0 Safari/537.36"
+
+# Content profiles of job sites, matched by domain and subdomains. Only the text of `keep` elements is extracted
+# (the whole page if none is found), and `drop` elements are removed. See zlm.utils.html_text for the supported selectors.
+SITE_CONTENT_PROFILES = {
+    "linkedin.com": {
+        "keep": [".top-card-layout__entity-info", ".description__text", ".description__job-criteria-list"],
+        "drop": ["#main-content > section.right-rail", ".job-alert-redirect-section", ".similar-jobs", ".show-more-less-html__button"],
+    },
+    "greenhouse.io": {
+        "keep": ["#header", "#content", ".job__title", ".job__description"],
+        "drop": ["#application", "form"],
+    },
+    "lever.co": {
+        "keep": [".posting-headline", ".content .section-wrapper"],
+        "drop": [".postings-btn-wrapper", ".application-page", "form"],
+    },
+    "myworkdayjobs.com": {
+        "keep": ["[data-automation-id=jobPostingHeader]", "[data-automation-id=job-posting-details]", "[data-automation-id=jobPostingDescription]"],
+        "drop": ["[data-automation-id=similarJobsSection]", "[data-automation-id=applyButton]", "form"],
+    },
+}
+
+# Bulk job page crawler, see zlm.utils.crawler
+CRAWL_CONCURRENCY = 32 # pages fetched at once over all sites
+CRAWL_DOMAIN_CONCURRENCY = 2 # pages fetched at once from the same site
+CRAWL_DOMAIN_DELAY = 1.0 # min seconds between requests to the same site
+
+# Scraped job pages are cached on disk. Pages younger than the freshness are served without any request,
+# older ones are revalidated with their ETag/Last-Modified. Freshness can be overridden with ZLM_PAGE_CACHE_FRESHNESS env variable.
+PAGE_CACHE_FRESHNESS = int(os.environ.get("ZLM_PAGE_CACHE_FRESHNESS", 6 * 60 * 60)) # seconds
+PAGE_CACHE_TTL = 30 * 24 * 60 * 60 # seconds
+PAGE_CACHE_MAX_ENTRIES = 5000
+PAGE_CACHE_MAX_SIZE_MB = 200
+
+# Max number of in-flight requests per LLM provider, shared by the whole process
+PROVIDER_CONCURRENCY = {
+    "GPT": 16,
+    "Gemini": 16,
+    "Ollama": 2,
+}
+
+# Requests and tokens per minute allowed for each provider model, adjust to your account tier. None means unlimited.
+RATE_LIMITS = {
+    "GPT": {"requests_per_min": 500, "tokens_per_min": 200000},
+    "Gemini": {"requests_per_min": 1000, "tokens_per_min": 4000000},
+    "Ollama": None,
+}
+
+# Retry with jittered exponential backoff on rate limit and transient server errors
+LLM_MAX_RETRIES = 5
+LLM_RETRY_BASE_DELAY = 1 # seconds
+LLM_RETRY_MAX_DELAY = 60 # seconds
+
+# Stop calling a provider model after consecutive failures, and try again after the reset timeout
+CIRCUIT_BREAKER_FAILURES = 5
+CIRCUIT_BREAKER_RESET_TIMEOUT = 30 # seconds
+
+# Token budgets of prompt inputs, oversized inputs are trimmed to fit
+JOB_DESCRIPTION_TOKEN_BUDGET = 6000
+RESUME_TEXT_TOKEN_BUDGET = 8000
+SECTION_DATA_TOKEN_BUDGET = 6000
+
+# Job description pruning before details extraction, see zlm.utils.jd_pruning
+JD_SHINGLE_SIZE = 3 # words per shingle matched against the boilerplate corpus
+JD_BOILERPLATE_MIN_OVERLAP = 0.6 # share of a line's shingles found in the corpus to remove it
+JD_MIN_FUZZY_WORDS = 6 # shorter lines are only removed on an exact corpus match
+JD_SECTION_MAX_CHARS = 4000
+JD_LOW_VALUE_SECTION_MAX_CHARS = 300 # sections not used by JobDetails, e.g. benefits and EEO statements
+# Heading starts that begin a new section, the low value ones are capped to JD_LOW_VALUE_SECTION_MAX_CHARS
+JD_SECTION_HEADINGS = [
+    "about", "overview", "job description", "role", "responsibilities", "duties", "what you", "who you", "you will", "you'll",
+    "requirements", "qualifications", "minimum", "basic", "preferred", "nice to have", "bonus", "skills", "experience",
+]
+JD_LOW_VALUE_HEADINGS = [
+    "benefits", "perks", "what we offer", "why join", "equal opportunity", "equal employment", "eeo", "pay transparency",
+    "compensation", "salary", "privacy", "accommodation", "disclaimer", "cookie",
+]
+
+# Job descriptions longer than the token budget are split into overlapping chunks, extracted in parallel and merged
+JD_CHUNK_TOKENS = 3000
+JD_CHUNK_OVERLAP_TOKENS = 300
+JD_MAX_CHUNKS = 8 # later chunks are dropped, so a huge page can't fan out into unbounded calls
+JD_NEAR_DUPLICATE_SIMILARITY = 0.8 # word jaccard above which two merged list entries are the same entry
+
+# Text normalizer of the resume/job metrics, see zlm.utils.metrics.TextNormalizer
+STEM_CACHE_SIZE = 50000 # distinct words whose stem is memoized
+TOKEN_SET_CACHE_SIZE = 1024 # documents whose normalized token set is memoized
+
+# Max output tokens are sized from the input the LLM rewrites: input tokens * ratio + overhead, capped to the max
+MAX_OUTPUT_TOKENS = 4000
+OUTPUT_TOKEN_RATIO = 1.5
+OUTPUT_TOKEN_OVERHEAD = 300
+COVER_LETTER_OUTPUT_TOKENS = 1500
+
 DEFAULT_LLM_PROVIDER = "Gemini"
 DEFAULT_LLM_MODEL = "gemini-1.5-flash"
 
@@ -37,6 +181,38 @@
     # }
 }
 
+# Hedged requests over a provider fallback chain, see zlm.utils.hedging
+# A call is also sent to the next provider when it takes longer than the percentile latency of its provider
+HEDGE_LATENCY_PERCENTILE = 95
+HEDGE_LATENCY_WINDOW = 200 # latest calls per provider model used for the percentile
+HEDGE_MIN_SAMPLES = 10 # calls observed before the percentile replaces the default deadline
+HEDGE_DEFAULT_DEADLINE = 30 # seconds
+HEDGE_MAX_WORKERS = 32
+
+# Order in which sections are generated and stored in resume details
+RESUME_SECTIONS = ['work_experience', 'projects', 'skill_section', 'education', 'certifications', 'achievements']
+
+# Max number of resume sections generated concurrently by resume_builder
+MAX_PARALLEL_SECTIONS = 6
+
+# How resume_builder generates sections:
+# "concurrent" - one prompt per section, run concurrently
+# "single_call" - one prompt for all sections, with per-section fallback for sections that fail validation
+SECTION_GENERATION_MODES = ["concurrent", "single_call"]
+DEFAULT_SECTION_GENERATION_MODE = "concurrent"
+SINGLE_CALL_MAX_OUTPUT_TOKENS = 8000
+
+# Job details fields each prompt needs, other fields are left out of the prompt to save tokens
+JD_CORE_FIELDS = ["job_title", "keywords", "required_qualifications"]
+SECTION_JD_FIELDS = {
+    "work_experience": JD_CORE_FIELDS + ["job_duties_and_responsibilities", "preferred_qualifications"],
+    "projects": JD_CORE_FIELDS + ["job_duties_and_responsibilities", "preferred_qualifications"],
+    "skill_section": JD_CORE_FIELDS + ["preferred_qualifications"],
+    "education": JD_CORE_FIELDS,
+    "certifications": JD_CORE_FIELDS + ["preferred_qualifications"],
+    "achievements": JD_CORE_FIELDS + ["job_purpose"],
+}
+
 section_mapping = {
     "work_experience": {"prompt":EXPERIENCE, "schema": Experiences},
     "skill_section": {"prompt":SKILLS, "schema": SkillSections},